@@ -0,0 +1,278 @@
+###
+## cluster_maker: benchmark suite for the clustering hot paths
+## James Foadi - University of Bath
+## November 2025
+##
+## Times the core functions of cluster_maker on synthetic workloads
+## generated with define_dataframe_structure/simulate_data over a grid
+## of n_samples (N), n_features (D) and clusters (k), records wall time,
+## iterations and peak memory to JSON, and optionally compares them with
+## a baseline JSON, exiting with status 1 on a regression.
+##
+## Usage:
+##   python benchmarks/run_benchmarks.py --grid quick --output results.json
+##   python benchmarks/run_benchmarks.py --baseline results.json --tolerance 0.2
+###
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from cluster_maker import (
+    assign_clusters,
+    compute_inertia,
+    define_dataframe_structure,
+    init_centroids,
+    kmeans,
+    silhouette_score_chunked,
+    silhouette_score_sklearn,
+    simulate_data,
+    sklearn_kmeans,
+    update_centroids,
+)
+
+# Workload grids: every combination of n_samples, n_features and k is run.
+GRIDS: Dict[str, Dict[str, List[int]]] = {
+    "quick": {"n_samples": [2_000, 20_000], "n_features": [2, 8], "k": [3, 10]},
+    "full": {"n_samples": [10_000, 100_000, 1_000_000], "n_features": [2, 8, 32], "k": [3, 10, 100]},
+}
+
+# The O(N^2) silhouette is only benchmarked up to this many samples.
+SILHOUETTE_MAX_SAMPLES = 10_000
+
+# Wall times below this (seconds) are too noisy to flag as regressions.
+MIN_WALL_TIME = 0.05
+
+# Absolute slack added to the allowed value of each metric, so that small
+# absolute changes (scheduler jitter, allocator noise) are not flagged.
+ABS_SLACK: Dict[str, float] = {"wall_time": 0.01, "peak_memory": 64 * 2**10, "n_iter": 0}
+
+# Metrics compared against the baseline; larger is worse for all of them.
+TRACKED_METRICS = ("wall_time", "peak_memory", "n_iter")
+
+SEED = 12345
+
+
+def make_workload(n_samples: int, n_features: int, k: int, seed: int = SEED):
+    """
+    Seed DataFrame with k random centres and the simulated float64 data.
+    """
+    rng = np.random.RandomState(seed)
+    seed_df = define_dataframe_structure([
+        {"name": f"f{j}", "reps": list(rng.uniform(-10.0, 10.0, size=k))}
+        for j in range(n_features)
+    ])
+    data = simulate_data(seed_df, n_points=n_samples, cluster_std=1.0, random_state=seed)
+    X = data.drop(columns="true_cluster").to_numpy(dtype=float)
+    return seed_df, X
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Median wall time over repeat calls (the best is kept as
+    "wall_time_min"), and the tracemalloc peak of one further call
+    (traced separately so tracing does not skew the timing).
+
+    If func returns a dict, its entries (e.g. n_iter) are added.
+    """
+    times = []
+    extra: Any = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extra = func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    record: Dict[str, Any] = {
+        "wall_time": statistics.median(times),
+        "wall_time_min": min(times),
+        "peak_memory": peak,
+    }
+    if isinstance(extra, dict):
+        record.update(extra)
+    return record
+
+
+def benchmark_cases(
+    seed_df, X: np.ndarray, n_samples: int, k: int
+) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    """
+    (name, callable) pairs for one workload.
+    """
+    centroids = init_centroids(X, k, random_state=0)
+    labels = assign_clusters(X, centroids)
+
+    yield "simulate_data", lambda: simulate_data(seed_df, n_points=n_samples, random_state=SEED)
+    yield "assign_clusters", lambda: assign_clusters(X, centroids)
+    yield "update_centroids", lambda: update_centroids(X, labels, k, random_state=0)
+    yield "compute_inertia", lambda: compute_inertia(X, labels, centroids)
+
+    def run_kmeans():
+        _, _, n_iter = kmeans(X, k, random_state=0, return_n_iter=True)
+        return {"n_iter": n_iter}
+
+    def run_sklearn_kmeans():
+        _, _, n_iter = sklearn_kmeans(X, k, random_state=0, return_n_iter=True)
+        return {"n_iter": n_iter}
+
+    yield "kmeans", run_kmeans
+    yield "sklearn_kmeans", run_sklearn_kmeans
+
+    if n_samples <= SILHOUETTE_MAX_SAMPLES and k > 1:
+        yield "silhouette_score_sklearn", lambda: silhouette_score_sklearn(X, labels)
+        yield "silhouette_score_chunked", lambda: silhouette_score_chunked(X, labels)
+
+
+def run_grid(
+    grid: Dict[str, List[int]],
+    repeat: int,
+    only: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run every benchmark on every workload of the grid.
+    """
+    results = []
+    for n_samples in grid["n_samples"]:
+        for n_features in grid["n_features"]:
+            for k in grid["k"]:
+                seed_df, X = make_workload(n_samples, n_features, k)
+                for name, func in benchmark_cases(seed_df, X, n_samples, k):
+                    if only and name not in only:
+                        continue
+                    record = {"benchmark": name, "n_samples": n_samples,
+                              "n_features": n_features, "k": k}
+                    record.update(measure(func, repeat))
+                    results.append(record)
+                    print(f"  {name:<26} N={n_samples:<8} D={n_features:<3} k={k:<4}"
+                          f" {record['wall_time']:9.4f} s {record['peak_memory'] / 2**20:9.2f} MiB")
+    return results
+
+
+def _key(record: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (record["benchmark"], record["n_samples"], record["n_features"], record["k"])
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: List[Dict[str, Any]],
+    tolerance: float,
+    metrics: Tuple[str, ...] = TRACKED_METRICS,
+    min_wall_time: float = MIN_WALL_TIME,
+    slack: Optional[Dict[str, float]] = None,
+) -> List[str]:
+    """
+    Regressions of results against baseline: a tracked metric above
+    (1 + tolerance) times its baseline value plus its absolute slack
+    (ABS_SLACK by default). Cases missing from either side, and wall
+    times below min_wall_time on both sides, are ignored.
+    """
+    slack = ABS_SLACK if slack is None else {**ABS_SLACK, **slack}
+    reference = {_key(record): record for record in baseline}
+    regressions = []
+    for record in results:
+        base = reference.get(_key(record))
+        if base is None:
+            continue
+        for metric in metrics:
+            if metric not in record or metric not in base or not base[metric]:
+                continue
+            if metric == "wall_time" and max(record[metric], base[metric]) < min_wall_time:
+                continue
+            ratio = record[metric] / base[metric]
+            if record[metric] > base[metric] * (1.0 + tolerance) + slack.get(metric, 0):
+                regressions.append(
+                    f"{record['benchmark']} N={record['n_samples']} D={record['n_features']} "
+                    f"k={record['k']}: {metric} {base[metric]:.4g} -> {record[metric]:.4g} "
+                    f"(x{ratio:.2f})"
+                )
+    return regressions
+
+
+def manual_vs_sklearn(results: List[Dict[str, Any]]) -> None:
+    """
+    Print the manual/sklearn wall-time ratio for kmeans and silhouette.
+    """
+    by_key = {_key(record): record for record in results}
+    pairs = [("kmeans", "sklearn_kmeans"), ("silhouette_score_chunked", "silhouette_score_sklearn")]
+    for manual, reference in pairs:
+        for key, record in by_key.items():
+            if key[0] != manual:
+                continue
+            other = by_key.get((reference,) + key[1:])
+            if other is not None and other["wall_time"] > 0:
+                print(f"  {manual} / {reference} N={key[1]} D={key[2]} k={key[3]}: "
+                      f"x{record['wall_time'] / other['wall_time']:.3g}")
+
+
+def main(args: List[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the cluster_maker hot paths.")
+    parser.add_argument("--grid", choices=sorted(GRIDS), default="quick")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="timed runs per case; the median is compared (default 5)")
+    parser.add_argument("--only", nargs="+", metavar="NAME",
+                        help="run only these benchmarks (e.g. kmeans assign_clusters)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative increase of a tracked metric (default 0.25)")
+    parser.add_argument("--metrics", nargs="+", default=list(TRACKED_METRICS),
+                        choices=TRACKED_METRICS, help="metrics compared with the baseline")
+    parser.add_argument("--min-wall-time", type=float, default=MIN_WALL_TIME,
+                        help=f"ignore wall times below this many seconds (default {MIN_WALL_TIME})")
+    parser.add_argument("--slack", type=float, default=ABS_SLACK["wall_time"],
+                        help="absolute wall-time slack in seconds added to the allowed "
+                             f"value (default {ABS_SLACK['wall_time']})")
+    options = parser.parse_args(args)
+
+    print(f"Running the '{options.grid}' grid ({options.repeat} repeats per case)")
+    results = run_grid(GRIDS[options.grid], options.repeat, options.only)
+
+    print("\nManual vs scikit-learn (wall time ratio):")
+    manual_vs_sklearn(results)
+
+    report = {
+        "metadata": {
+            "created": datetime.now(timezone.utc).isoformat(),
+            "grid": options.grid,
+            "repeat": options.repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {options.output}")
+
+    if options.baseline:
+        with open(options.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, options.tolerance, tuple(options.metrics),
+                              options.min_wall_time, {"wall_time": options.slack})
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {options.tolerance:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions beyond {options.tolerance:.0%} against {options.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -4,78 +4,145 @@ cluster_maker
 An educational Python package for generating synthetic clustered data,
 running clustering algorithms, evaluating results, and producing
 user-friendly plots.
+
+Public names are imported lazily: a submodule (and its heavy
+dependencies such as scikit-learn or matplotlib) is only loaded when one
+of its names is first accessed, so ``from cluster_maker import kmeans``
+stays cheap.
 """
 
-# --- Data generation & basic analysis ---
-from .dataframe_builder import define_dataframe_structure, simulate_data
-from .data_analyser import calculate_descriptive_statistics, calculate_correlation
-from .data_exporter import export_to_csv, export_formatted
-
-# --- Preprocessing ---
-from .preprocessing import select_features, standardise_features
-
-# --- Clustering algorithms ---
-from .algorithms import (
-    kmeans,
-    sklearn_kmeans,
-    init_centroids,
-    assign_clusters,
-    update_centroids,
-)
-
-# --- NEW: Agglomerative Clustering ---
-from .agglomerative import fit_agglomerative
-
-# --- Evaluation ---
-from .evaluation import (
-    compute_inertia,
-    silhouette_score_sklearn,
-    elbow_curve,
-)
-
-# --- Plotting ---
-from .plotting_clustered import plot_clusters_2d, plot_elbow
-
-# --- High-level interface ---
-from .interface import run_clustering
-
-
-__all__ = [
-    # Data generation
-    "define_dataframe_structure",
-    "simulate_data",
-
-    # Analysis
-    "calculate_descriptive_statistics",
-    "calculate_correlation",
-
-    # Export
-    "export_to_csv",
-    "export_formatted",
-
-    # Preprocessing
-    "select_features",
-    "standardise_features",
-
-    # Algorithms
-    "kmeans",
-    "sklearn_kmeans",
-    "init_centroids",
-    "assign_clusters",
-    "update_centroids",
-    
-    # NEW
-    "fit_agglomerative",
-
-    # Evaluation
-    "compute_inertia",
-    "silhouette_score_sklearn",
-    "elbow_curve",
-
-    # Plotting
-    "plot_clusters_2d",
-    "plot_elbow",
-
-    # High-level orchestration
-    "run_clustering",
-]
\ No newline at end of file
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
+
+# Public name -> submodule that defines it
+_LAZY_NAMES: Dict[str, str] = {
+    # --- Data generation & basic analysis ---
+    "define_dataframe_structure": "dataframe_builder",
+    "simulate_data": "dataframe_builder",
+    "iter_simulated_data": "dataframe_builder",
+    "write_simulated_data": "dataframe_builder",
+    "calculate_descriptive_statistics": "data_analyser",
+    "calculate_correlation": "data_analyser",
+    "export_to_csv": "data_exporter",
+    "export_formatted": "data_exporter",
+    "export_to_npy": "data_exporter",
+    "load_npy": "data_exporter",
+    "read_npy": "data_exporter",
+    "iter_npy_chunks": "data_exporter",
+
+    # --- Preprocessing ---
+    "select_features": "preprocessing",
+    "standardise_features": "preprocessing",
+    "Standardiser": "preprocessing",
+
+    # --- Clustering algorithms ---
+    "kmeans": "algorithms",
+    "kmeans_elkan": "algorithms",
+    "minibatch_kmeans": "algorithms",
+    "sklearn_kmeans": "algorithms",
+    "init_centroids": "algorithms",
+    "assign_clusters": "algorithms",
+    "nearest_centroid": "algorithms",
+    "update_centroids": "algorithms",
+    "cluster_sums_counts": "algorithms",
+
+    # --- NEW: Agglomerative Clustering ---
+    "fit_agglomerative": "agglomerative",
+    "fit_agglomerative_multi": "agglomerative",
+    "agglomerative_tree": "agglomerative",
+    "cut_tree_labels": "agglomerative",
+    "merge_heights": "agglomerative",
+
+    # --- Evaluation ---
+    "compute_inertia": "evaluation",
+    "silhouette_score_sklearn": "evaluation",
+    "silhouette_score_chunked": "evaluation",
+    "silhouette_score_sampled": "evaluation",
+    "simplified_silhouette": "evaluation",
+    "elbow_curve": "evaluation",
+
+    # --- Plotting ---
+    "plot_clusters_2d": "plotting_clustered",
+    "plot_elbow": "plotting_clustered",
+
+    # --- High-level interface ---
+    "Dataset": "dataset",
+    "KMeansModel": "model",
+    "read_csv_columns": "dataset",
+    "run_clustering": "interface",
+    "run_clustering_grid": "interface",
+
+    # --- Profiling ---
+    "Profiler": "profiling",
+    "append_profile_log": "profiling",
+    "read_profile_log": "profiling",
+}
+
+if TYPE_CHECKING:
+    from .dataframe_builder import (
+        define_dataframe_structure,
+        simulate_data,
+        iter_simulated_data,
+        write_simulated_data,
+    )
+    from .data_analyser import calculate_descriptive_statistics, calculate_correlation
+    from .data_exporter import (
+        export_to_csv,
+        export_formatted,
+        export_to_npy,
+        load_npy,
+        read_npy,
+        iter_npy_chunks,
+    )
+    from .preprocessing import select_features, standardise_features, Standardiser
+    from .algorithms import (
+        kmeans,
+        kmeans_elkan,
+        minibatch_kmeans,
+        sklearn_kmeans,
+        init_centroids,
+        assign_clusters,
+        nearest_centroid,
+        update_centroids,
+        cluster_sums_counts,
+    )
+    from .agglomerative import (
+        fit_agglomerative,
+        fit_agglomerative_multi,
+        agglomerative_tree,
+        cut_tree_labels,
+        merge_heights,
+    )
+    from .evaluation import (
+        compute_inertia,
+        silhouette_score_sklearn,
+        silhouette_score_chunked,
+        silhouette_score_sampled,
+        simplified_silhouette,
+        elbow_curve,
+    )
+    from .plotting_clustered import plot_clusters_2d, plot_elbow
+    from .dataset import Dataset, read_csv_columns
+    from .model import KMeansModel
+    from .interface import run_clustering, run_clustering_grid
+    from .profiling import Profiler, append_profile_log, read_profile_log
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Import the submodule defining a public name on first access.
+    """
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    # Cache it so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
+
+__all__ = list(_LAZY_NAMES)
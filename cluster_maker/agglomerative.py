@@ -6,10 +6,10 @@
 
 from __future__ import annotations
 
-from typing import Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 
 import numpy as np
-from sklearn.cluster import AgglomerativeClustering
+from scipy.cluster import hierarchy
 
 def fit_agglomerative(
     X: np.ndarray,
@@ -40,7 +40,150 @@ def fit_agglomerative(
     if n_clusters <= 0:
         raise ValueError("n_clusters must be a positive integer.")
 
+    from sklearn.cluster import AgglomerativeClustering
     model = AgglomerativeClustering(n_clusters=n_clusters, linkage=linkage)
     labels = model.fit_predict(X)
     
-    return labels, None
\ No newline at end of file
+    return labels, None
+
+
+def agglomerative_tree(
+    X: np.ndarray,
+    linkage: str = "ward",
+) -> np.ndarray:
+    """
+    Build the full agglomerative merge tree once using SciPy.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    linkage : {'ward', 'complete', 'average', 'single'}, default 'ward'
+        Which linkage criterion to use (Euclidean distances).
+
+    Returns
+    -------
+    Z : ndarray of shape (n_samples - 1, 4)
+        SciPy linkage matrix: row i merges clusters Z[i, 0] and Z[i, 1]
+        at height Z[i, 2] into a cluster of Z[i, 3] points.
+    """
+    if not isinstance(X, np.ndarray):
+        raise TypeError("X must be a NumPy array.")
+    if linkage not in ("ward", "complete", "average", "single"):
+        raise ValueError(f"Unknown linkage '{linkage}'.")
+    if X.shape[0] < 2:
+        raise ValueError("At least 2 samples are needed to build a tree.")
+
+    return hierarchy.linkage(X, method=linkage, metric="euclidean")
+
+
+def cut_tree_labels(
+    Z: np.ndarray,
+    k_values: List[int],
+) -> Dict[int, np.ndarray]:
+    """
+    Cut a linkage tree at several numbers of clusters.
+
+    Parameters
+    ----------
+    Z : ndarray
+        Linkage matrix from agglomerative_tree.
+    k_values : list of int
+        Numbers of clusters, each between 1 and n_samples.
+
+    Returns
+    -------
+    labels_dict : dict
+        Mapping from k to labels of shape (n_samples,) in 0..k-1, numbered
+        in order of first appearance (as scipy's cut_tree does).
+
+    Notes
+    -----
+    The merges are replayed into a union-find forest (parent[child] is
+    the merged cluster of Z's row) in increasing order, and labels are
+    read off when exactly n_samples - k merges have been applied. Paths
+    are fully compressed at each cut, so the work is close to linear in
+    n_samples per k instead of scipy's O(n_samples^2) cut_tree.
+    """
+    n_samples = Z.shape[0] + 1
+    if any(k <= 0 or k > n_samples for k in k_values):
+        raise ValueError("All k values must be between 1 and the number of samples.")
+
+    children = np.asarray(Z[:, :2], dtype=np.intp)
+    parent = np.arange(2 * n_samples - 1)
+    cuts: Dict[int, np.ndarray] = {}
+    n_merged = 0
+    for k in sorted(set(k_values), reverse=True):
+        stop = n_samples - k
+        parent[children[n_merged:stop].ravel()] = np.repeat(
+            np.arange(n_samples + n_merged, n_samples + stop), 2
+        )
+        n_merged = stop
+        # Pointer jumping until every node points at its root
+        while True:
+            grand = parent[parent]
+            if np.array_equal(grand, parent):
+                break
+            parent = grand
+        _, first, inverse = np.unique(parent[:n_samples], return_index=True, return_inverse=True)
+        rank = np.empty(first.shape[0], dtype=np.intp)
+        rank[np.argsort(first)] = np.arange(first.shape[0])
+        cuts[k] = rank[inverse]
+    return {k: cuts[k] for k in k_values}
+
+
+def merge_heights(
+    Z: np.ndarray,
+    k_values: List[int],
+) -> Dict[int, float]:
+    """
+    Dendrogram-based model-selection curve.
+
+    For each k, the height of the merge that left exactly k clusters.
+    Like inertia it decreases with k, and a sharp drop followed by a flat
+    tail (a long vertical gap in the dendrogram) suggests a natural k.
+
+    Parameters
+    ----------
+    Z : ndarray
+        Linkage matrix from agglomerative_tree.
+    k_values : list of int
+
+    Returns
+    -------
+    heights : dict
+        Mapping from k to merge height (0.0 when k >= n_samples).
+    """
+    n_samples = Z.shape[0] + 1
+    heights: Dict[int, float] = {}
+    for k in k_values:
+        if k <= 0:
+            raise ValueError("All k values must be positive integers.")
+        heights[k] = float(Z[n_samples - k - 1, 2]) if k < n_samples else 0.0
+    return heights
+
+
+def fit_agglomerative_multi(
+    X: np.ndarray,
+    k_values: List[int],
+    linkage: str = "ward",
+) -> Tuple[Dict[int, np.ndarray], Dict[int, float]]:
+    """
+    Agglomerative clustering for many k from a single merge tree.
+
+    The O(N^2) merge process runs once; each k is then a cheap tree cut.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    k_values : list of int
+    linkage : {'ward', 'complete', 'average', 'single'}, default 'ward'
+
+    Returns
+    -------
+    labels_dict : dict
+        Mapping from k to labels.
+    heights : dict
+        Mapping from k to merge height (see merge_heights).
+    """
+    Z = agglomerative_tree(X, linkage=linkage)
+    return cut_tree_labels(Z, k_values), merge_heights(Z, k_values)
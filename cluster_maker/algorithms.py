@@ -6,19 +6,68 @@
 
 from __future__ import annotations
 
-from typing import Tuple, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Optional, Union
 
 import numpy as np
-from sklearn.cluster import KMeans
+from scipy import sparse
+
+from .parallel import effective_n_jobs, init_worker, share_array, worker_array
+
+# Default working-memory budget (bytes) for blocked distance computations.
+DEFAULT_MEMORY_BUDGET = 64 * 1024 ** 2
+
+# The "auto" assignment backend switches to a KD-tree over the centroids
+# when k >= KDTREE_MIN_RATIO * 2 ** n_features (a KD-tree only prunes well
+# when it holds many more points than 2^D) and n_features is at most
+# KDTREE_MAX_FEATURES. Measured break-even k (100k-200k points): ~40 at
+# D=2, ~64 at D=3-4, ~400 at D=6, ~1500 at D=8; a ratio of 12 switches
+# just past each of these, so "auto" never picks the slower backend.
+KDTREE_MIN_RATIO = 12
+KDTREE_MAX_FEATURES = 16
+
+
+def _check_random_state(
+    random_state: Union[int, np.random.RandomState, None],
+) -> np.random.RandomState:
+    """
+    Turn None, an int seed or an existing RandomState into a RandomState.
+    Passing a RandomState through lets callers share one stream of draws.
+    """
+    if isinstance(random_state, np.random.RandomState):
+        return random_state
+    return np.random.RandomState(random_state)
 
 
 def init_centroids(
     X: np.ndarray,
     k: int,
-    random_state: Optional[int] = None,
+    random_state: Union[int, np.random.RandomState, None] = None,
+    init: Union[str, np.ndarray] = "random",
 ) -> np.ndarray:
     """
-    Initialise centroids by randomly sampling points from X without replacement.
+    Initialise centroids by sampling k distinct rows of X.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    k : int
+        Number of centroids.
+    random_state : int, RandomState or None
+    init : {"random", "k-means++", "k-means||"} or ndarray, default "random"
+        "random" samples rows uniformly without replacement.
+        "k-means++" samples each new centre with probability proportional
+        to its squared distance from the centres chosen so far.
+        "k-means||" oversamples candidates in a few passes over X and then
+        reduces them to k centres with weighted k-means++; it needs far
+        fewer passes than k-means++ when k is large.
+        An ndarray of shape (k, n_features) is used as the centroids
+        directly (e.g. to warm-start from an earlier solution).
+
+    Returns
+    -------
+    centroids : ndarray of shape (k, n_features)
     """
     if k <= 0:
         raise ValueError("k must be a positive integer.")
@@ -29,68 +78,488 @@ def init_centroids(
     if k > n_samples:
         raise ValueError("k cannot be larger than the number of samples.")
 
-    rng = np.random.RandomState(random_state)
-    # FIX 2: Ensure size=k (not k+1)
-    indices = rng.choice(n_samples, size=k, replace=False)
+    if isinstance(init, np.ndarray):
+        if init.shape != (k, X.shape[1]):
+            raise ValueError("init array must have shape (k, n_features).")
+        return init.copy()
+
+    rng = _check_random_state(random_state)
+    if init == "random":
+        # FIX 2: Ensure size=k (not k+1)
+        indices = rng.choice(n_samples, size=k, replace=False)
+    elif init == "k-means++":
+        indices = _kmeans_plusplus(X, k, rng)
+    elif init == "k-means||":
+        indices = _kmeans_parallel(X, k, rng)
+    else:
+        raise ValueError(
+            f"Unknown init '{init}'. Use 'random', 'k-means++' or 'k-means||'."
+        )
     return X[indices]
 
 
-def assign_clusters(X: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+def _float_dtype(X: np.ndarray) -> np.dtype:
+    """
+    Floating dtype in which centroids of X are kept: float32 data stays in
+    float32, anything else uses float64.
+    """
+    return X.dtype if X.dtype in (np.float32, np.float64) else np.dtype(np.float64)
+
+
+def _sq_dist_to_point(X: np.ndarray, point: np.ndarray) -> np.ndarray:
+    """
+    Squared Euclidean distance from every row of X to a single point.
+    """
+    out = np.empty(X.shape[0], dtype=float)
+    for start, stop, sq in iter_sq_distances(X, point[np.newaxis, :]):
+        out[start:stop] = sq[:, 0]
+    return out
+
+
+def _kmeans_plusplus(
+    X: np.ndarray,
+    k: int,
+    rng: np.random.RandomState,
+    sample_weight: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Indices of k rows of X chosen by (optionally weighted) k-means++.
+
+    The distance to the nearest chosen centre is kept in one vector and
+    refreshed against the newest centre only, so each step is O(N * D).
+    """
+    n_samples = X.shape[0]
+    weights = np.ones(n_samples) if sample_weight is None else sample_weight
+
+    cumulative = np.cumsum(weights)
+    first = int(np.searchsorted(cumulative, rng.uniform() * cumulative[-1], side="right"))
+    indices = [min(first, n_samples - 1)]
+    closest_sq = _sq_dist_to_point(X, X[indices[0]])
+
+    for _ in range(1, k):
+        cumulative = np.cumsum(weights * closest_sq)
+        total = cumulative[-1]
+        if total > 0:
+            idx = int(np.searchsorted(cumulative, rng.uniform() * total, side="right"))
+            idx = min(idx, n_samples - 1)
+        else:
+            # Every point coincides with a chosen centre: pick any other row.
+            remaining = np.setdiff1d(np.arange(n_samples), indices)
+            idx = int(rng.choice(remaining))
+        indices.append(idx)
+        np.minimum(closest_sq, _sq_dist_to_point(X, X[idx]), out=closest_sq)
+
+    return np.asarray(indices)
+
+
+def _kmeans_parallel(
+    X: np.ndarray,
+    k: int,
+    rng: np.random.RandomState,
+    n_rounds: int = 5,
+) -> np.ndarray:
+    """
+    Indices of k rows of X chosen by k-means|| (Bahmani et al., 2012).
+
+    Each of n_rounds passes samples about 2k candidates with probability
+    proportional to their squared distance from the current candidates.
+    The candidates are weighted by the number of points closest to them
+    and reduced to k centres with weighted k-means++.
+    """
+    n_samples = X.shape[0]
+    oversampling = 2 * k
+
+    candidates = [int(rng.randint(n_samples))]
+    closest_sq = _sq_dist_to_point(X, X[candidates[0]])
+    for _ in range(n_rounds):
+        phi = closest_sq.sum()
+        if phi <= 0:
+            break
+        probs = np.minimum(1.0, oversampling * closest_sq / phi)
+        new = np.flatnonzero(rng.uniform(size=n_samples) < probs)
+        if new.size == 0:
+            continue
+        candidates.extend(new.tolist())
+        _, new_sq = nearest_centroid(X, X[new])
+        np.minimum(closest_sq, new_sq, out=closest_sq)
+
+    candidates = np.unique(candidates)
+    if candidates.size < k:
+        # Too few distinct candidates: top up with random rows.
+        others = np.setdiff1d(np.arange(n_samples), candidates)
+        extra = rng.choice(others, size=k - candidates.size, replace=False)
+        candidates = np.concatenate([candidates, extra])
+
+    owner, _ = nearest_centroid(X, X[candidates])
+    weights = np.bincount(owner, minlength=candidates.size).astype(float)
+    chosen = _kmeans_plusplus(X[candidates], k, rng, sample_weight=weights)
+    return candidates[chosen]
+
+
+def _row_block_size(
+    n_samples: int,
+    n_cols: int,
+    itemsize: int,
+    memory_budget: Optional[int] = None,
+) -> int:
+    """
+    Number of rows of X to process at once so that an (n_rows, n_cols)
+    temporary of the given itemsize fits inside the memory budget (bytes).
+    """
+    budget = DEFAULT_MEMORY_BUDGET if memory_budget is None else memory_budget
+    if budget <= 0:
+        raise ValueError("memory_budget must be a positive number of bytes.")
+    rows = int(budget // max(1, n_cols * itemsize))
+    return max(1, min(n_samples, rows))
+
+
+def iter_sq_distances(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    memory_budget: Optional[int] = None,
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Yield squared Euclidean distances from blocks of rows of X to all centroids.
+
+    Distances are computed with the expansion ||x||^2 - 2 x.c + ||c||^2, so
+    the work is a single matrix multiply per block and no (N, K, D)
+    difference tensor is ever created. The expansion cancels badly in
+    float32 for data far from the origin, so each block and the centroids
+    are upcast to float64 for it (as scikit-learn does); float32 data is
+    still only converted one block at a time.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    centroids : ndarray of shape (k, n_features)
+    memory_budget : int or None
+        Approximate size in bytes of the per-block distance matrix.
+        Defaults to DEFAULT_MEMORY_BUDGET.
+
+    Yields
+    ------
+    start, stop : int
+        Row range of X covered by the block.
+    sq_dist : ndarray of shape (stop - start, k), float64
+    """
+    C = np.asarray(centroids, dtype=np.float64)
+    c_sq = np.einsum("ij,ij->i", C, C)
+    n_samples = X.shape[0]
+    block = _row_block_size(n_samples, C.shape[0] + X.shape[1] + 1, 8, memory_budget)
+
+    for start in range(0, n_samples, block):
+        stop = min(start + block, n_samples)
+        Xb = np.asarray(X[start:stop], dtype=np.float64)
+        sq_dist = Xb @ C.T
+        sq_dist *= -2.0
+        sq_dist += c_sq
+        sq_dist += np.einsum("ij,ij->i", Xb, Xb)[:, np.newaxis]
+        # Rounding in the expansion can give tiny negative values.
+        np.maximum(sq_dist, 0.0, out=sq_dist)
+        yield start, stop, sq_dist
+
+
+def _use_kdtree(k: int, n_features: int, backend: str) -> bool:
+    """
+    Resolve an assignment backend name to "use a KD-tree or not".
+    """
+    if backend == "auto":
+        return n_features <= KDTREE_MAX_FEATURES and k >= KDTREE_MIN_RATIO * 2 ** n_features
+    if backend not in ("matmul", "kdtree"):
+        raise ValueError(f"Unknown backend '{backend}'. Use 'auto', 'matmul' or 'kdtree'.")
+    return backend == "kdtree"
+
+
+def _kdtree_nearest(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    memory_budget: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    nearest_centroid via a KD-tree built over the centroids: O(log k)
+    per sample in low dimensions instead of O(k).
+    """
+    # Imported here so that importing the algorithms stays light
+    from scipy.spatial import cKDTree
+
+    dtype = np.result_type(X.dtype, centroids.dtype, np.float32)
+    tree = cKDTree(centroids)
+    n_samples = X.shape[0]
+    # The tree works in float64, so blocks are converted one at a time
+    block = _row_block_size(n_samples, X.shape[1] + 2, 8, memory_budget)
+
+    labels = np.empty(n_samples, dtype=np.intp)
+    min_sq_dist = np.empty(n_samples, dtype=dtype)
+    for start in range(0, n_samples, block):
+        stop = min(start + block, n_samples)
+        dist, labels[start:stop] = tree.query(np.asarray(X[start:stop], dtype=np.float64))
+        min_sq_dist[start:stop] = dist ** 2
+    return labels, min_sq_dist
+
+
+def nearest_centroid(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    memory_budget: Optional[int] = None,
+    backend: str = "auto",
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the nearest centroid of every sample and its squared distance.
+
+    X is processed in row blocks sized to memory_budget (bytes), so peak
+    memory is independent of n_samples.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    centroids : ndarray of shape (k, n_features)
+    memory_budget : int or None
+        Defaults to DEFAULT_MEMORY_BUDGET.
+    backend : {"auto", "matmul", "kdtree"}, default "auto"
+        "matmul" compares every sample with every centroid through one
+        matrix product per block. "kdtree" queries a SciPy cKDTree built
+        over the centroids, which is much faster for large k in few
+        dimensions. "auto" picks "kdtree" when k >= 12 * 2^n_features and
+        n_features <= 16 (see KDTREE_MIN_RATIO), and "matmul" otherwise.
+        Exact ties between centroids may be broken differently by the two.
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+    min_sq_dist : ndarray of shape (n_samples,)
+        In float32 for float32 data and centroids, float64 otherwise;
+        the distances themselves are always computed in float64 (see
+        iter_sq_distances).
+    """
+    if _use_kdtree(centroids.shape[0], centroids.shape[1], backend):
+        return _kdtree_nearest(X, centroids, memory_budget)
+
+    dtype = np.result_type(X.dtype, centroids.dtype, np.float32)
+    C = np.asarray(centroids, dtype=np.float64)
+    c_sq = np.einsum("ij,ij->i", C, C)
+    n_samples = X.shape[0]
+    block = _row_block_size(n_samples, C.shape[0] + X.shape[1] + 1, 8, memory_budget)
+
+    labels = np.empty(n_samples, dtype=np.intp)
+    min_sq_dist = np.empty(n_samples, dtype=dtype)
+    for start in range(0, n_samples, block):
+        stop = min(start + block, n_samples)
+        Xb = np.asarray(X[start:stop], dtype=np.float64)
+        # ||x||^2 is constant along each row, so it is not needed for argmin.
+        scores = Xb @ C.T
+        scores *= -2.0
+        scores += c_sq
+        block_labels = np.argmin(scores, axis=1)
+        labels[start:stop] = block_labels
+        best = scores[np.arange(stop - start), block_labels]
+        best += np.einsum("ij,ij->i", Xb, Xb)
+        min_sq_dist[start:stop] = np.maximum(best, 0.0)
+    return labels, min_sq_dist
+
+
+def assign_clusters(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    memory_budget: Optional[int] = None,
+    backend: str = "auto",
+) -> np.ndarray:
     """
     Assign each sample to the nearest centroid (Euclidean distance).
+
+    Uses nearest_centroid: the blocked matrix-multiply kernel (no square
+    roots, since only the argmin is needed) or, for large k in few
+    dimensions, a KD-tree over the centroids (see backend there).
     """
-    # X: (n_samples, n_features)
-    # centroids: (k, n_features)
-    # Broadcast to compute distances: (N, 1, D) - (1, K, D) -> (N, K, D)
-    diff = X[:, np.newaxis, :] - centroids[np.newaxis, :, :]
-    
-    # FIX 3: Calculate norm along axis=2 (features), not axis=1 (clusters)
-    distances = np.linalg.norm(diff, axis=2)  # Result shape: (n_samples, k)
-    
-    # FIX 4: Use argmin for nearest distance (not argmax)
-    labels = np.argmin(distances, axis=1)
+    labels, _ = nearest_centroid(X, centroids, memory_budget=memory_budget, backend=backend)
     return labels
 
 
+def cluster_sums_counts(
+    X: np.ndarray,
+    labels: np.ndarray,
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-cluster sums and counts (the K-means sufficient statistics).
+
+    Both are computed in one pass over X via a sparse one-hot matrix
+    product, and sums are accumulated in float64.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+        Integer labels in the range [0, k).
+    k : int
+        Number of clusters.
+
+    Returns
+    -------
+    sums : ndarray of shape (k, n_features)
+    counts : ndarray of shape (k,)
+    """
+    labels = np.asarray(labels)
+    n_samples = X.shape[0]
+    if labels.shape[0] != n_samples:
+        raise ValueError("X and labels must have the same number of samples.")
+
+    one_hot = sparse.csr_matrix(
+        (np.ones(n_samples, dtype=np.float64), (labels, np.arange(n_samples))),
+        shape=(k, n_samples),
+    )
+    sums = np.asarray(one_hot @ X, dtype=np.float64)
+    counts = np.bincount(labels, minlength=k)
+    return sums, counts
+
+
 def update_centroids(
     X: np.ndarray,
     labels: np.ndarray,
     k: int,
-    random_state: Optional[int] = None,
+    random_state: Union[int, np.random.RandomState, None] = None,
 ) -> np.ndarray:
     """
     Update centroids by taking the mean of points in each cluster.
     If a cluster becomes empty, re-initialise its centroid randomly from X.
+
+    Sums are accumulated in float64; the centroids have the dtype of X
+    if it is float32 or float64, and float64 otherwise.
+
+    random_state may be a RandomState, in which case successive calls keep
+    drawing from the same stream instead of re-seeding each time.
     """
-    n_features = X.shape[1]
-    new_centroids = np.zeros((k, n_features), dtype=float)
-    rng = np.random.RandomState(random_state)
+    sums, counts = cluster_sums_counts(X, labels, k)
+    # Means are formed from the float64 sums, then stored in X's precision
+    new_centroids = np.empty(sums.shape, dtype=_float_dtype(X))
+    non_empty = counts > 0
+    new_centroids[non_empty] = sums[non_empty] / counts[non_empty, np.newaxis]
 
-    for cluster_id in range(k):
-        mask = labels == cluster_id
-        if not np.any(mask):
-            # Empty cluster: re-initialise randomly
-            idx = rng.randint(0, X.shape[0])
-            new_centroids[cluster_id] = X[idx]
-        else:
-            new_centroids[cluster_id] = X[mask].mean(axis=0)
+    empty = np.flatnonzero(~non_empty)
+    if empty.size:
+        # Empty clusters: re-initialise randomly
+        rng = _check_random_state(random_state)
+        idx = rng.randint(0, X.shape[0], size=empty.size)
+        new_centroids[empty] = X[idx]
 
     return new_centroids
 
 
+def _lloyd(
+    X: np.ndarray,
+    k: int,
+    max_iter: int,
+    tol: float,
+    random_state: Union[int, np.random.RandomState, None],
+    init: Union[str, np.ndarray],
+    callback: Optional[Callable[[Dict[str, Any]], Optional[bool]]] = None,
+) -> Tuple[np.ndarray, np.ndarray, float, List[Dict[str, Any]]]:
+    """
+    A single run of Lloyd's algorithm.
+    Returns labels, centroids, inertia and the per-iteration history.
+
+    The run stops when no label changes (the centroids are then already
+    the means of the final labels, so that assignment pass is the last
+    one), when the centroid shift drops below tol, when callback returns
+    True, or after max_iter iterations. Only the last three need a final
+    assignment pass against the updated centroids.
+    """
+    rng = _check_random_state(random_state)
+    centroids = init_centroids(X, k, random_state=rng, init=init)
+    history: List[Dict[str, Any]] = []
+    labels: Optional[np.ndarray] = None
+    for n_iter in range(1, max_iter + 1):
+        start = time.perf_counter()
+        new_labels, min_sq_dist = nearest_centroid(X, centroids)
+        inertia = float(np.sum(min_sq_dist, dtype=np.float64))
+        n_changed = X.shape[0] if labels is None else int(np.count_nonzero(new_labels != labels))
+        labels = new_labels
+        if n_changed == 0:
+            shift = 0.0
+        else:
+            new_centroids = update_centroids(X, labels, k, random_state=rng)
+            shift = float(np.linalg.norm(new_centroids - centroids))
+            centroids = new_centroids
+
+        record = {
+            "iteration": n_iter,
+            "time": time.perf_counter() - start,
+            "inertia": inertia,
+            "n_changed": n_changed,
+            "shift": shift,
+        }
+        history.append(record)
+        stop = bool(callback(record)) if callback is not None else False
+        if stop and n_changed != 0 and shift >= tol:
+            record["stopped"] = True
+        if n_changed == 0:
+            return labels, centroids, inertia, history
+        if shift < tol or stop:
+            break
+
+    labels, min_sq_dist = nearest_centroid(X, centroids)
+    return labels, centroids, float(np.sum(min_sq_dist, dtype=np.float64)), history
+
+
+def _stop_at(
+    deadline: Optional[float],
+    callback: Optional[Callable[[Dict[str, Any]], Optional[bool]]] = None,
+) -> Optional[Callable[[Dict[str, Any]], Optional[bool]]]:
+    """
+    Wrap callback so that the run also stops at the first iteration that
+    ends after deadline, a time.time() value (comparable across
+    processes). No deadline returns callback unchanged.
+    """
+    if deadline is None:
+        return callback
+
+    def stop(record):
+        requested = callback is not None and bool(callback(record))
+        return requested or time.time() >= deadline
+    return stop
+
+
+def _restart_task(
+    seed: int,
+    k: int,
+    max_iter: int,
+    tol: float,
+    init: Union[str, np.ndarray],
+    deadline: Optional[float] = None,
+) -> Tuple[np.ndarray, float, List[Dict[str, Any]]]:
+    """
+    Run one kmeans restart on the worker's shared X. Only the centroids,
+    inertia and history are sent back; the parent recomputes the labels
+    once. The restart stops at deadline if one is given (see _stop_at).
+    """
+    _, centroids, inertia, history = _lloyd(
+        worker_array(), k, max_iter, tol, seed, init, _stop_at(deadline)
+    )
+    return centroids, inertia, history
+
+
 def kmeans(
     X: np.ndarray,
     k: int,
     max_iter: int = 300,
     tol: float = 1e-4,
     random_state: Optional[int] = None,
-) -> Tuple[np.ndarray, np.ndarray]:
+    init: Union[str, np.ndarray] = "random",
+    n_init: int = 1,
+    n_jobs: Optional[int] = None,
+    time_budget: Optional[float] = None,
+    return_n_iter: bool = False,
+    callback: Optional[Callable[[Dict[str, Any]], Optional[bool]]] = None,
+    return_history: bool = False,
+):
     """
     Simple manual K-means implementation.
 
     Parameters
     ----------
     X : ndarray of shape (n_samples, n_features)
+        float32 data is clustered in float32 (centroids, stored distances);
+        distance expansions, cluster sums and the inertia are computed in
+        float64, so offset data is not affected by cancellation.
     k : int
         Number of clusters.
     max_iter : int, default 300
@@ -98,33 +567,392 @@ def kmeans(
     tol : float, default 1e-4
         Convergence tolerance on centroid movement.
     random_state : int or None
+    init : {"random", "k-means++", "k-means||"} or ndarray, default "random"
+        Centroid initialisation, see init_centroids.
+    n_init : int, default 1
+        Number of restarts; the run with the lowest inertia is returned.
+        With n_init > 1 the seed of each restart is derived from
+        random_state through numpy's SeedSequence, so without a
+        time_budget the result does not depend on n_jobs.
+    n_jobs : int or None, default None
+        Number of worker processes for the restarts (-1 for all CPUs).
+        X is placed once in shared memory rather than pickled per worker.
+    time_budget : float or None, default None
+        Wall-clock budget in seconds for n_init > 1, applied the same way
+        serially and in parallel: the first restart always runs to
+        convergence (so the call can take longer than the budget); once
+        the budget is exceeded, restarts not yet started are skipped and
+        the others stop at the end of their current iteration. Stopped
+        restarts still compete on inertia; if one is chosen, its n_iter
+        is short and the last history record has "stopped": True. No
+        worker outlives the call.
+    return_n_iter : bool, default False
+        If True, also return the number of iterations of the chosen run.
+    callback : callable or None, default None
+        Called after every iteration with that iteration's history record
+        (see return_history; with n_init > 1 it also has a "restart"
+        index). Returning True stops that run early. Not supported with
+        parallel restarts.
+    return_history : bool, default False
+        If True, also return the history of the chosen run: one dict per
+        iteration with "iteration", "time" (seconds), "inertia" (of the
+        assignment made in that iteration), "n_changed" (points whose
+        label changed) and "shift" (norm of the centroid update). The
+        last record of a run stopped by callback or time_budget also has
+        "stopped": True.
 
     Returns
     -------
     labels : ndarray of shape (n_samples,)
     centroids : ndarray of shape (k, n_features)
+    n_iter : int, only if return_n_iter is True
+    history : list of dict, only if return_history is True
+
+    Notes
+    -----
+    Iteration stops as soon as an assignment pass changes no label, since
+    the centroids are then fixed; that pass doubles as the final
+    assignment. Otherwise it stops when the centroid shift is below tol.
     """
     if not isinstance(X, np.ndarray):
         raise TypeError("X must be a NumPy array.")
+    if n_init <= 0:
+        raise ValueError("n_init must be a positive integer.")
+
+    def finish(labels, centroids, history):
+        out = (labels, centroids)
+        if return_n_iter:
+            out += (len(history),)
+        if return_history:
+            out += (history,)
+        return out
+
+    if n_init == 1:
+        labels, centroids, _, history = _lloyd(X, k, max_iter, tol, random_state, init, callback)
+        return finish(labels, centroids, history)
+
+    seeds = [int(s) for s in np.random.SeedSequence(random_state).generate_state(n_init)]
+    n_workers = min(effective_n_jobs(n_jobs), n_init)
+    if callback is not None and n_workers > 1:
+        raise ValueError("callback is not supported with parallel restarts (n_jobs > 1).")
+    deadline = None if time_budget is None else time.time() + time_budget
+    results: List[Tuple[float, int, np.ndarray, List[Dict[str, Any]], Optional[np.ndarray]]] = []
 
-    centroids = init_centroids(X, k, random_state=random_state)
-    for _ in range(max_iter):
+    if n_workers == 1:
+        for i, seed in enumerate(seeds):
+            if i > 0 and deadline is not None and time.time() >= deadline:
+                break
+            restart_callback = None
+            if callback is not None:
+                def restart_callback(record, i=i):
+                    return callback({**record, "restart": i})
+            labels, centroids, inertia, history = _lloyd(
+                X, k, max_iter, tol, seed, init,
+                _stop_at(None if i == 0 else deadline, restart_callback),
+            )
+            results.append((inertia, i, centroids, history, labels))
+    else:
+        with share_array(X) as handle:
+            executor = ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=init_worker,
+                initargs=(handle,),
+            )
+            try:
+                # The first restart is submitted first and never stopped
+                futures = {
+                    executor.submit(
+                        _restart_task, seed, k, max_iter, tol, init,
+                        None if i == 0 else deadline,
+                    ): i
+                    for i, seed in enumerate(seeds)
+                }
+                if deadline is not None:
+                    wait(futures, timeout=max(0.0, deadline - time.time()))
+                    # Queued restarts are dropped; running ones stop at
+                    # their next iteration (see _restart_task)
+                    for future, i in futures.items():
+                        if i > 0:
+                            future.cancel()
+                for future, i in futures.items():
+                    if not future.cancelled():
+                        centroids, inertia, history = future.result()
+                        results.append((inertia, i, centroids, history, None))
+            finally:
+                # Running restarts have stopped or finished, so joining
+                # the workers is quick and leaves no CPU in use
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    # Lowest inertia wins; ties go to the earliest restart.
+    _, _, centroids, history, labels = min(results, key=lambda r: (r[0], r[1]))
+    if labels is None:
+        # Worker restarts only send back centroids
         labels = assign_clusters(X, centroids)
-        new_centroids = update_centroids(X, labels, k, random_state=random_state)
+    return finish(labels, centroids, history)
+
+
+def _pair_distances(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    memory_budget: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Exact Euclidean distances between X[rows[i]] and centroids[cols[i]],
+    evaluated in blocks of pairs to bound the gathered temporaries.
+    """
+    out = np.empty(rows.shape[0], dtype=float)
+    block = _row_block_size(rows.shape[0], X.shape[1], 8, memory_budget)
+    for start in range(0, rows.shape[0], block):
+        stop = min(start + block, rows.shape[0])
+        diff = X[rows[start:stop]] - centroids[cols[start:stop]]
+        out[start:stop] = np.sqrt(np.einsum("ij,ij->i", diff, diff))
+    return out
+
+
+def _elkan_reassign(
+    X: np.ndarray,
+    centroids: np.ndarray,
+    labels: np.ndarray,
+    upper: np.ndarray,
+    lower: np.ndarray,
+) -> int:
+    """
+    One Elkan assignment pass. Updates labels and the bounds in place and
+    returns the number of point-to-centroid distances actually computed.
+    """
+    k = centroids.shape[0]
+    center_dist = np.empty((k, k))
+    for start, stop, sq in iter_sq_distances(centroids, centroids):
+        center_dist[start:stop] = np.sqrt(sq)
+    half = 0.5 * center_dist
+    np.fill_diagonal(half, np.inf)
+    s = half.min(axis=1)
+    np.fill_diagonal(half, 0.0)
+
+    # Points whose upper bound is within half the gap to the nearest
+    # other centroid cannot change cluster.
+    active = np.flatnonzero(upper > s[labels])
+    if active.size == 0:
+        return 0
+
+    a = labels[active]
+    rows = np.arange(active.size)
+    cand = (upper[active, np.newaxis] > lower[active]) & (
+        upper[active, np.newaxis] > half[a]
+    )
+    cand[rows, a] = False
+    keep = cand.any(axis=1)
+    active, a, cand = active[keep], a[keep], cand[keep]
+    if active.size == 0:
+        return 0
+    rows = np.arange(active.size)
+
+    # Tighten the upper bound to the exact distance to the current centroid.
+    d_a = _pair_distances(X, centroids, active, a)
+    upper[active] = d_a
+    lower[active, a] = d_a
+    cand &= (d_a[:, np.newaxis] > lower[active]) & (d_a[:, np.newaxis] > half[a])
+
+    r, c = np.nonzero(cand)
+    d = _pair_distances(X, centroids, active[r], c)
+    lower[active[r], c] = d
+
+    dist = np.full((active.size, k), np.inf)
+    dist[rows, a] = d_a
+    dist[r, c] = d
+    best = np.argmin(dist, axis=1)
+    labels[active] = best
+    upper[active] = dist[rows, best]
+    return int(active.size + r.size)
+
+
+def kmeans_elkan(
+    X: np.ndarray,
+    k: int,
+    max_iter: int = 300,
+    tol: float = 1e-4,
+    random_state: Optional[int] = None,
+    init: Union[str, np.ndarray] = "random",
+    return_stats: bool = False,
+):
+    """
+    K-means accelerated with Elkan's triangle-inequality bounds.
+
+    Each point keeps an upper bound on the distance to its own centroid
+    and a lower bound on the distance to every other centroid. Together
+    with the inter-centroid distances these let most distance evaluations
+    be skipped once labels settle. Initialisation, centroid updates and
+    the stopping rule are those of kmeans, so the labels are the same.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    k : int
+        Number of clusters.
+    max_iter : int, default 300
+        Maximum number of iterations.
+    tol : float, default 1e-4
+        Convergence tolerance on centroid movement.
+    random_state : int or None
+    init : {"random", "k-means++", "k-means||"} or ndarray, default "random"
+        Centroid initialisation, see init_centroids.
+    return_stats : bool, default False
+        If True, also return a dict with "n_iter", "distance_evals" and
+        "distance_evals_pruned" (point-to-centroid distances skipped
+        compared with a plain Lloyd iteration).
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+    centroids : ndarray of shape (k, n_features)
+    stats : dict, only if return_stats is True
+    """
+    if not isinstance(X, np.ndarray):
+        raise TypeError("X must be a NumPy array.")
+
+    rng = _check_random_state(random_state)
+    centroids = init_centroids(X, k, random_state=rng, init=init)
+    n_samples = X.shape[0]
+
+    # The first pass computes every distance and seeds the bounds.
+    lower = np.empty((n_samples, k))
+    for start, stop, sq in iter_sq_distances(X, centroids):
+        lower[start:stop] = np.sqrt(sq)
+    labels = np.argmin(lower, axis=1)
+    upper = lower[np.arange(n_samples), labels]
+    n_evals = n_samples * k
+    n_passes = 1
+
+    n_iter = 0
+    for n_iter in range(1, max_iter + 1):
+        if n_iter > 1:
+            n_evals += _elkan_reassign(X, centroids, labels, upper, lower)
+            n_passes += 1
+        new_centroids = update_centroids(X, labels, k, random_state=rng)
+        moved = np.sqrt(np.sum((new_centroids - centroids) ** 2, axis=1))
+        upper += moved[labels]
+        lower -= moved
+        np.maximum(lower, 0.0, out=lower)
         shift = np.linalg.norm(new_centroids - centroids)
         centroids = new_centroids
         if shift < tol:
             break
 
+    n_evals += _elkan_reassign(X, centroids, labels, upper, lower)
+    n_passes += 1
+
+    if not return_stats:
+        return labels, centroids
+    stats = {
+        "n_iter": n_iter,
+        "distance_evals": n_evals,
+        "distance_evals_pruned": n_passes * n_samples * k - n_evals,
+    }
+    return labels, centroids, stats
+
+
+def minibatch_update(
+    centroids: np.ndarray,
+    counts: np.ndarray,
+    X_batch: np.ndarray,
+) -> np.ndarray:
+    """
+    Apply one mini-batch K-means step to centroids and counts in place.
+
+    Each centroid moves towards the mean of its batch points with its own
+    learning rate n_batch / n_seen, where n_seen is the number of points
+    assigned to it so far (Sculley, 2010).
+
+    Parameters
+    ----------
+    centroids : ndarray of shape (k, n_features)
+        Current centroids, updated in place.
+    counts : ndarray of shape (k,)
+        Points seen per centroid so far, updated in place.
+    X_batch : ndarray of shape (batch_size, n_features)
+
+    Returns
+    -------
+    labels : ndarray of shape (batch_size,)
+        Batch labels with respect to the centroids before the update.
+    """
+    k = centroids.shape[0]
+    labels = assign_clusters(X_batch, centroids)
+    sums, batch_counts = cluster_sums_counts(X_batch, labels, k)
+    hit = batch_counts > 0
+    counts[hit] += batch_counts[hit]
+    step = sums[hit] - batch_counts[hit, np.newaxis] * centroids[hit]
+    centroids[hit] += step / counts[hit, np.newaxis]
+    return labels
+
+
+def minibatch_kmeans(
+    X: np.ndarray,
+    k: int,
+    batch_size: int = 1024,
+    max_iter: int = 100,
+    tol: float = 1e-4,
+    random_state: Optional[int] = None,
+    init: Union[str, np.ndarray] = "random",
+    return_n_iter: bool = False,
+):
+    """
+    Mini-batch K-means on an in-memory array.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    k : int
+        Number of clusters.
+    batch_size : int, default 1024
+        Number of samples per update.
+    max_iter : int, default 100
+        Maximum number of passes (epochs) over shuffled batches of X.
+    tol : float, default 1e-4
+        Convergence tolerance on centroid movement over one epoch.
+    random_state : int or None
+    init : {"random", "k-means++", "k-means||"} or ndarray, default "random"
+        Centroid initialisation, see init_centroids.
+    return_n_iter : bool, default False
+        If True, also return the number of epochs run.
+
+    Returns
+    -------
+    labels : ndarray of shape (n_samples,)
+    centroids : ndarray of shape (k, n_features)
+    n_iter : int, only if return_n_iter is True
+    """
+    if not isinstance(X, np.ndarray):
+        raise TypeError("X must be a NumPy array.")
+    if batch_size <= 0:
+        raise ValueError("batch_size must be a positive integer.")
+
+    rng = _check_random_state(random_state)
+    centroids = np.array(init_centroids(X, k, random_state=rng, init=init), dtype=_float_dtype(X))
+    counts = np.zeros(k, dtype=np.int64)
+    n_samples = X.shape[0]
+
+    n_iter = 0
+    for n_iter in range(1, max_iter + 1):
+        previous = centroids.copy()
+        order = rng.permutation(n_samples)
+        for start in range(0, n_samples, batch_size):
+            minibatch_update(centroids, counts, X[order[start:start + batch_size]])
+        if np.linalg.norm(centroids - previous) < tol:
+            break
+
     labels = assign_clusters(X, centroids)
-    return labels, centroids
+    return (labels, centroids, n_iter) if return_n_iter else (labels, centroids)
 
 
 def sklearn_kmeans(
     X: np.ndarray,
     k: int,
     random_state: Optional[int] = None,
-) -> Tuple[np.ndarray, np.ndarray]:
+    return_n_iter: bool = False,
+):
     """
     Thin wrapper around scikit-learn's KMeans.
 
@@ -132,10 +960,15 @@ def sklearn_kmeans(
     -------
     labels : ndarray of shape (n_samples,)
     centroids : ndarray of shape (k, n_features)
+    n_iter : int, only if return_n_iter is True
+        Iterations of the best of scikit-learn's restarts.
     """
     if not isinstance(X, np.ndarray):
         raise TypeError("X must be a NumPy array.")
 
+    # Imported here so that importing the manual algorithms stays light
+    from sklearn.cluster import KMeans
+
     model = KMeans(
         n_clusters=k,
         random_state=random_state,
@@ -144,4 +977,4 @@ def sklearn_kmeans(
     model.fit(X)
     labels = model.labels_
     centroids = model.cluster_centers_
-    return labels, centroids
\ No newline at end of file
+    return (labels, centroids, model.n_iter_) if return_n_iter else (labels, centroids)
\ No newline at end of file
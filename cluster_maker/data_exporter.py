@@ -6,8 +6,11 @@
 
 from __future__ import annotations
 
-from typing import Union, TextIO
+import json
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, TextIO
 
+import numpy as np
 import pandas as pd
 
 
@@ -57,4 +60,219 @@ def export_formatted(
         with open(file, "w", encoding="utf-8") as f:
             f.write(table_str)
     else:
-        file.write(table_str)
\ No newline at end of file
+        file.write(table_str)
+
+
+# Sidecar file describing a column-oriented .npy dataset directory.
+NPY_METADATA_FILE = "metadata.json"
+NPY_FORMAT_VERSION = 1
+
+
+def _column_array(values: pd.Series) -> np.ndarray:
+    """
+    Column values as a memory-mappable array (no Python objects).
+    """
+    arr = values.to_numpy()
+    if arr.dtype.hasobject:
+        # Text and mixed columns become fixed-width unicode, which has no
+        # missing value: str(None) would silently store "None"
+        if values.isna().any():
+            raise ValueError(
+                f"Column '{values.name}' contains missing values, which cannot be "
+                "stored in a text .npy column."
+            )
+        arr = arr.astype(str)
+    return arr
+
+
+def export_to_npy(
+    data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+    directory: str,
+    n_rows: Optional[int] = None,
+    str_widths: Optional[Dict[str, int]] = None,
+) -> None:
+    """
+    Export data to a column-oriented binary dataset.
+
+    Each column is written to its own .npy file inside directory, plus a
+    JSON sidecar (metadata.json) with the column names, dtypes, file names
+    and row count. Columns can then be reopened instantly and memory-mapped
+    with load_npy.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame or iterable of DataFrame
+        The data, or chunks of it with identical columns in the same
+        order (e.g. from iter_simulated_data), written one after the other.
+    directory : str
+        Output directory, created if needed. The metadata.json of an
+        earlier export there is removed before any column is written.
+    n_rows : int or None
+        Total number of rows. Required when data is an iterable of chunks.
+    str_widths : dict or None
+        Minimum width (in characters) of text columns, by name. Text
+        columns are stored at a fixed width, set from the first chunk
+        unless given here; a later chunk with longer strings raises a
+        ValueError instead of being truncated.
+
+    Raises
+    ------
+    ValueError
+        On a row-count mismatch, a chunk whose columns differ from the
+        first chunk's, missing values in a text column, or a text value
+        wider than its column.
+    """
+    if isinstance(data, pd.DataFrame):
+        chunks: Iterator[pd.DataFrame] = iter([data])
+        n_rows = len(data)
+    else:
+        if n_rows is None:
+            raise ValueError("n_rows is required when exporting an iterable of chunks.")
+        chunks = iter(data)
+
+    os.makedirs(directory, exist_ok=True)
+    # Without the old sidecar, an interrupted overwrite is not readable
+    metadata_path = os.path.join(directory, NPY_METADATA_FILE)
+    if os.path.exists(metadata_path):
+        os.remove(metadata_path)
+    names: List[Any] = []
+    columns: List[Dict[str, Any]] = []
+    outputs: List[np.ndarray] = []
+    written = 0
+    for chunk in chunks:
+        if not isinstance(chunk, pd.DataFrame):
+            raise TypeError("data must be a pandas DataFrame or an iterable of DataFrames.")
+        if not outputs:
+            names = list(chunk.columns)
+            for i, name in enumerate(names):
+                dtype = _column_array(chunk[name]).dtype
+                if dtype.kind == "U" and str_widths and name in str_widths:
+                    dtype = np.dtype(f"<U{max(str_widths[name], dtype.itemsize // 4)}")
+                filename = f"column_{i:04d}.npy"
+                outputs.append(np.lib.format.open_memmap(
+                    os.path.join(directory, filename), mode="w+", dtype=dtype, shape=(n_rows,)
+                ))
+                columns.append({"name": str(name), "dtype": dtype.str, "file": filename})
+        elif list(chunk.columns) != names:
+            raise ValueError(
+                f"Chunk columns {list(chunk.columns)} do not match the first chunk's {names}."
+            )
+        if written + len(chunk) > n_rows:
+            raise ValueError("The chunks contain more rows than n_rows.")
+        for out, name in zip(outputs, names):
+            arr = _column_array(chunk[name])
+            if arr.dtype.kind == "U" and arr.dtype.itemsize > out.dtype.itemsize:
+                raise ValueError(
+                    f"Column '{name}' has values of {arr.dtype.itemsize // 4} characters, "
+                    f"wider than its stored width of {out.dtype.itemsize // 4}; "
+                    "pass a larger width in str_widths."
+                )
+            out[written:written + len(chunk)] = arr
+        written += len(chunk)
+
+    if written != n_rows:
+        raise ValueError(f"Expected {n_rows} rows but the data contained {written}.")
+    for out in outputs:
+        out.flush()
+
+    metadata = {
+        "format_version": NPY_FORMAT_VERSION,
+        "n_rows": n_rows,
+        "columns": columns,
+    }
+    # The sidecar is written last, so a partial export is never readable
+    with open(metadata_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+
+
+def is_npy_dataset(path: str) -> bool:
+    """
+    True if path is a directory written by export_to_npy.
+    """
+    return os.path.isfile(os.path.join(path, NPY_METADATA_FILE))
+
+
+def read_npy_metadata(directory: str) -> Dict[str, Any]:
+    """
+    Read the JSON sidecar of a dataset written by export_to_npy.
+    """
+    with open(os.path.join(directory, NPY_METADATA_FILE), encoding="utf-8") as f:
+        metadata = json.load(f)
+    if metadata.get("format_version") != NPY_FORMAT_VERSION:
+        raise ValueError(f"Unsupported dataset format version in {directory}.")
+    return metadata
+
+
+def load_npy(
+    directory: str,
+    columns: Optional[List[str]] = None,
+    mmap: bool = True,
+) -> Dict[str, np.ndarray]:
+    """
+    Open the columns of a dataset written by export_to_npy.
+
+    Parameters
+    ----------
+    directory : str
+    columns : list of str or None
+        Columns to open (default: all, in stored order).
+    mmap : bool, default True
+        If True, columns are read-only np.memmap views and nothing is
+        read until it is used; otherwise they are loaded into memory.
+
+    Returns
+    -------
+    arrays : dict
+        Mapping from column name to 1-D array.
+    """
+    metadata = read_npy_metadata(directory)
+    stored = {col["name"]: col for col in metadata["columns"]}
+    if columns is None:
+        columns = [col["name"] for col in metadata["columns"]]
+    missing = [name for name in columns if name not in stored]
+    if missing:
+        raise KeyError(f"The following columns are missing: {missing}")
+
+    return {
+        name: np.load(os.path.join(directory, stored[name]["file"]), mmap_mode="r" if mmap else None)
+        for name in columns
+    }
+
+
+def read_npy(
+    directory: str,
+    columns: Optional[List[str]] = None,
+    mmap: bool = True,
+) -> pd.DataFrame:
+    """
+    Open (some columns of) a dataset written by export_to_npy as a DataFrame.
+
+    With mmap=True the columns are backed by the read-only memory-mapped
+    files, so pages are only read from disk when a column is used (e.g.
+    when it is converted to a feature matrix or exported). Modifying the
+    frame in place needs pandas Copy-on-Write, or a copy first.
+    """
+    return pd.DataFrame(load_npy(directory, columns=columns, mmap=mmap), copy=False)
+
+
+def iter_npy_chunks(
+    directory: str,
+    chunksize: int,
+    columns: Optional[List[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield consecutive row blocks of a dataset written by export_to_npy.
+
+    Only chunksize rows of each column are read into memory at a time, so
+    this is the binary counterpart of pd.read_csv(..., chunksize=...).
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer.")
+    arrays = load_npy(directory, columns=columns)
+    n_rows = read_npy_metadata(directory)["n_rows"]
+    for start in range(0, n_rows, chunksize):
+        stop = min(start + chunksize, n_rows)
+        yield pd.DataFrame(
+            {name: np.array(arr[start:stop]) for name, arr in arrays.items()},
+            index=pd.RangeIndex(start, stop),
+        )
@@ -6,11 +6,15 @@
 
 from __future__ import annotations
 
-from typing import List, Dict, Any, Sequence
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from .parallel import effective_n_jobs
+
 
 def define_dataframe_structure(column_specs: List[Dict[str, Any]]) -> pd.DataFrame:
     """
@@ -60,11 +64,89 @@ def define_dataframe_structure(column_specs: List[Dict[str, Any]]) -> pd.DataFra
     return seed_df
 
 
+def _allocate_counts(n_points: int, weights: np.ndarray) -> np.ndarray:
+    """
+    Split n_points across clusters in proportion to weights, giving the
+    leftover points to the largest fractional shares (ties to the first
+    clusters), so equal weights reproduce an even split.
+    """
+    shares = weights / weights.sum() * n_points
+    counts = np.floor(shares).astype(int)
+    leftover = n_points - counts.sum()
+    order = np.argsort(-(shares - counts), kind="stable")
+    counts[order[:leftover]] += 1
+    return counts
+
+
+def _cluster_plan(
+    seed_df: pd.DataFrame,
+    n_points: int,
+    cluster_std: Union[float, Sequence[float]],
+    covariances: Optional[Sequence[Any]],
+    weights: Optional[Sequence[float]],
+    counts: Optional[Sequence[int]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[List[np.ndarray]]]:
+    """
+    Validate the simulate_data arguments.
+
+    Returns
+    -------
+    centres : ndarray of shape (n_clusters, n_features)
+    counts : ndarray of shape (n_clusters,)
+    stds : ndarray of shape (n_clusters,)
+    factors : list of (n_features, n_features) ndarray or None
+        Matrices L with L @ L.T equal to each covariance.
+    """
+    centres = seed_df.to_numpy(dtype=float)
+    n_clusters, n_features = centres.shape
+
+    if counts is not None:
+        if weights is not None:
+            raise ValueError("Give either weights or counts, not both.")
+        counts = np.asarray(counts, dtype=int)
+        if counts.shape != (n_clusters,) or np.any(counts < 0) or counts.sum() <= 0:
+            raise ValueError("counts must give a non-negative count for each cluster.")
+    else:
+        if n_points <= 0:
+            raise ValueError("n_points must be a positive integer.")
+        if weights is None:
+            weights_arr = np.ones(n_clusters)
+        else:
+            weights_arr = np.asarray(weights, dtype=float)
+            if weights_arr.shape != (n_clusters,) or np.any(weights_arr < 0) or weights_arr.sum() <= 0:
+                raise ValueError("weights must give a non-negative weight for each cluster.")
+        counts = _allocate_counts(n_points, weights_arr)
+
+    stds = np.broadcast_to(np.asarray(cluster_std, dtype=float), (n_clusters,)).copy()
+    if np.any(stds <= 0):
+        raise ValueError("cluster_std must be positive.")
+
+    factors = None
+    if covariances is not None:
+        if len(covariances) != n_clusters:
+            raise ValueError("Give one covariance matrix per cluster.")
+        factors = []
+        for cov in covariances:
+            cov = np.asarray(cov, dtype=float)
+            if cov.shape != (n_features, n_features) or not np.allclose(cov, cov.T):
+                raise ValueError("Each covariance must be a symmetric (n_features, n_features) matrix.")
+            # Eigen-decomposition also handles singular (PSD) covariances
+            eigvals, eigvecs = np.linalg.eigh(cov)
+            if np.any(eigvals < -1e-10 * max(1.0, eigvals.max())):
+                raise ValueError("Each covariance must be positive semi-definite.")
+            factors.append(eigvecs * np.sqrt(np.clip(eigvals, 0.0, None)))
+
+    return centres, counts, stds, factors
+
+
 def simulate_data(
     seed_df: pd.DataFrame,
     n_points: int = 100,
-    cluster_std: float = 1.0,
+    cluster_std: Union[float, Sequence[float]] = 1.0,
     random_state: int | None = None,
+    covariances: Optional[Sequence[Any]] = None,
+    weights: Optional[Sequence[float]] = None,
+    counts: Optional[Sequence[int]] = None,
 ) -> pd.DataFrame:
     """
     Simulate clustered data around the given cluster centres.
@@ -75,10 +157,19 @@ def simulate_data(
         Rows represent cluster centres, columns represent features.
     n_points : int, default 100
         Total number of data points to simulate.
-    cluster_std : float, default 1.0
-        Standard deviation of Gaussian noise added around centres.
+    cluster_std : float or sequence of float, default 1.0
+        Standard deviation of Gaussian noise added around centres, either
+        shared or one per cluster. Ignored when covariances are given.
     random_state : int or None, default None
         Random seed for reproducibility.
+    covariances : sequence of array-like or None, default None
+        One (n_features, n_features) covariance matrix per cluster, for
+        anisotropic (elongated, correlated) clusters.
+    weights : sequence of float or None, default None
+        Relative cluster sizes; n_points is split in proportion to them.
+        By default points are distributed as evenly as possible.
+    counts : sequence of int or None, default None
+        Exact number of points per cluster. Overrides n_points.
 
     Returns
     -------
@@ -86,29 +177,181 @@ def simulate_data(
         Simulated data with all original feature columns plus a 'true_cluster'
         column indicating the generating cluster.
     """
-    if n_points <= 0:
-        raise ValueError("n_points must be a positive integer.")
-    if cluster_std <= 0:
-        raise ValueError("cluster_std must be positive.")
-
     rng = np.random.RandomState(random_state)
-    centres = seed_df.to_numpy(dtype=float)
-    n_clusters, n_features = centres.shape
+    centres, counts, stds, factors = _cluster_plan(
+        seed_df, n_points, cluster_std, covariances, weights, counts
+    )
+    n_features = centres.shape[1]
 
-    # Distribute points as evenly as possible across clusters.
-    base = n_points // n_clusters
-    remainder = n_points % n_clusters
-    counts = np.full(n_clusters, base, dtype=int)
-    counts[:remainder] += 1
-
-    records = []
+    # Fill one preallocated array cluster by cluster
+    points = np.empty((int(counts.sum()), n_features))
+    offsets = np.concatenate([[0], np.cumsum(counts)])
     for cluster_id, (centre, count) in enumerate(zip(centres, counts)):
-        noise = rng.normal(loc=0.0, scale=cluster_std, size=(count, n_features))
-        points = centre + noise
-        for point in points:
-            record = {col: val for col, val in zip(seed_df.columns, point)}
-            record["true_cluster"] = cluster_id
-            records.append(record)
-
-    data = pd.DataFrame.from_records(records)
-    return data
\ No newline at end of file
+        block = points[offsets[cluster_id]:offsets[cluster_id + 1]]
+        if factors is None:
+            block[...] = rng.normal(loc=0.0, scale=stds[cluster_id], size=(count, n_features))
+        else:
+            block[...] = rng.standard_normal(size=(count, n_features)) @ factors[cluster_id].T
+        block += centre
+
+    columns = {col: points[:, j] for j, col in enumerate(seed_df.columns)}
+    columns["true_cluster"] = np.repeat(np.arange(len(counts)), counts)
+    return pd.DataFrame(columns)
+
+
+# Rows drawn from each independent random stream in iter_simulated_data.
+# Fixed so that the output does not depend on chunk_size or n_jobs.
+_STREAM_BLOCK_ROWS = 65_536
+
+
+def _simulate_block(
+    block: int,
+    entropy: int,
+    centres: np.ndarray,
+    offsets: np.ndarray,
+    stds: np.ndarray,
+    factors: Optional[List[np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate rows [block * B, (block + 1) * B) of a streamed dataset from
+    their own SeedSequence child stream. Returns points and labels.
+    """
+    n_total = int(offsets[-1])
+    start = block * _STREAM_BLOCK_ROWS
+    stop = min(start + _STREAM_BLOCK_ROWS, n_total)
+    rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(block,)))
+
+    rows = np.arange(start, stop)
+    labels = np.searchsorted(offsets, rows, side="right") - 1
+    points = rng.standard_normal(size=(stop - start, centres.shape[1]))
+    if factors is None:
+        points *= stds[labels, np.newaxis]
+    else:
+        # Rows are ordered by cluster, so each cluster is one contiguous run
+        for cluster_id in np.unique(labels):
+            run = labels == cluster_id
+            points[run] = points[run] @ factors[cluster_id].T
+    points += centres[labels]
+    return points, labels
+
+
+def iter_simulated_data(
+    seed_df: pd.DataFrame,
+    n_points: int = 100,
+    chunk_size: int = 100_000,
+    cluster_std: Union[float, Sequence[float]] = 1.0,
+    random_state: int | None = None,
+    covariances: Optional[Sequence[Any]] = None,
+    weights: Optional[Sequence[float]] = None,
+    counts: Optional[Sequence[int]] = None,
+    n_jobs: Optional[int] = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Simulate clustered data as a stream of DataFrame chunks.
+
+    Takes the same arguments as simulate_data, so datasets much larger
+    than memory can be generated. Rows are produced in fixed blocks, each
+    with its own random stream spawned from SeedSequence(random_state),
+    so the concatenated output is bit-for-bit identical for any
+    chunk_size and n_jobs. (The values differ from simulate_data, which
+    draws from a single legacy RandomState.)
+
+    Parameters
+    ----------
+    seed_df, n_points, cluster_std, covariances, weights, counts
+        As in simulate_data.
+    chunk_size : int, default 100_000
+        Rows per yielded DataFrame (the last chunk may be shorter).
+    random_state : int or None, default None
+        Seed of the root SeedSequence.
+    n_jobs : int or None, default None
+        Number of worker processes generating blocks (-1 for all CPUs).
+
+    Yields
+    ------
+    chunk : pandas.DataFrame
+        Feature columns plus 'true_cluster', in row order.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    centres, counts, stds, factors = _cluster_plan(
+        seed_df, n_points, cluster_std, covariances, weights, counts
+    )
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    n_total = int(offsets[-1])
+    n_blocks = -(-n_total // _STREAM_BLOCK_ROWS)
+    entropy = np.random.SeedSequence(random_state).entropy
+    args = (entropy, centres, offsets, stds, factors)
+
+    def blocks() -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        n_workers = min(effective_n_jobs(n_jobs), n_blocks)
+        if n_workers <= 1:
+            for block in range(n_blocks):
+                yield _simulate_block(block, *args)
+            return
+        # Keep a bounded window of blocks in flight, consumed in order
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            in_flight: Deque[Future] = deque()
+            next_block = 0
+            while in_flight or next_block < n_blocks:
+                while next_block < n_blocks and len(in_flight) < 2 * n_workers:
+                    in_flight.append(executor.submit(_simulate_block, next_block, *args))
+                    next_block += 1
+                yield in_flight.popleft().result()
+
+    def to_frame(points: np.ndarray, labels: np.ndarray) -> pd.DataFrame:
+        columns = {col: points[:, j] for j, col in enumerate(seed_df.columns)}
+        columns["true_cluster"] = labels
+        return pd.DataFrame(columns)
+
+    pending_points: List[np.ndarray] = []
+    pending_labels: List[np.ndarray] = []
+    n_pending = 0
+    for points, labels in blocks():
+        pending_points.append(points)
+        pending_labels.append(labels)
+        n_pending += points.shape[0]
+        if n_pending < chunk_size:
+            continue
+        points = np.concatenate(pending_points)
+        labels = np.concatenate(pending_labels)
+        n_full = (n_pending // chunk_size) * chunk_size
+        for start in range(0, n_full, chunk_size):
+            yield to_frame(points[start:start + chunk_size], labels[start:start + chunk_size])
+        pending_points, pending_labels = [points[n_full:]], [labels[n_full:]]
+        n_pending -= n_full
+    if n_pending:
+        yield to_frame(np.concatenate(pending_points), np.concatenate(pending_labels))
+
+
+def write_simulated_data(
+    path: str,
+    seed_df: pd.DataFrame,
+    n_points: int = 100,
+    chunk_size: int = 100_000,
+    **kwargs: Any,
+) -> int:
+    """
+    Stream simulated data straight to a CSV file.
+
+    Parameters
+    ----------
+    path : str
+        Output CSV filename.
+    seed_df, n_points, chunk_size
+        As in iter_simulated_data.
+    **kwargs
+        Other iter_simulated_data arguments (cluster_std, random_state,
+        covariances, weights, counts, n_jobs).
+
+    Returns
+    -------
+    n_rows : int
+        Number of data rows written.
+    """
+    n_rows = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        for chunk in iter_simulated_data(seed_df, n_points, chunk_size, **kwargs):
+            chunk.to_csv(f, header=(n_rows == 0), index=False)
+            n_rows += len(chunk)
+    return n_rows
@@ -0,0 +1,281 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.typing import DTypeLike
+
+from .data_exporter import NPY_METADATA_FILE, is_npy_dataset, read_npy, read_npy_metadata
+from .parallel import effective_n_jobs
+from .preprocessing import Standardiser, check_float_dtype, select_features
+
+
+# Rows parsed up front to validate feature columns before the full read.
+CSV_SAMPLE_ROWS = 1000
+
+
+class _ByteRange(io.RawIOBase):
+    """
+    Read-only file object exposing the bytes [start, stop) of a file.
+    """
+
+    def __init__(self, path: str, start: int, stop: int) -> None:
+        super().__init__()
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._remaining = stop - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        n = min(len(buffer), self._remaining)
+        if n <= 0:
+            return 0
+        n = self._file.readinto(memoryview(buffer)[:n])
+        self._remaining -= n
+        return n
+
+    def close(self) -> None:
+        self._file.close()
+        super().close()
+
+
+def _csv_byte_ranges(path: str, n_ranges: int) -> List[Tuple[int, int]]:
+    """
+    Split the data rows of a CSV (after the header line) into at most
+    n_ranges byte ranges that end on line breaks.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        data_start = f.tell()
+        bounds = [data_start]
+        for i in range(1, n_ranges):
+            target = data_start + (size - data_start) * i // n_ranges
+            if target <= bounds[-1]:
+                continue
+            f.seek(target - 1)
+            f.readline()
+            if f.tell() > bounds[-1]:
+                bounds.append(min(f.tell(), size))
+    bounds.append(size)
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+
+def read_csv_columns(
+    path: str,
+    feature_cols: List[str],
+    extra_cols: Optional[List[str]] = None,
+    dtype: DTypeLike = np.float64,
+    n_jobs: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Read only the needed columns of a CSV, parsing features straight to float.
+
+    The header and the first CSV_SAMPLE_ROWS rows are checked first, so a
+    missing or non-numeric feature column fails fast with the same errors
+    as select_features, before the full file is parsed.
+
+    Parameters
+    ----------
+    path : str
+    feature_cols : list of str
+        Numeric columns, parsed directly as dtype.
+    extra_cols : list of str or None
+        Further columns to keep with default parsing (e.g. identifiers
+        needed in the labelled output). None keeps every other column.
+    dtype : dtype, default float64
+        Feature dtype (float32 or float64).
+    n_jobs : int or None, default None
+        Number of threads reading disjoint byte ranges of the file. The
+        ranges are split on line breaks, so quoted fields must not contain
+        newlines when n_jobs > 1.
+
+    Returns
+    -------
+    data : pandas.DataFrame
+        The selected columns, in file order.
+    """
+    dtype = check_float_dtype(dtype)
+    sample = pd.read_csv(path, nrows=CSV_SAMPLE_ROWS)
+    if extra_cols is None:
+        extra_cols = list(sample.columns)
+    extra_cols = [col for col in extra_cols if col not in feature_cols]
+    # Same checks (and messages) as select_features, on the sample only
+    missing = [col for col in feature_cols if col not in sample.columns]
+    if missing:
+        raise KeyError(f"The following feature columns are missing: {missing}")
+    missing = [col for col in extra_cols if col not in sample.columns]
+    if missing:
+        raise KeyError(f"The following columns are missing: {missing}")
+    non_numeric = [
+        col for col in feature_cols
+        if not pd.api.types.is_numeric_dtype(sample[col])
+    ]
+    if non_numeric:
+        raise TypeError(f"The following feature columns are not numeric: {non_numeric}")
+
+    usecols = [col for col in sample.columns if col in feature_cols or col in extra_cols]
+    options = dict(usecols=usecols, dtype={col: dtype for col in feature_cols})
+    n_jobs = effective_n_jobs(n_jobs)
+    try:
+        if n_jobs == 1:
+            data = pd.read_csv(path, **options)
+        else:
+            ranges = _csv_byte_ranges(path, n_jobs)
+
+            def read_range(byte_range: Tuple[int, int]) -> pd.DataFrame:
+                with io.BufferedReader(_ByteRange(path, *byte_range)) as f:
+                    return pd.read_csv(f, header=None, names=list(sample.columns), **options)
+
+            with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+                parts = list(pool.map(read_range, ranges))
+            data = pd.concat(parts, ignore_index=True) if parts else sample.iloc[:0]
+    except pd.errors.ParserError:
+        # Malformed CSV (e.g. an unterminated quote): not a dtype problem
+        raise
+    except ValueError as exc:
+        # A non-numeric value after the sampled rows
+        raise TypeError(f"Feature columns could not be parsed as numbers: {exc}") from exc
+    if list(data.columns) != usecols:
+        # read_csv already keeps file order; only reorder (and copy) if not
+        data = data[usecols]
+    return data
+
+
+class Dataset:
+    """
+    In-process cache of a dataset for repeated clustering runs.
+
+    The parsed DataFrame, the feature matrix for each feature list and the
+    fitted standardisation are computed once and reused. All cached values
+    are dropped when the file's modification time or size changes.
+
+    Cached arrays are read-only, since they are shared between runs, and
+    are kept separately for each feature list and dtype.
+
+    Parameters
+    ----------
+    path : str
+        Path to a CSV file, or to a directory written by export_to_npy.
+        For the latter, features() reads only the requested columns, and
+        the modification time of its metadata file is tracked.
+
+    Examples
+    --------
+    >>> data = Dataset("data/simulated_data.csv")
+    >>> for k in range(2, 9):
+    ...     result = run_clustering(data, ["feature_1", "feature_2"], k=k)
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._signature: Optional[Tuple[int, int]] = None
+        self._frame: Optional[pd.DataFrame] = None
+        self._features: Dict[Tuple[str, ...], np.ndarray] = {}
+        self._scalers: Dict[Tuple[str, ...], Standardiser] = {}
+        self._standardised: Dict[Tuple[str, ...], np.ndarray] = {}
+
+    def __repr__(self) -> str:
+        return f"Dataset({self.path!r})"
+
+    def _refresh(self) -> None:
+        """
+        Drop all cached values if the file changed since they were built.
+        """
+        watched = os.path.join(self.path, NPY_METADATA_FILE) if self.is_binary else self.path
+        stat = os.stat(watched)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if signature != self._signature:
+            self.invalidate()
+            self._signature = signature
+
+    def invalidate(self) -> None:
+        """
+        Forget every cached value; the next access re-reads the file.
+        """
+        self._signature = None
+        self._frame = None
+        self._features.clear()
+        self._scalers.clear()
+        self._standardised.clear()
+
+    @property
+    def is_binary(self) -> bool:
+        """
+        True if path is a column-oriented .npy dataset rather than a CSV.
+        """
+        return is_npy_dataset(self.path)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """
+        The whole dataset as a DataFrame (shared; do not modify in place).
+        For a binary dataset the columns are memory-mapped (see read_npy).
+        """
+        self._refresh()
+        if self._frame is None:
+            self._frame = read_npy(self.path) if self.is_binary else pd.read_csv(self.path)
+        return self._frame
+
+    def _feature_frame(self, feature_cols: List[str], dtype: np.dtype) -> pd.DataFrame:
+        """
+        A frame holding (at least) the feature columns, read on its own
+        unless the whole frame is already cached.
+        """
+        if self._frame is not None:
+            return self._frame
+        if self.is_binary:
+            stored = {col["name"] for col in read_npy_metadata(self.path)["columns"]}
+            return read_npy(self.path, columns=[col for col in feature_cols if col in stored])
+        return read_csv_columns(self.path, feature_cols, extra_cols=[], dtype=dtype)
+
+    def features(self, feature_cols: List[str], dtype: DTypeLike = np.float64) -> np.ndarray:
+        """
+        Feature matrix of the given dtype (float32 or float64) for the given
+        columns, validated by select_features.
+        """
+        self._refresh()
+        dtype = check_float_dtype(dtype)
+        key = (dtype.str, *feature_cols)
+        if key not in self._features:
+            frame = self._feature_frame(list(feature_cols), dtype)
+            # to_numpy makes the one copy (from the memory map for a
+            # binary dataset); select_features itself does not copy
+            X = select_features(frame, list(feature_cols), copy=False).to_numpy(dtype=dtype)
+            X.setflags(write=False)
+            self._features[key] = X
+        return self._features[key]
+
+    def scaler(self, feature_cols: List[str], dtype: DTypeLike = np.float64) -> Standardiser:
+        """
+        Standardiser fitted on the given feature columns.
+        """
+        self.standardised(feature_cols, dtype)
+        return self._scalers[(check_float_dtype(dtype).str, *feature_cols)]
+
+    def standardised(self, feature_cols: List[str], dtype: DTypeLike = np.float64) -> np.ndarray:
+        """
+        Standardised feature matrix for the given columns, as produced by
+        standardise_features.
+        """
+        X = self.features(feature_cols, dtype)
+        key = (X.dtype.str, *feature_cols)
+        if key not in self._standardised:
+            scaler = Standardiser().fit(X)
+            X_scaled = scaler.transform(X)
+            X_scaled.setflags(write=False)
+            self._scalers[key] = scaler
+            self._standardised[key] = X_scaled
+        return self._standardised[key]
@@ -6,27 +6,46 @@
 
 from __future__ import annotations
 
-from typing import List, Dict, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import List, Dict, Optional, Tuple, Union
 
 import numpy as np
-from sklearn.metrics import silhouette_score
+from scipy import sparse
 
-from .algorithms import kmeans, sklearn_kmeans
+from .algorithms import (
+    kmeans,
+    _float_dtype,
+    _row_block_size,
+    iter_sq_distances,
+    kmeans_elkan,
+    minibatch_kmeans,
+    nearest_centroid,
+    sklearn_kmeans,
+)
+from .parallel import effective_n_jobs, init_worker, share_array, worker_array
 
 
 def compute_inertia(
     X: np.ndarray,
     labels: np.ndarray,
     centroids: np.ndarray,
+    memory_budget: Optional[int] = None,
 ) -> float:
     """
     Compute the within-cluster sum of squared distances (inertia).
 
+    Rows are processed in blocks sized to memory_budget (bytes), so no
+    temporary as large as X is created.
+
     Parameters
     ----------
     X : ndarray of shape (n_samples, n_features)
     labels : ndarray of shape (n_samples,)
     centroids : ndarray of shape (k, n_features)
+    memory_budget : int or None
+        Defaults to DEFAULT_MEMORY_BUDGET.
 
     Returns
     -------
@@ -35,8 +54,13 @@ def compute_inertia(
     if X.shape[0] != labels.shape[0]:
         raise ValueError("X and labels must have the same number of samples.")
 
-    distances = X - centroids[labels]
-    sq_dist = np.sum(distances ** 2)
+    n_samples = X.shape[0]
+    block = _row_block_size(n_samples, X.shape[1], X.itemsize, memory_budget)
+    sq_dist = 0.0
+    for start in range(0, n_samples, block):
+        distances = X[start:start + block] - centroids[labels[start:start + block]]
+        # Accumulate in float64 even for float32 data
+        sq_dist += np.einsum("ij,ij->", distances, distances, dtype=np.float64)
     return float(sq_dist)
 
 
@@ -54,15 +78,283 @@ def silhouette_score_sklearn(
     # Silhouette is only defined when there are at least 2 clusters
     if len(np.unique(labels)) < 2:
         raise ValueError("Silhouette score requires at least 2 clusters.")
+    from sklearn.metrics import silhouette_score
     return float(silhouette_score(X, labels))
 
 
+def _silhouette_rows(
+    X: np.ndarray,
+    codes: np.ndarray,
+    n_clusters: int,
+    rows: np.ndarray,
+    memory_budget: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Exact silhouette values of X[rows] against the whole of X.
+
+    Distances are formed for blocks of rows at a time and reduced to
+    per-cluster sums with a sparse one-hot product, so memory is bounded
+    by memory_budget rather than N^2. codes are labels in 0..n_clusters-1.
+    """
+    n_samples = X.shape[0]
+    one_hot = sparse.csr_matrix(
+        (np.ones(n_samples), (codes, np.arange(n_samples))),
+        shape=(n_clusters, n_samples),
+    )
+    sizes = np.bincount(codes, minlength=n_clusters).astype(float)
+
+    values = np.empty(rows.shape[0])
+    for start, stop, sq in iter_sq_distances(X[rows], X, memory_budget=memory_budget):
+        block_rows = rows[start:stop]
+        dist = np.sqrt(sq)
+        dist[np.arange(stop - start), block_rows] = 0.0
+        sums = np.asarray(one_hot @ dist.T).T  # (block, n_clusters)
+
+        own = codes[block_rows]
+        own_size = sizes[own]
+        a = sums[np.arange(stop - start), own] / np.maximum(own_size - 1, 1)
+        mean_other = sums / sizes
+        mean_other[np.arange(stop - start), own] = np.inf
+        b = mean_other.min(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            sil = (b - a) / np.maximum(a, b)
+        # Singleton clusters score 0, as in scikit-learn
+        sil[(own_size <= 1) | ~np.isfinite(sil)] = 0.0
+        values[start:stop] = sil
+    return values
+
+
+def _check_silhouette_labels(X: np.ndarray, labels: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Validate labels for a silhouette and recode them to 0..n_clusters-1.
+    """
+    if X.shape[0] != labels.shape[0]:
+        raise ValueError("X and labels must have the same number of samples.")
+    uniques, codes = np.unique(labels, return_inverse=True)
+    if not 2 <= len(uniques) <= X.shape[0] - 1:
+        raise ValueError(
+            "Silhouette score requires between 2 and n_samples - 1 clusters."
+        )
+    return codes, len(uniques)
+
+
+def silhouette_score_chunked(
+    X: np.ndarray,
+    labels: np.ndarray,
+    memory_budget: Optional[int] = None,
+) -> float:
+    """
+    Exact silhouette score with a bounded memory footprint.
+
+    Gives the same value as silhouette_score_sklearn, but the N x N
+    distance matrix is never held in memory: rows are processed in
+    blocks sized to memory_budget (bytes).
+
+    Returns
+    -------
+    score : float
+    """
+    codes, n_clusters = _check_silhouette_labels(X, labels)
+    rows = np.arange(X.shape[0])
+    return float(np.mean(_silhouette_rows(X, codes, n_clusters, rows, memory_budget)))
+
+
+def silhouette_score_sampled(
+    X: np.ndarray,
+    labels: np.ndarray,
+    sample_size: int = 1000,
+    random_state: Optional[int] = None,
+    confidence: float = 0.95,
+) -> Tuple[float, Tuple[float, float]]:
+    """
+    Estimate the silhouette score from a stratified sample of points.
+
+    The sample is allocated to clusters in proportion to their size and
+    each sampled point's silhouette is computed exactly against all of X,
+    so the estimate is unbiased and costs O(sample_size * N).
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+    sample_size : int, default 1000
+        Approximate total number of sampled points.
+    random_state : int or None
+    confidence : float, default 0.95
+        Coverage of the returned normal-approximation interval.
+
+    Returns
+    -------
+    score : float
+        Stratified estimate of the silhouette score.
+    interval : tuple of float
+        (lower, upper) confidence interval for the score.
+    """
+    if sample_size <= 0:
+        raise ValueError("sample_size must be a positive integer.")
+    if not 0 < confidence < 1:
+        raise ValueError("confidence must be between 0 and 1.")
+    codes, n_clusters = _check_silhouette_labels(X, labels)
+    n_samples = X.shape[0]
+    sizes = np.bincount(codes, minlength=n_clusters)
+    rng = np.random.RandomState(random_state)
+
+    # Proportional allocation, at least one point per cluster
+    alloc = np.clip(np.round(sizes * sample_size / n_samples).astype(int), 1, sizes)
+    strata = [
+        rng.choice(np.flatnonzero(codes == c), size=alloc[c], replace=False)
+        for c in range(n_clusters)
+    ]
+    rows = np.concatenate(strata)
+    values = _silhouette_rows(X, codes, n_clusters, rows)
+
+    weights = sizes / n_samples
+    estimate = 0.0
+    variance = 0.0
+    offset = 0
+    for c in range(n_clusters):
+        v = values[offset:offset + alloc[c]]
+        offset += alloc[c]
+        estimate += weights[c] * v.mean()
+        if alloc[c] > 1:
+            # Finite population correction: a fully sampled cluster adds no error
+            fpc = 1.0 - alloc[c] / sizes[c]
+            variance += weights[c] ** 2 * v.var(ddof=1) / alloc[c] * fpc
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    half_width = z * np.sqrt(variance)
+    return float(estimate), (float(estimate - half_width), float(estimate + half_width))
+
+
+def simplified_silhouette_samples(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+) -> np.ndarray:
+    """
+    Per-point simplified silhouette values (see simplified_silhouette).
+    """
+    values = np.empty(X.shape[0])
+    for start, stop, sq in iter_sq_distances(X, centroids):
+        dist = np.sqrt(sq)
+        rows = np.arange(stop - start)
+        own = labels[start:stop]
+        a = dist[rows, own].copy()
+        dist[rows, own] = np.inf
+        b = dist.min(axis=1)
+        denom = np.maximum(a, b)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values[start:stop] = np.where(denom > 0, (b - a) / denom, 0.0)
+    return values
+
+
+def simplified_silhouette(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+) -> float:
+    """
+    Simplified (centroid-based) silhouette score in O(N * K).
+
+    Uses the distance to the own centroid for a and the distance to the
+    nearest other centroid for b, instead of mean pairwise distances.
+
+    Parameters
+    ----------
+    X : ndarray of shape (n_samples, n_features)
+    labels : ndarray of shape (n_samples,)
+        Labels indexing rows of centroids.
+    centroids : ndarray of shape (k, n_features)
+
+    Returns
+    -------
+    score : float
+    """
+    if X.shape[0] != labels.shape[0]:
+        raise ValueError("X and labels must have the same number of samples.")
+    if centroids.shape[0] < 2:
+        raise ValueError("Silhouette score requires at least 2 clusters.")
+    return float(np.mean(simplified_silhouette_samples(X, labels, centroids)))
+
+
+# Algorithms accepted by elbow_curve; all but "sklearn_kmeans" can be warm-started.
+_ELBOW_ALGORITHMS = ("kmeans", "kmeans_elkan", "minibatch_kmeans", "sklearn_kmeans")
+
+
+def _fit_for_elbow(
+    X: np.ndarray,
+    k: int,
+    algorithm: str,
+    random_state: Optional[int],
+    init: Union[str, np.ndarray],
+) -> Tuple[float, float, int, np.ndarray]:
+    """
+    Fit one k for elbow_curve.
+    Returns inertia, wall time, iterations and the fitted centroids.
+    """
+    start = time.perf_counter()
+    if algorithm == "sklearn_kmeans":
+        labels, centroids, n_iter = sklearn_kmeans(
+            X, k, random_state=random_state, return_n_iter=True
+        )
+    elif algorithm == "kmeans_elkan":
+        labels, centroids, stats = kmeans_elkan(
+            X, k, random_state=random_state, init=init, return_stats=True
+        )
+        n_iter = stats["n_iter"]
+    elif algorithm == "minibatch_kmeans":
+        labels, centroids, n_iter = minibatch_kmeans(
+            X, k, random_state=random_state, init=init, return_n_iter=True
+        )
+    else:
+        labels, centroids, n_iter = kmeans(
+            X, k, random_state=random_state, init=init, return_n_iter=True
+        )
+    elapsed = time.perf_counter() - start
+    return compute_inertia(X, labels, centroids), elapsed, int(n_iter), centroids
+
+
+def _elbow_task(
+    k: int,
+    algorithm: str,
+    random_state: Optional[int],
+    init: str,
+) -> Tuple[float, float, int]:
+    """
+    Worker-side elbow fit on the shared X (centroids are not sent back).
+    """
+    inertia, elapsed, n_iter, _ = _fit_for_elbow(worker_array(), k, algorithm, random_state, init)
+    return inertia, elapsed, n_iter
+
+
+def _split_centroids(X: np.ndarray, centroids: np.ndarray, k: int) -> np.ndarray:
+    """
+    Grow a centroid set to k centres for warm starts. Each new centre is
+    the point farthest from its centroid within the cluster that has the
+    largest within-cluster sum of squares, which splits that cluster.
+    """
+    # Keep X's float dtype so float32 warm starts stay float32
+    centroids = np.array(centroids, dtype=_float_dtype(X))
+    while centroids.shape[0] < k:
+        labels, min_sq_dist = nearest_centroid(X, centroids)
+        sse = np.bincount(labels, weights=min_sq_dist, minlength=centroids.shape[0])
+        in_worst = np.flatnonzero(labels == np.argmax(sse))
+        far = in_worst[np.argmax(min_sq_dist[in_worst])]
+        centroids = np.vstack([centroids, X[far]])
+    return centroids
+
+
 def elbow_curve(
     X: np.ndarray,
     k_values: List[int],
     random_state: Optional[int] = None,
     use_sklearn: bool = True,
-) -> Dict[int, float]:
+    algorithm: Optional[str] = None,
+    init: str = "random",
+    n_jobs: Optional[int] = None,
+    warm_start: bool = False,
+    return_details: bool = False,
+) -> Union[Dict[int, float], Dict[int, Dict[str, float]]]:
     """
     Compute inertia values for multiple K values (elbow method).
 
@@ -73,22 +365,68 @@ def elbow_curve(
     random_state : int or None
     use_sklearn : bool, default True
         If True, use scikit-learn KMeans; otherwise use manual kmeans.
+    algorithm : {"kmeans", "kmeans_elkan", "minibatch_kmeans", "sklearn_kmeans"} or None
+        Algorithm to fit for each k. Overrides use_sklearn when given.
+    init : {"random", "k-means++", "k-means||"}, default "random"
+        Centroid initialisation for the manual algorithms (scikit-learn
+        always uses its own k-means++).
+    n_jobs : int or None, default None
+        Number of worker processes fitting different k in parallel
+        (-1 for all CPUs). X is shared with the workers, not copied.
+    warm_start : bool, default False
+        Fit k values in increasing order, seeding each from the previous
+        solution plus one new centre per extra cluster that splits the
+        worst-fitting cluster. Only for the manual algorithms; runs
+        sequentially.
+    return_details : bool, default False
+        If True, map each k to a dict with "inertia", "time" (seconds)
+        and "n_iter" instead of the bare inertia.
 
     Returns
     -------
     inertia_dict : dict
-        Mapping from k to inertia.
+        Mapping from k to inertia (or to the details dict).
     """
-    inertia_dict: Dict[int, float] = {}
+    if algorithm is None:
+        algorithm = "sklearn_kmeans" if use_sklearn else "kmeans"
+    if algorithm not in _ELBOW_ALGORITHMS:
+        raise ValueError(f"Unknown algorithm '{algorithm}'.")
+    if any(k <= 0 for k in k_values):
+        raise ValueError("All k values must be positive integers.")
+
+    n_workers = min(effective_n_jobs(n_jobs), len(k_values))
+    if warm_start:
+        if algorithm == "sklearn_kmeans":
+            raise ValueError("warm_start is only available for the manual algorithms.")
+        if n_workers > 1:
+            raise ValueError("warm_start runs sequentially and cannot use n_jobs > 1.")
 
-    for k in k_values:
-        if k <= 0:
-            raise ValueError("All k values must be positive integers.")
-        if use_sklearn:
-            labels, centroids = sklearn_kmeans(X, k, random_state=random_state)
-        else:
-            labels, centroids = kmeans(X, k, random_state=random_state)
-        inertia = compute_inertia(X, labels, centroids)
-        inertia_dict[k] = inertia
+    details: Dict[int, Dict[str, float]] = {}
+    if n_workers > 1:
+        with share_array(X) as handle:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=init_worker,
+                initargs=(handle,),
+            ) as executor:
+                futures = {
+                    k: executor.submit(_elbow_task, k, algorithm, random_state, init)
+                    for k in k_values
+                }
+                for k, future in futures.items():
+                    inertia, elapsed, n_iter = future.result()
+                    details[k] = {"inertia": inertia, "time": elapsed, "n_iter": n_iter}
+    else:
+        previous: Optional[np.ndarray] = None
+        for k in (sorted(k_values) if warm_start else k_values):
+            k_init: Union[str, np.ndarray] = init
+            if warm_start and previous is not None and previous.shape[0] < k:
+                k_init = _split_centroids(X, previous, k)
+            inertia, elapsed, n_iter, previous = _fit_for_elbow(
+                X, k, algorithm, random_state, k_init
+            )
+            details[k] = {"inertia": inertia, "time": elapsed, "n_iter": n_iter}
 
-    return inertia_dict
\ No newline at end of file
+    if return_details:
+        return {k: details[k] for k in k_values}
+    return {k: details[k]["inertia"] for k in k_values}
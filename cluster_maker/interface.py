@@ -6,20 +6,120 @@
 
 from __future__ import annotations
 
-from typing import Dict, Any, List, Optional
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
+from numpy.typing import DTypeLike
 
-from .preprocessing import select_features, standardise_features
-from .algorithms import kmeans, sklearn_kmeans
-from .evaluation import compute_inertia, elbow_curve, silhouette_score_sklearn
-from .plotting_clustered import plot_clusters_2d, plot_elbow
-from .data_exporter import export_to_csv
+from .preprocessing import Standardiser, check_float_dtype, select_features
+from .algorithms import (
+    kmeans,
+    kmeans_elkan,
+    sklearn_kmeans,
+    init_centroids,
+    nearest_centroid,
+    minibatch_kmeans,
+    minibatch_update,
+)
+from .evaluation import (
+    compute_inertia,
+    elbow_curve,
+    silhouette_score_chunked,
+    silhouette_score_sampled,
+    simplified_silhouette,
+    simplified_silhouette_samples,
+)
+from .data_exporter import export_to_csv, is_npy_dataset, iter_npy_chunks, read_npy
+from .dataset import Dataset, read_csv_columns
+from .model import KMeansModel
+from .parallel import effective_n_jobs, init_worker, share_array, worker_array
+from .profiling import Profiler, append_profile_log
+
+
+class LazyFigure:
+    """
+    Cheap handle to a matplotlib figure that is only drawn when needed.
+
+    The figure is rendered on the first call to render() or save(), or on
+    first access to any Figure attribute (e.g. handle.axes,
+    handle.savefig), which are forwarded to the rendered Figure.
+    matplotlib is not imported until then.
+
+    Parameters
+    ----------
+    draw : callable
+        Function returning (fig, ax), e.g. a partial of plot_clusters_2d.
+    """
+
+    def __init__(self, draw: Callable[[], Tuple[Any, Any]]) -> None:
+        self._draw = draw
+        self._figure = None
+
+    def __repr__(self) -> str:
+        state = "rendered" if self.rendered else "not rendered"
+        return f"<LazyFigure ({state})>"
+
+    @property
+    def rendered(self) -> bool:
+        """
+        Whether the figure has been drawn yet.
+        """
+        return self._figure is not None
+
+    def render(self):
+        """
+        Draw the figure if needed and return the matplotlib Figure.
+        """
+        if self._figure is None:
+            self._figure, _ = self._draw()
+        return self._figure
+
+    def save(self, path: str, **kwargs: Any) -> None:
+        """
+        Render the figure and save it with Figure.savefig.
+        """
+        self.render().savefig(path, **kwargs)
+
+    def close(self) -> None:
+        """
+        Close the figure if it was rendered, releasing its memory.
+        """
+        if self._figure is not None:
+            import matplotlib.pyplot as plt
+            plt.close(self._figure)
+            self._figure = None
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.render(), name)
+
+
+def _cluster_figure(X: np.ndarray, labels: np.ndarray, centroids: np.ndarray) -> LazyFigure:
+    """
+    Deferred cluster plot of the first two features.
+    """
+    def draw():
+        from .plotting_clustered import plot_clusters_2d
+        return plot_clusters_2d(X, labels, centroids=centroids, title="Cluster plot")
+    return LazyFigure(draw)
+
+
+def _elbow_figure(k_values: List[int], inertias: List[float]) -> LazyFigure:
+    """
+    Deferred elbow plot.
+    """
+    def draw():
+        from .plotting_clustered import plot_elbow
+        return plot_elbow(k_values, inertias)
+    return LazyFigure(draw)
 
 
 def run_clustering(
-    input_path: str,
+    input_path: Union[str, Dataset],
     feature_cols: List[str],
     algorithm: str = "kmeans",
     k: int = 3,
@@ -28,26 +128,42 @@ def run_clustering(
     random_state: Optional[int] = None,
     compute_elbow: bool = False,
     elbow_k_values: Optional[List[int]] = None,
+    chunksize: int = 100_000,
+    init: str = "random",
+    silhouette: Optional[str] = "exact",
+    plots: bool = True,
+    output_cols: Optional[List[str]] = None,
+    n_jobs: Optional[int] = None,
+    dtype: DTypeLike = np.float64,
+    copy: bool = True,
+    profile_memory: bool = False,
+    profile_log: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     High-level function to run the full clustering workflow.
 
     Steps:
-    1. Load data from CSV
+    1. Load data from CSV (or reuse a cached Dataset)
     2. Select feature columns
     3. Optionally standardise features
     4. Run the chosen clustering algorithm
     5. Compute evaluation metrics
-    6. Generate plots
+    6. Prepare (lazy) plots
     7. Optionally write labelled data to CSV
 
     Parameters
     ----------
-    input_path : str
-        Path to the input CSV file.
+    input_path : str or Dataset
+        Path to the input CSV file or to a binary dataset directory written
+        by export_to_npy, or a Dataset whose parsed frame, feature matrix
+        and standardisation are reused across calls.
     feature_cols : list of str
         Names of feature columns to use.
-    algorithm : {"kmeans", "sklearn_kmeans"}, default "kmeans"
+    algorithm : {"kmeans", "kmeans_elkan", "minibatch_kmeans", "sklearn_kmeans"}, default "kmeans"
+        "kmeans_elkan" gives the same labels as "kmeans" but skips most
+        distance evaluations using triangle-inequality bounds.
+        "minibatch_kmeans" streams the input in chunks and never holds the
+        whole file in memory (see Notes).
     k : int, default 3
         Number of clusters.
     standardise : bool, default True
@@ -59,6 +175,47 @@ def run_clustering(
     elbow_k_values : list of int or None, default None
         k-values for elbow curve. If None and compute_elbow is True, defaults
         to range 1..(k+5).
+    chunksize : int, default 100_000
+        Rows per input chunk (and per mini-batch) for "minibatch_kmeans".
+    init : {"random", "k-means++", "k-means||"}, default "random"
+        Centroid initialisation for the manual algorithms (also used by
+        the elbow curve). "sklearn_kmeans" always uses k-means++.
+    silhouette : {"exact", "sampled", "simplified"} or None, default "exact"
+        How to compute the silhouette score. "exact" is O(N^2) time but
+        runs in bounded memory; "sampled" estimates it from a stratified
+        sample and also reports a 95% interval as "silhouette_ci";
+        "simplified" is the O(N * K) centroid-based variant; None skips it.
+    plots : bool, default True
+        If True, the result holds LazyFigure handles that draw the plots
+        on first use. If False, no figures are made and matplotlib is
+        never imported.
+    output_cols : list of str or None, default None
+        Non-feature columns to keep in "data" and output_path. None keeps
+        every column; a list means the other columns of a CSV or binary
+        input are never read.
+    n_jobs : int or None, default None
+        Threads reading a CSV input in parallel byte ranges (see
+        read_csv_columns).
+    dtype : {float64, float32}, default float64
+        Precision of the feature matrix, centroids and distance
+        computations. float32 halves the memory of the stored data and
+        centroids; distance expansions, sums, inertia and standardisation
+        statistics are still computed in float64. For CSV input the feature columns of
+        "data" are parsed directly in this dtype. "sklearn_kmeans" also
+        runs in float32.
+    copy : bool, default True
+        If False, avoid full copies of the data: features are selected
+        without copying, standardised in place in the one feature array
+        extracted from the frame, and "data" shares its column data with
+        the loaded frame (for a Dataset, with Dataset.frame). Do not modify
+        "data" in place in that case. Ignored by "minibatch_kmeans".
+    profile_memory : bool, default False
+        Also record the peak tracemalloc allocation of each stage in
+        "profile". Tracing slows allocation-heavy stages down.
+    profile_log : str or None, default None
+        If given, append the profile of this run, with the algorithm, k,
+        data shape and dtype, as one JSON line to this file (see
+        append_profile_log and read_profile_log).
 
     Returns
     -------
@@ -68,66 +225,171 @@ def run_clustering(
         - "labels": ndarray of cluster labels
         - "centroids": ndarray of cluster centroids
         - "metrics": dict with "inertia" and optional "silhouette"
-        - "fig_cluster": Figure for the cluster plot
-        - "fig_elbow": Figure for the elbow plot or None
+          (plus "silhouette_ci" for silhouette="sampled")
+          (plus "distance_evals_pruned" for "kmeans_elkan")
+        - "fig_cluster": LazyFigure for the cluster plot (None if plots=False)
+        - "fig_elbow": LazyFigure for the elbow plot or None
         - "elbow_inertias": dict mapping k -> inertia (if computed)
+        - "model": KMeansModel with the centroids, the fitted Standardiser
+          (if standardise) and fit metadata, for scoring new data
+        - "profile": dict mapping each stage ("load", "select",
+          "standardise", "cluster", "metrics", "export", "elbow", "plot";
+          "standardise", "cluster" and "assign" for "minibatch_kmeans")
+          that ran to its "wall_time" and "cpu_time" in seconds (plus
+          "peak_memory" in bytes if profile_memory), and a "total" entry.
+          Lazy figures are drawn later, outside the "plot" stage.
+
+    Notes
+    -----
+    With algorithm="minibatch_kmeans" the input is read in chunks: one pass
+    for the standardisation statistics (if requested), one pass of
+    mini-batch centroid updates and a final pass that assigns labels and
+    appends them to output_path. In this mode "data" is None, only the
+    "simplified" silhouette is available (computed during the label
+    pass), no plots are made and compute_elbow is not supported.
     """
-    # Load data
-    df = pd.read_csv(input_path)
+    dtype = check_float_dtype(dtype)
+    if silhouette not in (None, "exact", "sampled", "simplified"):
+        raise ValueError(
+            f"Unknown silhouette '{silhouette}'. "
+            "Use 'exact', 'sampled', 'simplified' or None."
+        )
+    if algorithm == "minibatch_kmeans" and compute_elbow:
+        raise ValueError("compute_elbow is not supported for 'minibatch_kmeans'.")
 
-    # Select and optionally standardise features
-    X_df = select_features(df, feature_cols)
-    X = X_df.to_numpy(dtype=float)
+    profiler = Profiler(trace_memory=profile_memory)
+    try:
+        if algorithm == "minibatch_kmeans":
+            if isinstance(input_path, Dataset):
+                input_path = input_path.path
+            result = _run_minibatch_streaming(
+                input_path,
+                feature_cols,
+                k=k,
+                standardise=standardise,
+                output_path=output_path,
+                random_state=random_state,
+                chunksize=chunksize,
+                init=init,
+                silhouette=silhouette,
+                output_cols=output_cols,
+                dtype=dtype,
+                profiler=profiler,
+            )
+        else:
+            result = _run_in_memory(
+                input_path,
+                feature_cols,
+                algorithm=algorithm,
+                k=k,
+                standardise=standardise,
+                output_path=output_path,
+                random_state=random_state,
+                compute_elbow=compute_elbow,
+                elbow_k_values=elbow_k_values,
+                init=init,
+                silhouette=silhouette,
+                plots=plots,
+                output_cols=output_cols,
+                n_jobs=n_jobs,
+                dtype=dtype,
+                copy=copy,
+                profiler=profiler,
+            )
+    finally:
+        profiler.close()
 
-    if standardise:
-        X = standardise_features(X)
+    result["profile"] = profiler.as_dict()
+    if profile_log is not None:
+        model = result["model"]
+        append_profile_log(
+            profile_log,
+            result["profile"],
+            input=str(getattr(input_path, "path", input_path)),
+            algorithm=algorithm,
+            k=k,
+            n_samples=model.metadata["n_samples"],
+            n_features=len(feature_cols),
+            dtype=dtype.name,
+        )
+    return result
 
-    # Run clustering
-    if algorithm == "kmeans":
-        labels, centroids = kmeans(X, k=k, random_state=random_state)
-    elif algorithm == "sklearn_kmeans":
-        labels, centroids = sklearn_kmeans(X, k=k, random_state=random_state)
-    else:
-        raise ValueError(f"Unknown algorithm '{algorithm}'. Use 'kmeans' or 'sklearn_kmeans'.")
 
-    # Compute metrics
-    inertia = compute_inertia(X, labels, centroids)
-    metrics: Dict[str, Any] = {"inertia": inertia}
+def _run_in_memory(
+    input_path: Union[str, Dataset],
+    feature_cols: List[str],
+    algorithm: str,
+    k: int,
+    standardise: bool,
+    output_path: Optional[str],
+    random_state: Optional[int],
+    compute_elbow: bool,
+    elbow_k_values: Optional[List[int]],
+    init: str,
+    silhouette: Optional[str],
+    plots: bool,
+    output_cols: Optional[List[str]],
+    n_jobs: Optional[int],
+    dtype: np.dtype,
+    copy: bool,
+    profiler: Profiler,
+) -> Dict[str, Any]:
+    """
+    The in-memory clustering workflow of run_clustering, timed stage by
+    stage with profiler.
+    """
+    df, X, scaler = _load_features(
+        input_path, feature_cols, standardise, output_cols, n_jobs, dtype, copy, profiler
+    )
 
-    try:
-        sil = silhouette_score_sklearn(X, labels)
-    except ValueError:
-        sil = None
-    metrics["silhouette"] = sil
+    # Run clustering
+    with profiler.stage("cluster"):
+        labels, centroids, fit_stats = _fit(X, algorithm, k, random_state, init)
 
-    # Add labels to DataFrame
-    df = df.copy()
-    df["cluster"] = labels
+    # Compute metrics
+    with profiler.stage("metrics"):
+        metrics = _compute_metrics(X, labels, centroids, silhouette, random_state)
+    if "distance_evals_pruned" in fit_stats:
+        metrics["distance_evals_pruned"] = fit_stats["distance_evals_pruned"]
 
-    # Export if requested
-    if output_path is not None:
-        export_to_csv(df, output_path, delimiter=",", include_index=False)
+    # Add labels to DataFrame. A shallow copy is enough to leave the
+    # loaded (or Dataset-cached) frame without the new column; the
+    # memory-mapped columns of a binary dataset are read-only anyway.
+    binary = is_npy_dataset(getattr(input_path, "path", input_path))
+    with profiler.stage("export"):
+        df = _output_frame(input_path, df, feature_cols, output_cols)
+        df = df.copy(deep=copy and not binary)
+        df["cluster"] = labels
 
-    # Plot clusters (2D)
-    fig_cluster, _ = plot_clusters_2d(X, labels, centroids=centroids, title="Cluster plot")
+        # Export if requested
+        if output_path is not None:
+            export_to_csv(df, output_path, delimiter=",", include_index=False)
 
     # Optional elbow curve
-    fig_elbow = None
     elbow_inertias: Optional[Dict[int, float]] = None
     if compute_elbow:
         if elbow_k_values is None:
             max_k = max(2, k + 5)
             elbow_k_values = list(range(1, max_k + 1))
-        elbow_inertias = elbow_curve(
-            X,
-            k_values=elbow_k_values,
-            random_state=random_state,
-            use_sklearn=(algorithm == "sklearn_kmeans"),
-        )
-        fig_elbow, _ = plot_elbow(
-            elbow_k_values,
-            [elbow_inertias[val] for val in elbow_k_values],
-        )
+        with profiler.stage("elbow"):
+            elbow_inertias = elbow_curve(
+                X,
+                k_values=elbow_k_values,
+                random_state=random_state,
+                algorithm=algorithm,
+                init=init,
+            )
+
+    # Plot clusters (2D) and the elbow curve, drawn on first use
+    fig_cluster = fig_elbow = None
+    if plots:
+        with profiler.stage("plot"):
+            fig_cluster = _cluster_figure(X, labels, centroids)
+            if elbow_inertias is not None:
+                fig_elbow = _elbow_figure(
+                    elbow_k_values,
+                    [elbow_inertias[val] for val in elbow_k_values],
+                )
 
     result: Dict[str, Any] = {
         "data": df,
@@ -137,5 +399,521 @@ def run_clustering(
         "fig_cluster": fig_cluster,
         "fig_elbow": fig_elbow,
         "elbow_inertias": elbow_inertias,
+        "model": _fitted_model(centroids, feature_cols, scaler, algorithm, metrics, X.shape[0],
+                               init=init, random_state=random_state),
+    }
+    return result
+
+
+def _load_features(
+    input_path: Union[str, Dataset],
+    feature_cols: List[str],
+    standardise: bool,
+    output_cols: Optional[List[str]],
+    n_jobs: Optional[int],
+    dtype: np.dtype,
+    copy: bool,
+    profiler: Profiler,
+) -> Tuple[pd.DataFrame, np.ndarray, Optional[Standardiser]]:
+    """
+    Load the data, then select and optionally standardise the features.
+    Returns the frame, the feature matrix and the fitted Standardiser
+    (None if not standardised).
+    """
+    scaler = None
+    if isinstance(input_path, Dataset):
+        with profiler.stage("load"):
+            df = input_path.frame
+            if output_cols is not None:
+                df = df[[col for col in df.columns if col in feature_cols or col in output_cols]]
+        with profiler.stage("select"):
+            X = input_path.features(feature_cols, dtype)
+        if standardise:
+            with profiler.stage("standardise"):
+                scaler = input_path.scaler(feature_cols, dtype)
+                X = input_path.standardised(feature_cols, dtype)
+    else:
+        with profiler.stage("load"):
+            if is_npy_dataset(input_path):
+                # Memory-mapped feature columns only; the other columns
+                # are opened by _output_frame when labels are added
+                df = read_npy(input_path, columns=feature_cols)
+            else:
+                # Only the needed columns are parsed, features straight to float
+                df = read_csv_columns(
+                    input_path, feature_cols, extra_cols=output_cols, dtype=dtype, n_jobs=n_jobs
+                )
+
+        with profiler.stage("select"):
+            # For a binary dataset this is the only read of the feature
+            # pages into memory; other columns stay memory-mapped
+            X_df = select_features(df, feature_cols, copy=False)
+            # In-place standardisation needs an X that does not alias df
+            X = X_df.to_numpy(dtype=dtype, copy=standardise and not copy)
+
+        if standardise:
+            with profiler.stage("standardise"):
+                scaler = Standardiser().fit(X)
+                X = scaler.transform(X, copy=copy)
+    return df, X, scaler
+
+
+def _output_frame(
+    input_path: Union[str, Dataset],
+    df: pd.DataFrame,
+    feature_cols: List[str],
+    output_cols: Optional[List[str]],
+) -> pd.DataFrame:
+    """
+    The frame that receives the labels. For a binary dataset path only the
+    feature columns were loaded, so the passthrough columns are opened
+    (memory-mapped) now, after clustering; text columns become Python
+    strings at this point.
+    """
+    if isinstance(input_path, Dataset) or not is_npy_dataset(input_path):
+        return df
+    columns = None if output_cols is None else feature_cols + [
+        col for col in output_cols if col not in feature_cols
+    ]
+    return read_npy(input_path, columns=columns)
+
+
+def _fit(
+    X: np.ndarray,
+    algorithm: str,
+    k: int,
+    random_state: Optional[int],
+    init: str,
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Fit one in-memory algorithm. Returns labels, centroids and fit
+    statistics ("n_iter", plus "distance_evals_pruned" for Elkan).
+    """
+    if algorithm == "kmeans":
+        labels, centroids, n_iter = kmeans(
+            X, k=k, random_state=random_state, init=init, return_n_iter=True
+        )
+        fit_stats: Dict[str, Any] = {"n_iter": n_iter}
+    elif algorithm == "kmeans_elkan":
+        labels, centroids, fit_stats = kmeans_elkan(
+            X, k=k, random_state=random_state, init=init, return_stats=True
+        )
+    elif algorithm == "minibatch_kmeans":
+        labels, centroids, n_iter = minibatch_kmeans(
+            X, k=k, random_state=random_state, init=init, return_n_iter=True
+        )
+        fit_stats = {"n_iter": n_iter}
+    elif algorithm == "sklearn_kmeans":
+        labels, centroids, n_iter = sklearn_kmeans(
+            X, k=k, random_state=random_state, return_n_iter=True
+        )
+        fit_stats = {"n_iter": n_iter}
+    else:
+        raise ValueError(
+            f"Unknown algorithm '{algorithm}'. "
+            "Use 'kmeans', 'kmeans_elkan', 'minibatch_kmeans' or 'sklearn_kmeans'."
+        )
+    return labels, centroids, fit_stats
+
+
+def _compute_metrics(
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    silhouette: Optional[str],
+    random_state: Optional[int],
+) -> Dict[str, Any]:
+    """
+    Inertia and the requested silhouette score (None if undefined).
+    """
+    metrics: Dict[str, Any] = {"inertia": compute_inertia(X, labels, centroids)}
+    sil = sil_ci = None
+    try:
+        if silhouette == "exact":
+            sil = silhouette_score_chunked(X, labels)
+        elif silhouette == "sampled":
+            sil, sil_ci = silhouette_score_sampled(X, labels, random_state=random_state)
+        elif silhouette == "simplified":
+            sil = simplified_silhouette(X, labels, centroids)
+    except ValueError:
+        sil = None
+    metrics["silhouette"] = sil
+    if silhouette == "sampled":
+        metrics["silhouette_ci"] = sil_ci
+    return metrics
+
+
+def _fitted_model(
+    centroids: np.ndarray,
+    feature_cols: List[str],
+    scaler: Optional[Standardiser],
+    algorithm: str,
+    metrics: Dict[str, Any],
+    n_samples: int,
+    **params: Any,
+) -> KMeansModel:
+    """
+    KMeansModel for a run_clustering result, with JSON-friendly metadata.
+    """
+    metadata = {
+        "algorithm": algorithm,
+        "k": int(centroids.shape[0]),
+        "n_samples": int(n_samples),
+        "dtype": centroids.dtype.name,
+        "inertia": metrics["inertia"],
+        **params,
+    }
+    return KMeansModel(centroids, feature_cols, standardiser=scaler, metadata=metadata)
+
+
+def _iter_feature_chunks(
+    input_path: str,
+    feature_cols: List[str],
+    chunksize: int,
+    scaler: Optional[Standardiser] = None,
+    output_cols: Optional[List[str]] = None,
+    dtype: np.dtype = np.dtype(np.float64),
+) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Yield (chunk, X_chunk) pairs from a CSV or .npy dataset, with X_chunk
+    of the given dtype and optionally standardised by a fitted scaler.
+
+    Chunks hold the feature columns plus output_cols (all columns if None).
+    """
+    usecols = None if output_cols is None else feature_cols + [
+        col for col in output_cols if col not in feature_cols
+    ]
+    if is_npy_dataset(input_path):
+        chunks = iter_npy_chunks(input_path, chunksize, columns=usecols)
+    else:
+        header = pd.read_csv(input_path, nrows=0).columns
+        chunks = pd.read_csv(
+            input_path,
+            chunksize=chunksize,
+            usecols=None if usecols is None else [col for col in header if col in usecols],
+        )
+    for chunk in chunks:
+        X = select_features(chunk, feature_cols, copy=False).to_numpy(dtype=dtype)
+        if scaler is not None:
+            X = scaler.transform(X)
+        yield chunk, X
+
+
+def _run_minibatch_streaming(
+    input_path: str,
+    feature_cols: List[str],
+    k: int,
+    standardise: bool,
+    output_path: Optional[str],
+    random_state: Optional[int],
+    chunksize: int,
+    init: str,
+    silhouette: Optional[str],
+    output_cols: Optional[List[str]] = None,
+    dtype: np.dtype = np.dtype(np.float64),
+    profiler: Optional[Profiler] = None,
+) -> Dict[str, Any]:
+    """
+    Out-of-core mini-batch K-means over a CSV file or .npy dataset
+    (see run_clustering).
+
+    Each pass is one profiler stage: "standardise", "cluster", and
+    "assign" (labels, metrics and labelled output, which share the
+    final pass).
+    """
+    if chunksize <= 0:
+        raise ValueError("chunksize must be a positive integer.")
+    if profiler is None:
+        profiler = Profiler()
+
+    # Pass 1: standardisation statistics
+    scaler = None
+    if standardise:
+        with profiler.stage("standardise"):
+            scaler = Standardiser()
+            for _, X in _iter_feature_chunks(
+                input_path, feature_cols, chunksize, output_cols=[], dtype=dtype
+            ):
+                scaler.partial_fit(X)
+
+    # Pass 2: mini-batch centroid updates
+    rng = np.random.RandomState(random_state)
+    centroids: Optional[np.ndarray] = None
+    counts = np.zeros(k, dtype=np.int64)
+    # Chunks are buffered until at least k rows are available for seeding,
+    # so chunksize may be smaller than k
+    seed_rows: List[np.ndarray] = []
+    with profiler.stage("cluster"):
+        for _, X in _iter_feature_chunks(input_path, feature_cols, chunksize, scaler, [], dtype):
+            if centroids is None:
+                seed_rows.append(X)
+                if sum(rows.shape[0] for rows in seed_rows) < k:
+                    continue
+                X = np.concatenate(seed_rows)
+                seed_rows = []
+                centroids = init_centroids(X, k, random_state=rng, init=init).astype(dtype)
+            minibatch_update(centroids, counts, X)
+    if centroids is None:
+        if not seed_rows:
+            raise ValueError("The input file contains no data rows.")
+        raise ValueError("k cannot be larger than the number of samples.")
+
+    # Pass 3: labels, inertia, simplified silhouette and labelled output
+    inertia = 0.0
+    sil_total = 0.0
+    label_chunks = []
+    header = True
+    # Other columns are only read when labelled rows are written out
+    passthrough = output_cols if output_path is not None else []
+    with profiler.stage("assign"):
+        for chunk, X in _iter_feature_chunks(
+            input_path, feature_cols, chunksize, scaler, passthrough, dtype
+        ):
+            labels, min_sq_dist = nearest_centroid(X, centroids)
+            inertia += float(np.sum(min_sq_dist, dtype=np.float64))
+            if silhouette == "simplified" and k > 1:
+                sil_total += float(np.sum(simplified_silhouette_samples(X, labels, centroids)))
+            label_chunks.append(labels)
+            if output_path is not None:
+                chunk["cluster"] = labels
+                chunk.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+                header = False
+
+    all_labels = np.concatenate(label_chunks)
+    sil = None
+    if silhouette == "simplified" and k > 1:
+        sil = sil_total / all_labels.shape[0]
+
+    metrics: Dict[str, Any] = {"inertia": inertia, "silhouette": sil}
+    result: Dict[str, Any] = {
+        "data": None,
+        "labels": all_labels,
+        "centroids": centroids,
+        "metrics": metrics,
+        "fig_cluster": None,
+        "fig_elbow": None,
+        "elbow_inertias": None,
+        "model": _fitted_model(centroids, feature_cols, scaler, "minibatch_kmeans", metrics,
+                               all_labels.shape[0], init=init, random_state=random_state),
+    }
+    return result
+
+
+# Metrics available to run_clustering_grid; silhouettes are better when
+# larger, inertia when smaller.
+GRID_METRICS = ("inertia", "silhouette", "sampled_silhouette", "simplified_silhouette")
+GRID_ALGORITHMS = ("kmeans", "kmeans_elkan", "minibatch_kmeans", "sklearn_kmeans")
+
+
+def _grid_metric(
+    name: str,
+    X: np.ndarray,
+    labels: np.ndarray,
+    centroids: np.ndarray,
+    random_state: Optional[int],
+) -> Optional[float]:
+    """
+    One grid metric, or None where it is undefined (e.g. silhouette at k=1).
+    """
+    try:
+        if name == "inertia":
+            return compute_inertia(X, labels, centroids)
+        if name == "silhouette":
+            return silhouette_score_chunked(X, labels)
+        if name == "sampled_silhouette":
+            return silhouette_score_sampled(X, labels, random_state=random_state)[0]
+        return simplified_silhouette(X, labels, centroids)
+    except ValueError:
+        return None
+
+
+def _fit_grid_point(
+    X: np.ndarray,
+    algorithm: str,
+    k: int,
+    random_state: Optional[int],
+    init: str,
+    metrics: Sequence[str],
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Fit and score one (algorithm, k) of the grid.
+    Returns labels, centroids and the metrics table row.
+    """
+    start = time.perf_counter()
+    labels, centroids, fit_stats = _fit(X, algorithm, k, random_state, init)
+    fit_time = time.perf_counter() - start
+    row: Dict[str, Any] = {"algorithm": algorithm, "k": k}
+    row.update({name: _grid_metric(name, X, labels, centroids, random_state) for name in metrics})
+    row["n_iter"] = int(fit_stats["n_iter"])
+    row["fit_time"] = fit_time
+    row["metric_time"] = time.perf_counter() - start - fit_time
+    return labels, centroids, row
+
+
+def _grid_task(
+    algorithm: str,
+    k: int,
+    random_state: Optional[int],
+    init: str,
+    metrics: Sequence[str],
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Any]]:
+    """
+    Worker-side grid fit on the shared X.
+    """
+    return _fit_grid_point(worker_array(), algorithm, k, random_state, init, metrics)
+
+
+def run_clustering_grid(
+    input_path: Union[str, Dataset],
+    feature_cols: List[str],
+    k_values: Iterable[int],
+    algorithms: Sequence[str] = ("kmeans",),
+    metrics: Sequence[str] = ("inertia", "silhouette"),
+    standardise: bool = True,
+    random_state: Optional[int] = None,
+    init: str = "random",
+    select_by: Optional[str] = None,
+    output_path: Optional[str] = None,
+    output_cols: Optional[List[str]] = None,
+    n_jobs: Optional[int] = None,
+    dtype: DTypeLike = np.float64,
+) -> Dict[str, Any]:
+    """
+    Fit every combination of algorithm and k on data prepared once.
+
+    Unlike calling run_clustering in a loop, the input is loaded,
+    selected and standardised a single time, the fits run in worker
+    processes sharing the feature matrix, no figures are made and all
+    label sets are written in one CSV pass.
+
+    Parameters
+    ----------
+    input_path : str or Dataset
+        CSV file, binary dataset directory or Dataset (see run_clustering).
+    feature_cols : list of str
+    k_values : iterable of int
+    algorithms : sequence of str, default ("kmeans",)
+        Any of "kmeans", "kmeans_elkan", "minibatch_kmeans" (in memory)
+        and "sklearn_kmeans".
+    metrics : sequence of str, default ("inertia", "silhouette")
+        Any of "inertia", "silhouette" (exact), "sampled_silhouette" and
+        "simplified_silhouette". Inertia is always reported.
+    standardise : bool, default True
+    random_state : int or None, default None
+        Seed used for every fit.
+    init : {"random", "k-means++", "k-means||"}, default "random"
+    select_by : str or None, default None
+        Metric that picks the best fit: the largest silhouette or the
+        smallest inertia (only meaningful at a fixed k). None uses the
+        first requested silhouette, or inertia if none was requested.
+        Ties go to the earliest fit in grid order.
+    output_path : str or None, default None
+        If given, write the data with one "cluster_<algorithm>_k<k>"
+        column per fit to this CSV.
+    output_cols : list of str or None, default None
+        Non-feature columns to keep in "data" (see run_clustering).
+    n_jobs : int or None, default None
+        Worker processes fitting grid points in parallel (-1 for all
+        CPUs), also used as threads reading a CSV input.
+    dtype : {float64, float32}, default float64
+
+    Returns
+    -------
+    result : dict
+        Dictionary containing:
+        - "metrics": DataFrame with one row per fit, in grid order
+          (algorithms, then k): "algorithm", "k", the metrics, "n_iter",
+          "fit_time" (the fit alone) and "metric_time" (computing the
+          metrics), in seconds
+        - "labels": dict mapping (algorithm, k) -> labels
+        - "models": dict mapping (algorithm, k) -> KMeansModel
+        - "best": (algorithm, k) of the selected fit, or None if
+          select_by is undefined for every fit
+        - "model": KMeansModel of the best fit, or None
+        - "data": DataFrame with the label columns added
+        - "profile": per-stage timings ("load", "select", "standardise",
+          "fit", "export") as in run_clustering
+
+    Examples
+    --------
+    >>> grid = run_clustering_grid("data/simulated_data.csv", ["x", "y"],
+    ...                            k_values=range(2, 9), n_jobs=-1)
+    >>> grid["metrics"]
+    >>> grid["model"].save("best_model")
+    """
+    dtype = check_float_dtype(dtype)
+    k_values = list(k_values)
+    if not k_values or any(k <= 0 for k in k_values):
+        raise ValueError("k_values must be a non-empty list of positive integers.")
+    unknown = [algorithm for algorithm in algorithms if algorithm not in GRID_ALGORITHMS]
+    if unknown:
+        raise ValueError(f"Unknown algorithms {unknown}. Use any of {list(GRID_ALGORITHMS)}.")
+    unknown = [name for name in metrics if name not in GRID_METRICS]
+    if unknown:
+        raise ValueError(f"Unknown metrics {unknown}. Use any of {list(GRID_METRICS)}.")
+    metrics = ["inertia"] + [name for name in metrics if name != "inertia"]
+    if select_by is None:
+        select_by = metrics[1] if len(metrics) > 1 else "inertia"
+    if select_by not in metrics:
+        raise ValueError(f"select_by must be one of the requested metrics {metrics}.")
+
+    points = [(algorithm, k) for algorithm in algorithms for k in k_values]
+    n_workers = min(effective_n_jobs(n_jobs), len(points))
+    profiler = Profiler()
+    try:
+        df, X, scaler = _load_features(
+            input_path, feature_cols, standardise, output_cols, n_jobs, dtype, True, profiler
+        )
+
+        fits: Dict[Tuple[str, int], Tuple[np.ndarray, np.ndarray, Dict[str, Any]]] = {}
+        with profiler.stage("fit"):
+            if n_workers > 1:
+                with share_array(X) as handle:
+                    with ProcessPoolExecutor(
+                        max_workers=n_workers,
+                        initializer=init_worker,
+                        initargs=(handle,),
+                    ) as executor:
+                        futures = {
+                            point: executor.submit(_grid_task, *point, random_state, init, metrics)
+                            for point in points
+                        }
+                        fits = {point: future.result() for point, future in futures.items()}
+            else:
+                for point in points:
+                    fits[point] = _fit_grid_point(X, *point, random_state, init, metrics)
+
+        # All label sets go out in a single write
+        with profiler.stage("export"):
+            df = _output_frame(input_path, df, feature_cols, output_cols).copy(deep=False)
+            for (algorithm, k), (labels, _, _) in fits.items():
+                df[f"cluster_{algorithm}_k{k}"] = labels
+            if output_path is not None:
+                export_to_csv(df, output_path, delimiter=",", include_index=False)
+    finally:
+        profiler.close()
+
+    table = pd.DataFrame([row for _, _, row in fits.values()])
+    models = {
+        (algorithm, k): _fitted_model(
+            centroids, feature_cols, scaler, algorithm, row, X.shape[0],
+            init=init, random_state=random_state,
+        )
+        for (algorithm, k), (_, centroids, row) in fits.items()
+    }
+
+    best = None
+    scores = pd.to_numeric(table[select_by], errors="coerce")
+    if scores.notna().any():
+        position = scores.idxmin() if select_by == "inertia" else scores.idxmax()
+        best = points[position]
+
+    return {
+        "metrics": table,
+        "labels": {point: labels for point, (labels, _, _) in fits.items()},
+        "models": models,
+        "best": best,
+        "model": models[best] if best is not None else None,
+        "data": df,
+        "profile": profiler.as_dict(),
     }
-    return result
\ No newline at end of file
@@ -0,0 +1,251 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .algorithms import iter_sq_distances, nearest_centroid
+from .data_exporter import is_npy_dataset, iter_npy_chunks
+from .preprocessing import Standardiser, select_features
+
+# File names inside a saved model directory.
+MODEL_ARRAYS_FILE = "model.npz"
+MODEL_METADATA_FILE = "model.json"
+MODEL_FORMAT_VERSION = 1
+
+
+class KMeansModel:
+    """
+    A fitted K-means model: centroids plus everything needed to score new data.
+
+    The model holds the centroids (in the standardised feature space when
+    a Standardiser is given), the fitted Standardiser, the feature column
+    names and fit metadata. Scoring new data is then a single assignment
+    pass, done in chunks of rows so that memory stays bounded.
+
+    Parameters
+    ----------
+    centroids : ndarray of shape (k, n_features)
+    feature_cols : list of str
+        Names of the feature columns, in centroid column order.
+    standardiser : Standardiser or None, default None
+        Scaling applied to raw features before assignment.
+    metadata : dict or None, default None
+        JSON-serialisable fit information (algorithm, inertia, ...).
+
+    Examples
+    --------
+    >>> result = run_clustering("data/simulated_data.csv", ["x", "y"], k=3)
+    >>> result["model"].save("model_dir")
+    >>> model = KMeansModel.load("model_dir")
+    >>> labels = model.predict(new_df)
+    """
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        feature_cols: List[str],
+        standardiser: Optional[Standardiser] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if not isinstance(centroids, np.ndarray) or centroids.ndim != 2:
+            raise TypeError("centroids must be a 2-D NumPy array.")
+        if centroids.shape[1] != len(feature_cols):
+            raise ValueError("feature_cols must name one column per centroid feature.")
+        self.centroids = centroids
+        self.feature_cols = list(feature_cols)
+        self.standardiser = standardiser
+        self.metadata: Dict[str, Any] = dict(metadata or {})
+
+    def __repr__(self) -> str:
+        return (
+            f"KMeansModel(k={self.n_clusters}, feature_cols={self.feature_cols!r}, "
+            f"standardised={self.standardiser is not None})"
+        )
+
+    @property
+    def n_clusters(self) -> int:
+        return self.centroids.shape[0]
+
+    @property
+    def cluster_centres(self) -> np.ndarray:
+        """
+        Centroids in the original (unstandardised) feature units.
+        """
+        if self.standardiser is None:
+            return self.centroids.copy()
+        return self.standardiser.inverse_transform(self.centroids)
+
+    def _features(self, X: Union[np.ndarray, pd.DataFrame]) -> np.ndarray:
+        """
+        Raw feature matrix of a batch, in the centroids' dtype.
+        """
+        if isinstance(X, pd.DataFrame):
+            X = select_features(X, self.feature_cols, copy=False).to_numpy(
+                dtype=self.centroids.dtype
+            )
+        elif not isinstance(X, np.ndarray):
+            raise TypeError("X must be a NumPy array or pandas DataFrame.")
+        if X.ndim != 2 or X.shape[1] != self.centroids.shape[1]:
+            raise ValueError(
+                f"X must have {self.centroids.shape[1]} feature columns ({self.feature_cols})."
+            )
+        return X
+
+    def _iter_scaled(
+        self,
+        X: Union[np.ndarray, pd.DataFrame],
+        chunk_size: int,
+    ) -> Iterator[np.ndarray]:
+        """
+        Yield standardised row chunks of X.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer.")
+        rows = X.iloc if isinstance(X, pd.DataFrame) else X
+        for start in range(0, X.shape[0], chunk_size):
+            X_chunk = self._features(rows[start:start + chunk_size])
+            if self.standardiser is not None:
+                X_chunk = self.standardiser.transform(X_chunk)
+            yield X_chunk
+
+    def predict(
+        self,
+        X: Union[np.ndarray, pd.DataFrame],
+        chunk_size: int = 100_000,
+    ) -> np.ndarray:
+        """
+        Label of the nearest centroid for each row of X.
+
+        Parameters
+        ----------
+        X : ndarray of shape (n_samples, n_features) or DataFrame
+            Raw (unstandardised) features; a DataFrame may contain other
+            columns, the feature columns are selected by name.
+        chunk_size : int, default 100_000
+            Rows standardised and assigned at a time.
+
+        Returns
+        -------
+        labels : ndarray of shape (n_samples,)
+        """
+        labels = np.empty(X.shape[0], dtype=np.intp)
+        start = 0
+        for X_chunk in self._iter_scaled(X, chunk_size):
+            labels[start:start + X_chunk.shape[0]], _ = nearest_centroid(X_chunk, self.centroids)
+            start += X_chunk.shape[0]
+        return labels
+
+    def transform(
+        self,
+        X: Union[np.ndarray, pd.DataFrame],
+        chunk_size: int = 100_000,
+    ) -> np.ndarray:
+        """
+        Euclidean distances from each row of X to every centroid, in the
+        standardised space.
+
+        Returns
+        -------
+        distances : ndarray of shape (n_samples, k)
+        """
+        out = np.empty((X.shape[0], self.n_clusters), dtype=self.centroids.dtype)
+        offset = 0
+        for X_chunk in self._iter_scaled(X, chunk_size):
+            for start, stop, sq_dist in iter_sq_distances(X_chunk, self.centroids):
+                out[offset + start:offset + stop] = np.sqrt(sq_dist)
+            offset += X_chunk.shape[0]
+        return out
+
+    def predict_file(
+        self,
+        input_path: str,
+        output_path: Optional[str] = None,
+        chunksize: int = 100_000,
+    ) -> np.ndarray:
+        """
+        Label every row of a CSV file or .npy dataset, reading it in chunks.
+
+        Parameters
+        ----------
+        input_path : str
+            CSV file or directory written by export_to_npy.
+        output_path : str or None, default None
+            If given, the rows (all input columns plus "cluster") are
+            appended to this CSV chunk by chunk.
+        chunksize : int, default 100_000
+
+        Returns
+        -------
+        labels : ndarray of shape (n_samples,)
+        """
+        if is_npy_dataset(input_path):
+            columns = None if output_path is not None else self.feature_cols
+            chunks = iter_npy_chunks(input_path, chunksize, columns=columns)
+        else:
+            usecols = None if output_path is not None else self.feature_cols
+            chunks = pd.read_csv(input_path, chunksize=chunksize, usecols=usecols)
+
+        label_chunks = []
+        header = True
+        for chunk in chunks:
+            labels = self.predict(chunk, chunk_size=chunksize)
+            label_chunks.append(labels)
+            if output_path is not None:
+                chunk["cluster"] = labels
+                chunk.to_csv(output_path, mode="w" if header else "a", header=header, index=False)
+                header = False
+        if not label_chunks:
+            return np.empty(0, dtype=np.intp)
+        return np.concatenate(label_chunks)
+
+    def save(self, directory: str) -> None:
+        """
+        Save the model to a directory: the arrays in model.npz and the
+        feature names and metadata in model.json.
+        """
+        os.makedirs(directory, exist_ok=True)
+        arrays = {"centroids": self.centroids}
+        metadata: Dict[str, Any] = {
+            "format_version": MODEL_FORMAT_VERSION,
+            "feature_cols": self.feature_cols,
+            "metadata": self.metadata,
+            "standardiser_n_samples": None,
+        }
+        if self.standardiser is not None:
+            state = self.standardiser.to_dict()
+            arrays["mean"] = np.asarray(state["mean"])
+            arrays["sq_dev"] = np.asarray(state["sq_dev"])
+            metadata["standardiser_n_samples"] = state["n_samples"]
+        np.savez_compressed(os.path.join(directory, MODEL_ARRAYS_FILE), **arrays)
+        with open(os.path.join(directory, MODEL_METADATA_FILE), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2)
+
+    @classmethod
+    def load(cls, directory: str) -> "KMeansModel":
+        """
+        Load a model written by save.
+        """
+        with open(os.path.join(directory, MODEL_METADATA_FILE), encoding="utf-8") as f:
+            metadata = json.load(f)
+        if metadata.get("format_version") != MODEL_FORMAT_VERSION:
+            raise ValueError(f"Unsupported model format version in {directory}.")
+        with np.load(os.path.join(directory, MODEL_ARRAYS_FILE)) as arrays:
+            centroids = arrays["centroids"]
+            standardiser = None
+            if metadata["standardiser_n_samples"] is not None:
+                standardiser = Standardiser.from_dict({
+                    "n_samples": metadata["standardiser_n_samples"],
+                    "mean": arrays["mean"],
+                    "sq_dev": arrays["sq_dev"],
+                })
+        return cls(centroids, metadata["feature_cols"], standardiser, metadata["metadata"])
@@ -0,0 +1,91 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+
+class SharedArray(NamedTuple):
+    """
+    Picklable description of a NumPy array held in shared memory.
+    """
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+def effective_n_jobs(n_jobs: Optional[int]) -> int:
+    """
+    Resolve an n_jobs argument: None means 1, negative values count back
+    from the number of CPUs (-1 uses all of them).
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs == 0:
+        raise ValueError("n_jobs must be a non-zero integer or None.")
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return n_jobs
+
+
+@contextmanager
+def share_array(X: np.ndarray) -> Iterator[SharedArray]:
+    """
+    Copy X once into a shared memory block for the duration of the block.
+
+    Worker processes open it with attach_array, so the data is never
+    pickled per task. The block is unlinked on exit.
+    """
+    X = np.ascontiguousarray(X)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, X.nbytes))
+    try:
+        view = np.ndarray(X.shape, dtype=X.dtype, buffer=shm.buf)
+        view[...] = X
+        del view
+        yield SharedArray(shm.name, X.shape, X.dtype.str)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def attach_array(handle: SharedArray) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    Open a shared array created by share_array in a worker process.
+
+    The SharedMemory object is returned as well and must be kept alive
+    for as long as the array is used.
+    """
+    # Pool workers share the parent's resource tracker, so attaching here
+    # does not take ownership: the block is unlinked only by share_array.
+    shm = shared_memory.SharedMemory(name=handle.name)
+    X = np.ndarray(handle.shape, dtype=np.dtype(handle.dtype), buffer=shm.buf)
+    return shm, X
+
+
+# Per-process state of pool workers started with init_worker.
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def init_worker(handle: SharedArray) -> None:
+    """
+    Pool initializer: attach to the shared array once per worker process.
+    """
+    shm, X = attach_array(handle)
+    _WORKER_STATE["shm"] = shm
+    _WORKER_STATE["X"] = X
+
+
+def worker_array() -> np.ndarray:
+    """
+    The shared array attached by init_worker in this worker process.
+    """
+    return _WORKER_STATE["X"]
@@ -6,14 +6,28 @@
 
 from __future__ import annotations
 
-from typing import List
+import json
+from typing import Any, Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
 
 
-def select_features(data: pd.DataFrame, feature_cols: List[str]) -> pd.DataFrame:
+def check_float_dtype(dtype: Union[str, type, np.dtype]) -> np.dtype:
+    """
+    Validate a compute dtype option: float32 or float64.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("dtype must be float32 or float64.")
+    return dtype
+
+
+def select_features(
+    data: pd.DataFrame,
+    feature_cols: List[str],
+    copy: bool = True,
+) -> pd.DataFrame:
     """
     Select a subset of columns to use as features, ensuring they are numeric.
 
@@ -22,6 +36,9 @@ def select_features(data: pd.DataFrame, feature_cols: List[str]) -> pd.DataFrame
     data : pandas.DataFrame
     feature_cols : list of str
         Column names to select.
+    copy : bool, default True
+        If False, the column data is not copied: X_df may share memory
+        with data, so neither should be modified in place.
 
     Returns
     -------
@@ -39,7 +56,9 @@ def select_features(data: pd.DataFrame, feature_cols: List[str]) -> pd.DataFrame
     if missing:
         raise KeyError(f"The following feature columns are missing: {missing}")
 
-    X_df = data[feature_cols].copy()
+    X_df = data[feature_cols]
+    if copy:
+        X_df = X_df.copy()
 
     non_numeric = [
         col for col in X_df.columns
@@ -51,19 +70,215 @@ def select_features(data: pd.DataFrame, feature_cols: List[str]) -> pd.DataFrame
     return X_df
 
 
-def standardise_features(X: np.ndarray) -> np.ndarray:
+# Rows per block when accumulating column statistics.
+_STATS_BLOCK_ROWS = 65_536
+
+
+class Standardiser:
+    """
+    Streaming, mergeable standardisation to zero mean and unit variance.
+
+    Column means and sums of squared deviations are accumulated in float64
+    over any number of partial_fit calls, each merged into the running
+    state with Chan et al.'s parallel update of Welford's algorithm. The
+    data never needs to be in memory at once, states fitted on different
+    chunks or workers can be combined with merge, and the fitted state
+    can be saved and re-applied to new data batch by batch.
+
+    Features with zero variance (up to rounding error) are left unscaled,
+    as in scikit-learn's StandardScaler.
+
+    Examples
+    --------
+    >>> scaler = Standardiser()
+    >>> for chunk in chunks:
+    ...     scaler.partial_fit(chunk)
+    >>> X_scaled = scaler.transform(X_new)
+    """
+
+    def __init__(self) -> None:
+        self.n_samples = 0
+        self.mean: Optional[np.ndarray] = None
+        self._sq_dev: Optional[np.ndarray] = None
+
+    def __repr__(self) -> str:
+        n_features = None if self.mean is None else self.mean.shape[0]
+        return f"Standardiser(n_samples={self.n_samples}, n_features={n_features})"
+
+    @property
+    def var(self) -> np.ndarray:
+        """
+        Column (population) variances.
+        """
+        self._check_fitted()
+        return self._sq_dev / self.n_samples
+
+    @property
+    def scale(self) -> np.ndarray:
+        """
+        Column standard deviations, with 1 for constant columns.
+
+        A column counts as constant when its variance is within rounding
+        error of zero (the bound of scikit-learn's _is_constant_feature):
+        a constant such as 0.1 leaves a variance of ~1e-34 in float64,
+        which must not be scaled up to unit variance.
+        """
+        var = self.var
+        eps = np.finfo(np.float64).eps
+        n = self.n_samples
+        constant = var <= n * eps * var + (n * self.mean * eps) ** 2
+        return np.where(constant, 1.0, np.sqrt(var))
+
+    def _check_fitted(self) -> None:
+        if self.n_samples == 0:
+            raise ValueError("Standardiser has not been fitted to any data.")
+
+    def _update(self, n: int, mean: np.ndarray, sq_dev: np.ndarray) -> None:
+        """
+        Merge the statistics of n further samples into the running state.
+        """
+        if n == 0:
+            return
+        if self.n_samples == 0:
+            self.n_samples, self.mean, self._sq_dev = n, mean, sq_dev
+            return
+        if mean.shape != self.mean.shape:
+            raise ValueError("Data has a different number of features than the fitted state.")
+        total = self.n_samples + n
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (n / total)
+        self._sq_dev = self._sq_dev + sq_dev + delta ** 2 * (self.n_samples * n / total)
+        self.n_samples = total
+
+    def partial_fit(self, X: np.ndarray) -> "Standardiser":
+        """
+        Update the statistics with a batch of samples.
+
+        X is processed in row blocks through a fixed float64 buffer, so no
+        temporary as large as X is created.
+        """
+        if not isinstance(X, np.ndarray) or X.ndim != 2:
+            raise TypeError("X must be a 2-D NumPy array.")
+        buffer = np.empty((min(X.shape[0], _STATS_BLOCK_ROWS), X.shape[1]))
+        for start in range(0, X.shape[0], _STATS_BLOCK_ROWS):
+            block = X[start:start + _STATS_BLOCK_ROWS]
+            n = block.shape[0]
+            mean = block.sum(axis=0, dtype=np.float64) / n
+            diff = np.subtract(block, mean, out=buffer[:n])
+            self._update(n, mean, np.square(diff, out=diff).sum(axis=0))
+        return self
+
+    def fit(self, X: np.ndarray) -> "Standardiser":
+        """
+        Reset the state and fit it to X.
+        """
+        self.__init__()
+        return self.partial_fit(X)
+
+    def merge(self, other: "Standardiser") -> "Standardiser":
+        """
+        Combined state of self and other (e.g. fitted by different
+        workers on disjoint chunks), as if fitted on both. Neither input
+        is modified.
+        """
+        merged = Standardiser()
+        for state in (self, other):
+            if state.n_samples:
+                merged._update(state.n_samples, state.mean, state._sq_dev)
+        return merged
+
+    def transform(self, X: np.ndarray, copy: bool = True) -> np.ndarray:
+        """
+        Standardise X with the fitted statistics.
+
+        float32 input stays float32, other input gives float64. With
+        copy=False a writeable float array X is scaled in place and
+        returned.
+        """
+        self._check_fitted()
+        if not isinstance(X, np.ndarray):
+            raise TypeError("X must be a NumPy array.")
+        if X.ndim != 2 or X.shape[1] != self.mean.shape[0]:
+            raise ValueError("X has a different number of features than the fitted state.")
+        dtype = X.dtype if X.dtype in (np.float32, np.float64) else np.dtype(np.float64)
+        if copy or X.dtype != dtype or not X.flags.writeable:
+            X = X.astype(dtype)
+        X -= self.mean.astype(dtype)
+        X /= self.scale.astype(dtype)
+        return X
+
+    def fit_transform(self, X: np.ndarray, copy: bool = True) -> np.ndarray:
+        return self.fit(X).transform(X, copy=copy)
+
+    def inverse_transform(self, X: np.ndarray) -> np.ndarray:
+        """
+        Map standardised values back to the original units.
+        """
+        self._check_fitted()
+        return X * self.scale + self.mean
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        JSON-serialisable fitted state (see from_dict).
+        """
+        self._check_fitted()
+        return {
+            "n_samples": self.n_samples,
+            "mean": self.mean.tolist(),
+            "sq_dev": self._sq_dev.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "Standardiser":
+        """
+        Rebuild a Standardiser from the output of to_dict.
+        """
+        scaler = cls()
+        scaler._update(
+            int(state["n_samples"]),
+            np.asarray(state["mean"], dtype=np.float64),
+            np.asarray(state["sq_dev"], dtype=np.float64),
+        )
+        return scaler
+
+    def save(self, path: str) -> None:
+        """
+        Write the fitted state to a JSON file.
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "Standardiser":
+        """
+        Read a state written by save.
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def standardise_features(X: np.ndarray, copy: bool = True) -> np.ndarray:
     """
     Standardise features to zero mean and unit variance.
 
     Parameters
     ----------
     X : ndarray of shape (n_samples, n_features)
+    copy : bool, default True
+        If False and X is a writeable float32/float64 array, X is scaled
+        in place and returned (the result aliases X). Otherwise a new
+        array is returned.
 
     Returns
     -------
     X_scaled : ndarray of shape (n_samples, n_features)
+        float32 input stays float32 (the mean and variance are still
+        computed in float64); other input gives float64.
+
+    See Also
+    --------
+    Standardiser : the same scaling with a reusable, mergeable state.
     """
     if not isinstance(X, np.ndarray):
         raise TypeError("X must be a NumPy array.")
-    scaler = StandardScaler()
-    return scaler.fit_transform(X)
\ No newline at end of file
+    return Standardiser().fit_transform(X, copy=copy)
@@ -0,0 +1,151 @@
+###
+## cluster_maker
+## James Foadi - University of Bath
+## November 2025
+###
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Optional
+
+import pandas as pd
+
+
+class Profiler:
+    """
+    Per-stage wall time, CPU time and (optionally) peak memory of a run.
+
+    Each stage is timed with time.perf_counter (wall) and
+    time.process_time (CPU of the whole process, so worker threads count
+    but worker processes do not). With trace_memory=True, tracemalloc
+    also reports each stage's peak allocation above the memory in use
+    when the stage started.
+
+    Parameters
+    ----------
+    trace_memory : bool, default False
+        Measure peak allocations with tracemalloc. This slows down
+        allocation-heavy code. tracemalloc is started if needed (and
+        stopped by close()); if it is already running, its peak is reset
+        at every stage.
+
+    Examples
+    --------
+    >>> profiler = Profiler()
+    >>> with profiler.stage("load"):
+    ...     df = pd.read_csv("data.csv")
+    >>> profiler.as_dict()["load"]["wall_time"]
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+        self._total: Optional[Dict[str, float]] = None
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the enclosed block as the named stage. A repeated name adds
+        to the earlier timings (and keeps the larger peak).
+        """
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            record = self.stages.setdefault(name, {"wall_time": 0.0, "cpu_time": 0.0})
+            record["wall_time"] += time.perf_counter() - wall
+            record["cpu_time"] += time.process_time() - cpu
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                record["peak_memory"] = max(record.get("peak_memory", 0), peak - base)
+
+    def close(self) -> None:
+        """
+        Fix the total times and stop tracemalloc if this profiler started it.
+        """
+        if self._total is None:
+            self._total = {
+                "wall_time": time.perf_counter() - self._wall_start,
+                "cpu_time": time.process_time() - self._cpu_start,
+            }
+            if self.trace_memory:
+                self._total["peak_memory"] = max(
+                    (record["peak_memory"] for record in self.stages.values()), default=0
+                )
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Stage name -> {"wall_time", "cpu_time"[, "peak_memory"]} in seconds
+        and bytes, in execution order, followed by a "total" entry.
+        """
+        self.close()
+        return {**{name: dict(record) for name, record in self.stages.items()},
+                "total": dict(self._total)}
+
+
+def append_profile_log(path: str, profile: Dict[str, Any], **context: Any) -> Dict[str, Any]:
+    """
+    Append one run's profile to a JSON-lines log.
+
+    Each line is a self-contained JSON object with a run id, a UTC
+    timestamp, the host name and process id, the given context (e.g.
+    algorithm, k, n_samples) and the stages. Lines are written with a
+    single append, so many jobs can share one log on a local file system.
+
+    Returns
+    -------
+    record : dict
+        The record that was written.
+    """
+    record = {
+        "run_id": uuid.uuid4().hex,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "host": socket.gethostname(),
+        "pid": os.getpid(),
+        **context,
+        "stages": profile,
+    }
+    line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+    finally:
+        os.close(fd)
+    return record
+
+
+def read_profile_log(path: str) -> pd.DataFrame:
+    """
+    Load a log written by append_profile_log as a tidy DataFrame with one
+    row per run and stage, ready for groupby aggregation.
+    """
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            stages = record.pop("stages")
+            for name, timings in stages.items():
+                rows.append({**record, "stage": name, **timings})
+    return pd.DataFrame(rows)
@@ -18,7 +18,7 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
-from cluster_maker import run_clustering
+from cluster_maker import plot_clusters_2d, run_clustering_grid
 
 OUTPUT_DIR = "demo_output"
 
@@ -71,49 +71,44 @@ def main(args: List[str]) -> None:
 
     # Keep track of saved files for the final summary
     saved_files = []
-    metrics_summary = []
 
     print_section_header("Processing Clustering (k=2, 3, 4, 5)")
     print("Algorithm: K-Means (sklearn implementation for robustness)")
     print("-" * 60)
 
-    for k in (2, 3, 4, 5):
-        print(f"  > Running K-Means with k = {k}...", end=" ")
-
-        # FIX 1: Removed min(k, 3) AND switched to sklearn_kmeans
-        output_csv = os.path.join(OUTPUT_DIR, f"{base}_clustered_k{k}.csv")
-        result = run_clustering(
-            input_path=input_path,
-            feature_cols=feature_cols,
-            algorithm="sklearn_kmeans",  # Switched to robust implementation
-            k=k,
-            standardise=True,
-            output_path=output_csv,
-            random_state=42,
-            compute_elbow=False,
-        )
-        saved_files.append(output_csv)
+    # The data is loaded and standardised once, every k is fitted in
+    # parallel and all label sets are written to one CSV.
+    output_csv = os.path.join(OUTPUT_DIR, f"{base}_clustered.csv")
+    grid = run_clustering_grid(
+        input_path,
+        feature_cols,
+        k_values=(2, 3, 4, 5),
+        algorithms=["sklearn_kmeans"],  # Switched to robust implementation
+        random_state=42,
+        output_path=output_csv,
+        n_jobs=-1,
+    )
+    saved_files.append(output_csv)
+
+    X = df[feature_cols].to_numpy()
+    for (_, k), labels in grid["labels"].items():
+        print(f"  > Plotting K-Means with k = {k}...", end=" ")
 
         # Save cluster plot
         plot_path = os.path.join(OUTPUT_DIR, f"{base}_k{k}.png")
-        
+        centres = grid["models"][("sklearn_kmeans", k)].cluster_centres
+        fig, ax = plot_clusters_2d(X, labels, centroids=centres)
+
         # Improve Title
-        fig = result["fig_cluster"]
-        ax = fig.axes[0]
         ax.set_title(f"Cluster Separation (k={k})")
-        
+
         fig.savefig(plot_path, dpi=150)
         plt.close(fig)
         saved_files.append(plot_path)
-
-        # Collect metrics
-        metrics = {"k": k}
-        metrics.update(result.get("metrics", {}))
-        metrics_summary.append(metrics)
         print("Done.")
 
     # Summarise metrics across k
-    metrics_df = pd.DataFrame(metrics_summary)
+    metrics_df = grid["metrics"].drop(columns="algorithm")
     metrics_csv = os.path.join(OUTPUT_DIR, f"{base}_metrics.csv")
     metrics_df.to_csv(metrics_csv, index=False)
     saved_files.append(metrics_csv)
@@ -141,8 +136,7 @@ def main(args: List[str]) -> None:
     
     # Identify best k and Add GENERIC CAUTION NOTE
     if "silhouette" in metrics_df.columns:
-        best_run = metrics_df.loc[metrics_df["silhouette"].idxmax()]
-        best_k = int(best_run['k'])
+        _, best_k = grid["best"]
         print(f"Automated Suggestion: k = {best_k} has the highest Silhouette Score.")
         
         print("\nINTERPRETATION NOTE:")
@@ -10,11 +10,15 @@ from __future__ import annotations
 
 import os
 import sys
-import pandas as pd
 import matplotlib.pyplot as plt
 
 # Import tools from our package
-from cluster_maker import run_clustering, calculate_descriptive_statistics
+from cluster_maker import (
+    Dataset,
+    calculate_descriptive_statistics,
+    plot_clusters_2d,
+    run_clustering_grid,
+)
 
 # Configuration
 INPUT_FILE = os.path.join("data", "simulated_data.csv")
@@ -42,7 +46,9 @@ def main():
 
     # --- Step 1: Exploratory Data Analysis (EDA) ---
     print_section_header("Step 1: Data Inspection & Statistics")
-    df = pd.read_csv(INPUT_FILE)
+    # The Dataset parses the CSV once and is reused by every run below
+    data = Dataset(INPUT_FILE)
+    df = data.frame
     
     # --- EXPLAINING THE FEATURES (User Interaction) ---
     feature_names = list(df.columns)
@@ -89,50 +95,41 @@ def main():
     print("Method:    We will test different cluster counts (k) to find the best fit.")
     print("-" * 60)
     
-    metrics_history = []
-    k_values = range(2, 9)
-    
-    for k in k_values:
-        print(f"  > Testing separation into k={k} clusters...", end=" ")
-        
-        output_csv = os.path.join(OUTPUT_DIR, f"clustered_k{k}.csv")
-        
-        result = run_clustering(
-            input_path=INPUT_FILE,
-            feature_cols=df.columns, 
-            algorithm="sklearn_kmeans", 
-            k=k,
-            standardise=True,
-            output_path=output_csv,
-            random_state=42, 
-            compute_elbow=False
-        )
-        
+    # The data is standardised once and every k is fitted in parallel;
+    # all label sets are written to a single CSV.
+    feature_cols = list(df.columns)
+    labels_csv = os.path.join(OUTPUT_DIR, "clustered_all_k.csv")
+    grid = run_clustering_grid(
+        data,
+        feature_cols,
+        k_values=range(2, 9),
+        algorithms=["sklearn_kmeans"],
+        metrics=["inertia", "silhouette"],
+        random_state=42,
+        output_path=labels_csv,
+        n_jobs=-1,
+    )
+
+    X = df[feature_cols].to_numpy()
+    for (_, k), labels in grid["labels"].items():
+        print(f"  > Plotting separation into k={k} clusters...", end=" ")
+        centres = grid["models"][("sklearn_kmeans", k)].cluster_centres
+        fig, ax = plot_clusters_2d(X, labels, centroids=centres)
+
         # --- FIX: Plot Adjustments ---
-        fig = result["fig_cluster"]
-        ax = fig.axes[0]
-        
         # 1. Fix Title Overlap
         ax.set_title(f"Cluster Separation (k={k})")
-        
+
         # 2. Fix Legend Overlap (Move to Bottom Left)
         ax.legend(loc="lower left")
-        
+
         fig.savefig(os.path.join(OUTPUT_DIR, f"plot_k{k}.png"), dpi=150)
         plt.close(fig)
-        
-        # Collect Metrics
-        m = result["metrics"]
-        metrics_history.append({
-            "k": k,
-            "inertia": m.get("inertia"),
-            "silhouette": m.get("silhouette")
-        })
         print("Done.")
 
     # --- Step 3: Visualisation & Conclusion ---
     print_section_header("Step 3: Evaluation & Conclusion")
-    metrics_df = pd.DataFrame(metrics_history)
+    metrics_df = grid["metrics"][["k", "inertia", "silhouette"]]
     
     # Plot Comparison
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
@@ -153,10 +150,9 @@ def main():
     plt.savefig(comparison_path, dpi=150)
     plt.close()
     
-    # Find best k
-    best_run = metrics_df.loc[metrics_df["silhouette"].idxmax()]
-    best_k = int(best_run["k"])
-    best_score = best_run["silhouette"]
+    # Best k by silhouette, as selected by run_clustering_grid
+    _, best_k = grid["best"]
+    best_score = metrics_df.loc[metrics_df["k"] == best_k, "silhouette"].iloc[0]
     
     print("Metric Definitions:")
     print(" * Inertia: Measures how 'tight' the clusters are (Lower is better).")
@@ -175,7 +171,7 @@ def main():
     print_section_header("Output Summary")
     print(f"1. Comparison plot saved to: {comparison_path}")
     print(f"2. Individual cluster plots: {OUTPUT_DIR}/plot_k*.png")
-    print(f"3. Labelled data files:      {OUTPUT_DIR}/clustered_k*.csv")
+    print(f"3. Labelled data (all k):    {labels_csv}")
     print("============================================================")
 
 if __name__ == "__main__":
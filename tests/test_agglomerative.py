@@ -0,0 +1,66 @@
+###
+## cluster_maker
+## Unit tests for agglomerative module
+###
+
+import unittest
+
+import numpy as np
+from scipy.cluster import hierarchy
+from sklearn.metrics import adjusted_rand_score
+
+from cluster_maker.agglomerative import (
+    agglomerative_tree,
+    cut_tree_labels,
+    fit_agglomerative,
+    fit_agglomerative_multi,
+)
+
+
+class TestAgglomerative(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        centres = np.array([[-6.0, 0.0], [0.0, 6.0], [6.0, 0.0], [0.0, -6.0]])
+        self.X = np.vstack([rng.normal(loc=c, scale=1.0, size=(30, 2)) for c in centres])
+
+    # Cutting one SciPy tree must give the same partitions as refitting
+    # scikit-learn for every k, otherwise the shortcut changes results.
+    def test_tree_cuts_match_refitting(self):
+        k_values = [2, 3, 4, 6]
+        for linkage in ("ward", "average"):
+            labels_by_k, _ = fit_agglomerative_multi(self.X, k_values, linkage=linkage)
+            for k in k_values:
+                expected, _ = fit_agglomerative(self.X, n_clusters=k, linkage=linkage)
+                self.assertEqual(len(np.unique(labels_by_k[k])), k)
+                self.assertAlmostEqual(adjusted_rand_score(expected, labels_by_k[k]), 1.0)
+
+    # The union-find replay of the tree must reproduce scipy's cut_tree
+    # labels (including their numbering) in any order of k, and give
+    # exactly n_samples clusters at k = n_samples.
+    def test_cut_tree_labels_matches_scipy(self):
+        n_samples = self.X.shape[0]
+        k_values = [5, 1, 2, 40, 5, n_samples - 1]
+        for linkage in ("ward", "single"):
+            Z = agglomerative_tree(self.X, linkage=linkage)
+            expected = hierarchy.cut_tree(Z, n_clusters=k_values)
+            labels_by_k = cut_tree_labels(Z, k_values)
+            for i, k in enumerate(k_values):
+                self.assertTrue(np.array_equal(labels_by_k[k], expected[:, i]))
+            singletons = cut_tree_labels(Z, [n_samples])[n_samples]
+            self.assertTrue(np.array_equal(np.sort(singletons), np.arange(n_samples)))
+        with self.assertRaises(ValueError):
+            cut_tree_labels(Z, [0])
+
+    # Merge heights must not increase with k, and (beyond the first split)
+    # the biggest relative drop must sit at the true number of blobs.
+    def test_merge_heights_curve(self):
+        k_values = list(range(1, 8))
+        _, heights = fit_agglomerative_multi(self.X, k_values)
+        values = [heights[k] for k in k_values]
+        self.assertTrue(all(a >= b for a, b in zip(values, values[1:])))
+        drop = {k: heights[k - 1] / heights[k] for k in range(3, 8)}
+        self.assertEqual(max(drop, key=drop.get), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
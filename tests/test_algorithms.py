@@ -4,16 +4,25 @@
 ## November 2025
 ###
 
+import multiprocessing
+import time
 import unittest
 
 import numpy as np
 
 from cluster_maker.algorithms import (
     kmeans,
+    kmeans_elkan,
+    minibatch_kmeans,
     sklearn_kmeans,
     init_centroids,
     assign_clusters,
+    nearest_centroid,
+    update_centroids,
+    cluster_sums_counts,
+    _use_kdtree,
 )
+from cluster_maker.evaluation import compute_inertia
 
 
 class TestAlgorithms(unittest.TestCase):
@@ -31,6 +40,92 @@ class TestAlgorithms(unittest.TestCase):
         self.assertEqual(centroids.shape, (3, 2))
         self.assertEqual(labels.shape[0], self.X.shape[0])
 
+    # float32 data must stay float32 (no silent upcast of the centroids,
+    # which would convert X block by block) and give the float64 labels.
+    def test_kmeans_float32(self):
+        X32 = self.X.astype(np.float32)
+        labels32, centroids32 = kmeans(X32, k=3, random_state=0)
+        labels64, centroids64 = kmeans(self.X, k=3, random_state=0)
+        self.assertEqual(centroids32.dtype, np.float32)
+        self.assertTrue(np.array_equal(labels32, labels64))
+        self.assertTrue(np.allclose(centroids32, centroids64, atol=1e-5))
+        self.assertEqual(update_centroids(X32, labels32, 3).dtype, np.float32)
+
+    # float32 data far from the origin must not lose its distances to
+    # cancellation in ||x||^2 - 2 x.c + ||c||^2 (near-origin data hides it).
+    def test_float32_offset_data(self):
+        rng = np.random.RandomState(0)
+        X = np.vstack([rng.normal(loc=c, scale=1.0, size=(500, 2)) for c in (0.0, 6.0, 12.0)])
+        X += 1e4
+        X32 = X.astype(np.float32)
+        centroids = X[[0, 500, 1000]] + 0.5
+
+        labels64, min_sq64 = nearest_centroid(X, centroids, backend="matmul")
+        labels32, min_sq32 = nearest_centroid(X32, centroids.astype(np.float32), backend="matmul")
+        self.assertEqual(min_sq32.dtype, np.float32)
+        self.assertTrue(np.array_equal(labels32, labels64))
+        self.assertTrue(np.allclose(min_sq32, min_sq64, rtol=1e-2, atol=1e-2))
+
+        labels64, centroids64 = kmeans(X, k=3, random_state=0, init="k-means++")
+        labels32, centroids32 = kmeans(X32, k=3, random_state=0, init="k-means++")
+        inertia64 = compute_inertia(X, labels64, centroids64)
+        inertia32 = compute_inertia(X32, labels32, centroids32)
+        self.assertAlmostEqual(inertia32 / inertia64, 1.0, places=2)
+
+    # Test that restarts are reproducible whatever the number of workers
+    def test_kmeans_n_init_parallel_matches_serial(self):
+        labels_s, centroids_s = kmeans(self.X, k=3, random_state=0, n_init=4)
+        labels_p, centroids_p = kmeans(self.X, k=3, random_state=0, n_init=4, n_jobs=2)
+        self.assertTrue(np.array_equal(labels_s, labels_p))
+        self.assertTrue(np.allclose(centroids_s, centroids_p))
+
+        with self.assertRaises(ValueError):
+            kmeans(self.X, k=3, n_init=0)
+
+    # A time budget must follow one rule serially and in parallel: the
+    # first restart always converges, later ones are skipped or stopped
+    # once the budget runs out, and no worker outlives the call.
+    def test_kmeans_time_budget(self):
+        X = np.random.RandomState(0).uniform(size=(20_000, 2))
+        kwargs = dict(k=20, tol=0.0, max_iter=100_000)
+        first_seed = int(np.random.SeedSequence(0).generate_state(8)[0])
+        start = time.perf_counter()
+        labels_first, _, n_iter_first = kmeans(X, random_state=first_seed,
+                                               return_n_iter=True, **kwargs)
+        first_time = time.perf_counter() - start
+
+        for n_jobs in (1, 2):
+            start = time.perf_counter()
+            labels, centroids, n_iter, history = kmeans(
+                X, random_state=0, n_init=8, n_jobs=n_jobs, time_budget=0.0,
+                return_n_iter=True, return_history=True, **kwargs
+            )
+            self.assertLess(time.perf_counter() - start, 2 * first_time + 3.0)
+            self.assertEqual(multiprocessing.active_children(), [])
+            self.assertEqual(n_iter, n_iter_first)
+            self.assertEqual(history[-1]["n_changed"], 0)
+            self.assertNotIn("stopped", history[-1])
+            self.assertTrue(np.array_equal(labels, labels_first))
+            self.assertTrue(np.array_equal(labels, assign_clusters(X, centroids)))
+
+    # Test that the Elkan variant reproduces manual K-means while pruning work
+    def test_kmeans_elkan_matches_kmeans(self):
+        rng = np.random.RandomState(4)
+        X = np.vstack([rng.normal(loc=c, size=(200, 3)) for c in (-6.0, 0.0, 6.0, 12.0)])
+        labels, centroids = kmeans(X, k=4, random_state=1)
+        labels_e, centroids_e, stats = kmeans_elkan(X, k=4, random_state=1, return_stats=True)
+        self.assertTrue(np.array_equal(labels, labels_e))
+        self.assertTrue(np.allclose(centroids, centroids_e))
+        self.assertGreater(stats["distance_evals_pruned"], 0)
+
+    # Test mini-batch K-means recovers the three obvious clusters
+    def test_minibatch_kmeans(self):
+        labels, centroids = minibatch_kmeans(self.X, k=3, batch_size=8, random_state=0)
+        self.assertEqual(centroids.shape, (3, 2))
+        # Each generating blob must end up in a single cluster
+        for start in (0, 10, 20):
+            self.assertEqual(len(set(labels[start:start + 10])), 1)
+
     # Test sklearn KMeans wrapper.
     def test_kmeans_sklearn(self):
         labels, centroids = sklearn_kmeans(self.X, k=3, random_state=0)
@@ -70,6 +165,20 @@ class TestAlgorithms(unittest.TestCase):
         with self.assertRaises(ValueError):
             init_centroids(X_small, k=5, random_state=0)
 
+    # Test that the seeding strategies pick k distinct rows, one per blob
+    def test_init_centroids_seeding_strategies(self):
+        for init in ("k-means++", "k-means||"):
+            centroids = init_centroids(self.X, k=3, random_state=0, init=init)
+            self.assertEqual(centroids.shape, (3, 2))
+            for c in centroids:
+                self.assertTrue(any(np.array_equal(c, row) for row in self.X))
+            # Well-separated blobs: D^2 seeding must hit each blob once
+            blob_ids = sorted(int(np.argmin(np.abs(c[0] - np.array([-5.0, 0.0, 5.0])))) for c in centroids)
+            self.assertEqual(blob_ids, [0, 1, 2])
+
+        with self.assertRaises(ValueError):
+            init_centroids(self.X, k=3, init="furthest")
+
     # Test assign_clusters
     def test_assign_clusters_nearest_centroid(self):
         # Construct a tiny, easy-to-reason-about example in 2D
@@ -96,6 +205,84 @@ class TestAlgorithms(unittest.TestCase):
         # Exact label match
         self.assertTrue(np.array_equal(labels, expected))
 
+    # Test the blocked distance kernel against a brute-force computation
+    def test_assign_clusters_blocked_matches_brute_force(self):
+        rng = np.random.RandomState(3)
+        X = rng.normal(size=(500, 5))
+        centroids = rng.normal(size=(7, 5))
+
+        diff = X[:, np.newaxis, :] - centroids[np.newaxis, :, :]
+        sq_dist = np.sum(diff ** 2, axis=2)
+
+        # A tiny budget forces many row blocks
+        labels, min_sq = nearest_centroid(X, centroids, memory_budget=256)
+        self.assertTrue(np.array_equal(labels, np.argmin(sq_dist, axis=1)))
+        self.assertTrue(np.allclose(min_sq, sq_dist.min(axis=1)))
+        self.assertTrue(np.array_equal(assign_clusters(X, centroids), labels))
+
+    # The KD-tree backend must agree with the matrix-multiply kernel, and
+    # "auto" must only pick it for many centroids in few dimensions.
+    def test_nearest_centroid_kdtree_backend(self):
+        rng = np.random.RandomState(4)
+        X = rng.normal(size=(2000, 3)).astype(np.float32)
+        centroids = rng.normal(size=(300, 3)).astype(np.float32)
+
+        expected, expected_sq = nearest_centroid(X, centroids, backend="matmul")
+        labels, min_sq = nearest_centroid(X, centroids, memory_budget=4096, backend="kdtree")
+        self.assertTrue(np.array_equal(labels, expected))
+        self.assertTrue(np.allclose(min_sq, expected_sq, atol=1e-5))
+        self.assertEqual(min_sq.dtype, np.float32)
+
+        self.assertTrue(_use_kdtree(300, 3, "auto"))
+        self.assertFalse(_use_kdtree(300, 10, "auto"))
+        with self.assertRaises(ValueError):
+            assign_clusters(X, centroids, backend="brute")
+
+    # The history must have one record per iteration, end on a pass that
+    # changed no label, and a callback returning True must stop the run
+    # and mark its last record as stopped.
+    def test_kmeans_history_and_callback(self):
+        rng = np.random.RandomState(5)
+        X = np.vstack([rng.normal(c, 0.3, size=(100, 2)) for c in (0.0, 5.0, 10.0)])
+
+        labels, centroids, n_iter, history = kmeans(
+            X, 3, tol=0.0, random_state=0, return_n_iter=True, return_history=True
+        )
+        self.assertEqual(len(history), n_iter)
+        self.assertEqual(history[0]["n_changed"], X.shape[0])
+        self.assertEqual(history[-1]["n_changed"], 0)
+        self.assertTrue(np.array_equal(labels, assign_clusters(X, centroids)))
+
+        seen = []
+        _, _, n_iter = kmeans(
+            X, 3, tol=0.0, random_state=0, return_n_iter=True,
+            callback=lambda record: seen.append(record) or record["iteration"] == 1,
+        )
+        self.assertEqual(n_iter, 1)
+        self.assertEqual([r["iteration"] for r in seen], [1])
+        self.assertTrue(seen[-1]["stopped"])
+        with self.assertRaises(ValueError):
+            kmeans(X, 3, n_init=2, n_jobs=2, callback=lambda record: None)
+
+    # Test the one-pass sufficient statistics and the centroid update
+    def test_update_centroids_sums_counts_and_empty_cluster(self):
+        X = np.array([
+            [0.0, 0.0],
+            [2.0, 0.0],
+            [10.0, 10.0],
+        ])
+        labels = np.array([0, 0, 2])
+
+        sums, counts = cluster_sums_counts(X, labels, k=3)
+        self.assertTrue(np.allclose(sums, [[2.0, 0.0], [0.0, 0.0], [10.0, 10.0]]))
+        self.assertTrue(np.array_equal(counts, [2, 0, 1]))
+
+        centroids = update_centroids(X, labels, k=3, random_state=0)
+        self.assertTrue(np.allclose(centroids[0], [1.0, 0.0]))
+        self.assertTrue(np.allclose(centroids[2], [10.0, 10.0]))
+        # The empty cluster is re-seeded from a row of X
+        self.assertTrue(any(np.array_equal(centroids[1], row) for row in X))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,63 @@
+###
+## cluster_maker
+## Unit tests for the benchmark regression checks
+###
+
+import importlib.util
+import os
+import unittest
+
+_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "run_benchmarks.py")
+_SPEC = importlib.util.spec_from_file_location("run_benchmarks", _PATH)
+run_benchmarks = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(run_benchmarks)
+
+
+def _record(benchmark="kmeans", **metrics):
+    return {"benchmark": benchmark, "n_samples": 1000, "n_features": 2, "k": 3, **metrics}
+
+
+class TestBenchmarkCompare(unittest.TestCase):
+    # A real slowdown must be flagged, while a rerun that is only slower
+    # by noise (within tolerance plus the absolute slack) must pass.
+    def test_compare_flags_regressions_beyond_tolerance_and_slack(self):
+        baseline = [_record(wall_time=0.2, peak_memory=10 * 2**20, n_iter=10)]
+        noisy = [_record(wall_time=0.255, peak_memory=10 * 2**20 + 2**10, n_iter=10)]
+        self.assertEqual(run_benchmarks.compare(noisy, baseline, tolerance=0.25), [])
+
+        slower = [_record(wall_time=0.4, peak_memory=20 * 2**20, n_iter=13)]
+        regressions = run_benchmarks.compare(slower, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 3)
+        self.assertIn("wall_time", regressions[0])
+
+        only_time = run_benchmarks.compare(slower, baseline, 0.25, metrics=("wall_time",))
+        self.assertEqual(len(only_time), 1)
+
+    # Cases that cannot be compared meaningfully must be skipped, not
+    # flagged: wall times under the noise floor, cases missing from the
+    # baseline, and metrics missing or zero in the baseline.
+    def test_compare_ignored_cases(self):
+        baseline = [
+            _record(wall_time=0.01, peak_memory=0),
+            _record("assign_clusters", wall_time=0.2),
+        ]
+        results = [
+            _record(wall_time=0.04, peak_memory=2**30, n_iter=50),
+            _record("update_centroids", wall_time=10.0),
+        ]
+        self.assertEqual(run_benchmarks.compare(results, baseline, tolerance=0.0), [])
+        # Lowering the floor exposes the fast case again
+        self.assertEqual(len(run_benchmarks.compare(results, baseline, 0.0, min_wall_time=0.0,
+                                                    slack={"wall_time": 0.0})), 1)
+
+    # measure must report the median of the repeats and pass through the
+    # extra values returned by the benchmarked function.
+    def test_measure_median_and_extras(self):
+        record = run_benchmarks.measure(lambda: {"n_iter": 7}, repeat=3)
+        self.assertEqual(record["n_iter"], 7)
+        self.assertGreaterEqual(record["wall_time"], record["wall_time_min"])
+        self.assertGreaterEqual(record["peak_memory"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
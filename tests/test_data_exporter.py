@@ -0,0 +1,98 @@
+###
+## cluster_maker
+## Unit tests for the binary dataset format
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.data_exporter import export_to_npy, iter_npy_chunks, load_npy, read_npy
+from cluster_maker.dataset import Dataset
+from cluster_maker.interface import run_clustering
+
+
+class TestNpyFormat(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.df = pd.DataFrame(rng.normal(size=(90, 2)), columns=["x", "y"])
+        self.df["count"] = np.arange(90, dtype=np.int32)
+        self.df["name"] = [f"p{i}" for i in range(90)]
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmpdir.name, "data.csv")
+        self.npy_path = os.path.join(self.tmpdir.name, "data_npy")
+        self.df.to_csv(self.csv_path, index=False)
+        export_to_npy(self.df, self.npy_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    # Columns must round-trip with their dtypes, and be memory-mapped rather
+    # than read eagerly.
+    def test_round_trip_and_memmap(self):
+        back = read_npy(self.npy_path)
+        self.assertEqual(list(back.columns), list(self.df.columns))
+        self.assertEqual(back["count"].dtype, np.int32)
+        self.assertTrue(np.array_equal(back["x"], self.df["x"]))
+        self.assertTrue(np.array_equal(back["name"].astype(str), self.df["name"]))
+        self.assertIsInstance(load_npy(self.npy_path, ["x"])["x"], np.memmap)
+
+    # Exporting in chunks must give the same dataset, and a wrong row count
+    # must be reported instead of leaving uninitialised rows behind.
+    def test_chunked_export(self):
+        chunked = os.path.join(self.tmpdir.name, "chunked")
+        chunks = (self.df.iloc[i:i + 25] for i in range(0, 90, 25))
+        export_to_npy(chunks, chunked, n_rows=90)
+        back = pd.concat(iter_npy_chunks(chunked, chunksize=40))
+        self.assertTrue(np.array_equal(back["y"], self.df["y"]))
+        with self.assertRaises(ValueError):
+            export_to_npy(iter([self.df]), os.path.join(self.tmpdir.name, "bad"), n_rows=100)
+
+    # A later chunk with reordered or different columns must raise instead
+    # of being written into the wrong files, and a failed overwrite must
+    # leave no readable dataset behind.
+    def test_chunked_export_column_mismatch(self):
+        chunks = iter([self.df.iloc[:45], self.df.iloc[45:][["y", "x", "count", "name"]]])
+        with self.assertRaises(ValueError):
+            export_to_npy(chunks, self.npy_path, n_rows=90)
+        with self.assertRaises(FileNotFoundError):
+            read_npy(self.npy_path)
+
+    # Text wider than the width set by the first chunk, and missing text,
+    # must raise instead of being silently truncated or stored as "None";
+    # with str_widths the varying widths must round-trip exactly.
+    def test_chunked_export_text_widths(self):
+        names = ["a", "longname", "mid"]
+
+        def chunks():
+            return (pd.DataFrame({"name": [name]}) for name in names)
+
+        with self.assertRaises(ValueError):
+            export_to_npy(chunks(), os.path.join(self.tmpdir.name, "narrow"), n_rows=3)
+
+        wide = os.path.join(self.tmpdir.name, "wide")
+        export_to_npy(chunks(), wide, n_rows=3, str_widths={"name": 8})
+        self.assertEqual(list(read_npy(wide)["name"]), names)
+
+        with self.assertRaises(ValueError):
+            export_to_npy(pd.DataFrame({"name": ["a", None]}),
+                          os.path.join(self.tmpdir.name, "missing"))
+
+    # Every entry point must treat the binary directory like the CSV file.
+    def test_run_clustering_on_npy_dataset(self):
+        for algorithm in ("kmeans", "minibatch_kmeans"):
+            kwargs = dict(algorithm=algorithm, k=3, random_state=0, chunksize=40)
+            from_csv = run_clustering(self.csv_path, ["x", "y"], **kwargs)
+            from_npy = run_clustering(self.npy_path, ["x", "y"], **kwargs)
+            self.assertTrue(np.array_equal(from_csv["labels"], from_npy["labels"]))
+        data = Dataset(self.npy_path)
+        self.assertTrue(np.allclose(data.features(["x", "y"]), self.df[["x", "y"]]))
+        with self.assertRaises(TypeError):
+            data.features(["name"])
+
+
+if __name__ == "__main__":
+    unittest.main()
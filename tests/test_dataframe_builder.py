@@ -0,0 +1,83 @@
+###
+## cluster_maker
+## Unit tests for dataframe_builder module
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.dataframe_builder import (
+    define_dataframe_structure,
+    simulate_data,
+    iter_simulated_data,
+    write_simulated_data,
+)
+
+
+class TestDataframeBuilder(unittest.TestCase):
+    def setUp(self):
+        self.seed_df = define_dataframe_structure([
+            {"name": "x", "reps": [0.0, 20.0, -20.0]},
+            {"name": "y", "reps": [0.0, 20.0, -20.0]},
+        ])
+
+    # The default split must stay as even as possible, with the remainder
+    # going to the first clusters, and labels must line up with the rows.
+    def test_even_split_and_labels(self):
+        data = simulate_data(self.seed_df, n_points=101, random_state=0)
+        self.assertEqual(list(data.columns), ["x", "y", "true_cluster"])
+        self.assertEqual(data["true_cluster"].value_counts().sort_index().tolist(), [34, 34, 33])
+        means = data.groupby("true_cluster")[["x", "y"]].mean().to_numpy()
+        self.assertTrue(np.allclose(means, self.seed_df.to_numpy(), atol=0.5))
+
+    # Weights, exact counts, per-cluster stds and covariances must shape the
+    # clusters as requested; a wrong transform would give the wrong spread.
+    def test_weights_counts_and_covariances(self):
+        data = simulate_data(self.seed_df, n_points=1000, weights=[1, 2, 7], random_state=0)
+        self.assertEqual(data["true_cluster"].value_counts().sort_index().tolist(), [100, 200, 700])
+
+        data = simulate_data(self.seed_df, counts=[5, 0, 3], cluster_std=[0.1, 1.0, 2.0], random_state=0)
+        self.assertEqual(data["true_cluster"].tolist(), [0] * 5 + [2] * 3)
+
+        cov = np.array([[4.0, 1.8], [1.8, 1.0]])
+        data = simulate_data(self.seed_df, counts=[4000, 10, 10], covariances=[cov, np.eye(2), np.eye(2)],
+                             random_state=0)
+        sample = data.loc[data["true_cluster"] == 0, ["x", "y"]].to_numpy()
+        self.assertTrue(np.allclose(np.cov(sample, rowvar=False), cov, atol=0.2))
+
+        with self.assertRaises(ValueError):
+            simulate_data(self.seed_df, weights=[1, 2, 3], counts=[1, 2, 3])
+        with self.assertRaises(ValueError):
+            simulate_data(self.seed_df, covariances=[np.eye(2), np.eye(2), -np.eye(2)])
+
+    # Streamed data must be identical whatever the chunk size or number of
+    # workers (here across a random-stream block boundary), and the file
+    # writer must not drop or duplicate rows between chunks.
+    def test_streaming_is_reproducible(self):
+        n_points = 70_000
+        small = list(iter_simulated_data(self.seed_df, n_points, chunk_size=9_999, random_state=5))
+        self.assertTrue(all(len(chunk) == 9_999 for chunk in small[:-1]))
+        small = pd.concat(small, ignore_index=True)
+        large = pd.concat(
+            iter_simulated_data(self.seed_df, n_points, chunk_size=50_000, random_state=5, n_jobs=2),
+            ignore_index=True,
+        )
+        self.assertTrue(small.equals(large))
+        self.assertEqual(small["true_cluster"].value_counts().sort_index().tolist(), [23334, 23333, 23333])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "sim.csv")
+            n_rows = write_simulated_data(path, self.seed_df, 1_000, chunk_size=300, random_state=5)
+            written = pd.read_csv(path)
+        expected = pd.concat(iter_simulated_data(self.seed_df, 1_000, random_state=5), ignore_index=True)
+        self.assertEqual(n_rows, 1_000)
+        self.assertTrue(np.array_equal(written["true_cluster"], expected["true_cluster"]))
+        self.assertTrue(np.allclose(written[["x", "y"]], expected[["x", "y"]]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+###
+## cluster_maker
+## Unit tests for the cached Dataset
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.dataset import CSV_SAMPLE_ROWS, Dataset, read_csv_columns
+from cluster_maker.interface import run_clustering
+
+
+class TestDataset(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.df = pd.DataFrame(rng.normal(size=(60, 3)), columns=["a", "b", "c"])
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "data.csv")
+        self.df.to_csv(self.path, index=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    # Repeated access must reuse the cached arrays (no re-parsing), and the
+    # shared arrays must be protected against accidental modification.
+    def test_arrays_are_cached_and_read_only(self):
+        data = Dataset(self.path)
+        X1 = data.standardised(["a", "b"])
+        X2 = data.standardised(["a", "b"])
+        self.assertIs(X1, X2)
+        self.assertIs(data.frame, data.frame)
+        self.assertFalse(X1.flags.writeable)
+        self.assertTrue(np.allclose(X1.mean(axis=0), 0.0))
+
+    # A stale cache would silently cluster old data after the file changes.
+    def test_cache_invalidated_when_file_changes(self):
+        data = Dataset(self.path)
+        before = data.features(["a"]).copy()
+        (self.df * 2).iloc[:50].to_csv(self.path, index=False)
+        after = data.features(["a"])
+        self.assertEqual(after.shape[0], 50)
+        self.assertTrue(np.allclose(after[:, 0], 2 * before[:50, 0]))
+
+    # Passing a Dataset must give exactly the same result as passing the path.
+    def test_run_clustering_accepts_dataset(self):
+        data = Dataset(self.path)
+        from_path = run_clustering(self.path, ["a", "b"], k=3, random_state=0)
+        from_data = run_clustering(data, ["a", "b"], k=3, random_state=0)
+        self.assertTrue(np.array_equal(from_path["labels"], from_data["labels"]))
+        self.assertEqual(from_path["metrics"], from_data["metrics"])
+        self.assertNotIn("cluster", data.frame.columns)
+
+
+    # Parallel byte-range reads must split rows on line breaks exactly, so
+    # no row is lost, duplicated or cut in half.
+    def test_read_csv_columns_parallel_matches_serial(self):
+        serial = read_csv_columns(self.path, ["a", "c"], extra_cols=[])
+        self.assertEqual(list(serial.columns), ["a", "c"])
+        for n_jobs in (2, 7):
+            parallel = read_csv_columns(self.path, ["a", "c"], extra_cols=[], n_jobs=n_jobs)
+            pd.testing.assert_frame_equal(serial, parallel)
+        self.assertTrue(np.allclose(serial.to_numpy(), self.df[["a", "c"]]))
+
+    # Validation only looks at a sample, so a bad value further down must
+    # still be reported as a non-numeric feature, while a malformed file
+    # must keep its parser error.
+    def test_read_csv_columns_rejects_late_non_numeric_value(self):
+        df = pd.DataFrame({"a": np.arange(CSV_SAMPLE_ROWS + 10, dtype=float).astype(object)})
+        df.iloc[-1, 0] = "oops"
+        df.to_csv(self.path, index=False)
+        with self.assertRaises(TypeError):
+            read_csv_columns(self.path, ["a"])
+        with self.assertRaises(KeyError):
+            read_csv_columns(self.path, ["missing"])
+
+        # A malformed file is a parser error, not a non-numeric feature
+        with open(self.path, "w") as f:
+            f.write("a\n" + "1.0\n" * (CSV_SAMPLE_ROWS + 10) + '"2.0\n')
+        with self.assertRaises(pd.errors.ParserError):
+            read_csv_columns(self.path, ["a"])
+
+    # output_cols must drop the unused columns without changing the labels.
+    def test_run_clustering_output_cols(self):
+        full = run_clustering(self.path, ["a", "b"], k=3, random_state=0, plots=False)
+        slim = run_clustering(
+            self.path, ["a", "b"], k=3, random_state=0, plots=False, output_cols=[]
+        )
+        self.assertEqual(list(slim["data"].columns), ["a", "b", "cluster"])
+        self.assertEqual(list(full["data"].columns), ["a", "b", "c", "cluster"])
+        self.assertTrue(np.array_equal(full["labels"], slim["labels"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
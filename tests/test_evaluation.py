@@ -0,0 +1,98 @@
+###
+## cluster_maker
+## Unit tests for evaluation module
+###
+
+import unittest
+
+import numpy as np
+
+from cluster_maker.evaluation import (
+    _split_centroids,
+    compute_inertia,
+    elbow_curve,
+    silhouette_score_chunked,
+    silhouette_score_sampled,
+    silhouette_score_sklearn,
+    simplified_silhouette,
+)
+
+
+class TestEvaluation(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        centres = np.array([[-6.0, 0.0], [0.0, 6.0], [6.0, 0.0], [0.0, -6.0]])
+        self.X = np.vstack([rng.normal(loc=c, scale=0.5, size=(50, 2)) for c in centres])
+
+    # Inertia is the sum of squared distances to the assigned centroid;
+    # an indexing slip (e.g. using the wrong centroid) changes the value.
+    def test_compute_inertia_by_hand(self):
+        X = np.array([[0.0, 0.0], [2.0, 0.0], [10.0, 1.0]])
+        labels = np.array([0, 0, 1])
+        centroids = np.array([[1.0, 0.0], [10.0, 0.0]])
+        self.assertAlmostEqual(compute_inertia(X, labels, centroids), 3.0)
+
+    # The chunked silhouette must agree with scikit-learn even when the
+    # memory budget forces many small blocks, including a singleton cluster.
+    def test_silhouette_chunked_matches_sklearn(self):
+        labels = np.repeat([0, 1, 2, 3], 50)
+        labels[0] = 4
+        expected = silhouette_score_sklearn(self.X, labels)
+        self.assertAlmostEqual(silhouette_score_chunked(self.X, labels, memory_budget=4096), expected)
+
+        with self.assertRaises(ValueError):
+            silhouette_score_chunked(self.X, np.zeros(len(self.X), dtype=int))
+
+    # The sampled estimate must be close to the exact score and its
+    # interval must bracket the estimate; the simplified score must rank
+    # a good partition above a shuffled one.
+    def test_silhouette_sampled_and_simplified(self):
+        labels = np.repeat([0, 1, 2, 3], 50)
+        exact = silhouette_score_sklearn(self.X, labels)
+        estimate, (low, high) = silhouette_score_sampled(self.X, labels, sample_size=60, random_state=0)
+        self.assertLessEqual(low, estimate)
+        self.assertLessEqual(estimate, high)
+        self.assertAlmostEqual(estimate, exact, delta=0.05)
+
+        centroids = np.vstack([self.X[labels == c].mean(axis=0) for c in range(4)])
+        shuffled = np.random.RandomState(0).permutation(labels)
+        self.assertGreater(
+            simplified_silhouette(self.X, labels, centroids),
+            simplified_silhouette(self.X, shuffled, centroids),
+        )
+
+    # Fitting k values in parallel must not change the numbers, and the
+    # detailed output must report timing and iterations for every k.
+    def test_elbow_curve_parallel_matches_serial(self):
+        k_values = [1, 2, 3, 4]
+        serial = elbow_curve(self.X, k_values, random_state=0, algorithm="kmeans")
+        details = elbow_curve(
+            self.X, k_values, random_state=0, algorithm="kmeans",
+            n_jobs=2, return_details=True,
+        )
+        self.assertEqual(list(details), k_values)
+        for k in k_values:
+            self.assertAlmostEqual(details[k]["inertia"], serial[k])
+            self.assertGreaterEqual(details[k]["n_iter"], 1)
+            self.assertGreaterEqual(details[k]["time"], 0.0)
+
+    # Warm starts add one split centre per step, so inertia must keep
+    # falling as k grows on well-separated blobs, in X's precision.
+    def test_elbow_curve_warm_start(self):
+        inertias = elbow_curve(self.X, [1, 2, 3, 4], random_state=0,
+                               algorithm="kmeans", warm_start=True)
+        values = [inertias[k] for k in (1, 2, 3, 4)]
+        self.assertTrue(all(a > b for a, b in zip(values, values[1:])))
+
+        with self.assertRaises(ValueError):
+            elbow_curve(self.X, [1, 2], algorithm="sklearn_kmeans", warm_start=True)
+
+        # Split centres must keep float32 data in float32
+        X32 = self.X.astype(np.float32)
+        grown = _split_centroids(X32, X32[:2], 4)
+        self.assertEqual(grown.dtype, np.float32)
+        self.assertEqual(grown.shape, (4, self.X.shape[1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+###
+## cluster_maker
+## Import-time regression tests
+###
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+# Wall-clock budget (seconds) for `from cluster_maker import kmeans` in a
+# fresh interpreter. Eager imports of scikit-learn or matplotlib take well
+# over this; override on slow machines with CLUSTER_MAKER_IMPORT_BUDGET.
+IMPORT_TIME_BUDGET = float(os.environ.get("CLUSTER_MAKER_IMPORT_BUDGET", "1.0"))
+
+HEAVY_MODULES = ("sklearn", "matplotlib", "pandas")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(code: str) -> str:
+    """Run code in a fresh interpreter with the package importable."""
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, check=True, env=env,
+    )
+    return completed.stdout
+
+
+class TestImports(unittest.TestCase):
+    # Importing only the manual algorithms must not drag in scikit-learn,
+    # matplotlib or pandas, and must stay within the import-time budget.
+    def test_import_kmeans_is_light(self):
+        out = run_python(
+            "import sys, time\n"
+            "start = time.perf_counter()\n"
+            "from cluster_maker import kmeans\n"
+            "print(time.perf_counter() - start)\n"
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])\n"
+        )
+        elapsed, loaded = out.splitlines()
+        self.assertEqual(loaded, "[]")
+        self.assertLess(float(elapsed), IMPORT_TIME_BUDGET)
+
+    # A batch run with plots=False must never import matplotlib.
+    def test_run_clustering_without_plots_skips_matplotlib(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "data.csv")
+            with open(path, "w") as f:
+                f.write("x,y\n" + "\n".join(f"{i % 7},{i % 5}" for i in range(40)))
+            out = run_python(
+                "import sys\n"
+                "from cluster_maker import run_clustering\n"
+                f"run_clustering({path!r}, ['x', 'y'], k=2, random_state=0, plots=False)\n"
+                "print('matplotlib' in sys.modules)\n"
+            )
+        self.assertEqual(out.strip(), "False")
+
+    # Lazy loading must still expose every public name.
+    def test_all_public_names_resolve(self):
+        import cluster_maker
+        for name in cluster_maker.__all__:
+            self.assertTrue(callable(getattr(cluster_maker, name)), name)
+        with self.assertRaises(AttributeError):
+            cluster_maker.not_a_function
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+###
+## cluster_maker
+## Unit tests for the high-level interface
+###
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.data_exporter import export_to_npy
+from cluster_maker.interface import run_clustering, run_clustering_grid
+from cluster_maker.profiling import read_profile_log
+
+
+class TestInterface(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        centres = np.array([[-5.0, -5.0], [0.0, 5.0], [5.0, -5.0]])
+        points = np.vstack([rng.normal(loc=c, scale=0.3, size=(40, 2)) for c in centres])
+        self.df = pd.DataFrame(points, columns=["x", "y"])
+        self.df["name"] = [f"p{i}" for i in range(len(self.df))]
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmpdir.name, "input.csv")
+        self.df.to_csv(self.input_path, index=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    # Streaming mini-batch K-means must label every row and write them out
+    # chunk by chunk without losing or duplicating rows at chunk boundaries,
+    # whatever the chunk size relative to k.
+    def test_minibatch_streaming_writes_all_labels(self):
+        output_path = os.path.join(self.tmpdir.name, "output.csv")
+        result = run_clustering(
+            self.input_path,
+            ["x", "y"],
+            algorithm="minibatch_kmeans",
+            k=3,
+            output_path=output_path,
+            random_state=0,
+            chunksize=25,
+        )
+        self.assertIsNone(result["data"])
+        self.assertEqual(result["labels"].shape[0], len(self.df))
+
+        written = pd.read_csv(output_path)
+        self.assertEqual(list(written.columns), ["x", "y", "name", "cluster"])
+        self.assertTrue(np.array_equal(written["cluster"].to_numpy(), result["labels"]))
+        self.assertTrue(np.allclose(written[["x", "y"]].to_numpy(), self.df[["x", "y"]].to_numpy()))
+
+        # Chunks smaller than k are buffered until k rows can seed the centroids
+        result = run_clustering(self.input_path, ["x", "y"], algorithm="minibatch_kmeans",
+                                k=5, random_state=0, chunksize=2)
+        self.assertEqual(result["centroids"].shape, (5, 2))
+        self.assertEqual(result["labels"].shape[0], len(self.df))
+        with self.assertRaises(ValueError):
+            run_clustering(self.input_path, ["x", "y"], algorithm="minibatch_kmeans",
+                           k=len(self.df) + 1, chunksize=50)
+
+    # Figures must not be drawn until used, and plots=False must not
+    # create any, so batch jobs do not pay for plotting.
+    def test_figures_are_lazy(self):
+        result = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0,
+                                compute_elbow=True, elbow_k_values=[1, 2, 3])
+        fig_cluster = result["fig_cluster"]
+        self.assertFalse(fig_cluster.rendered)
+        self.assertFalse(result["fig_elbow"].rendered)
+
+        plot_path = os.path.join(self.tmpdir.name, "clusters.png")
+        fig_cluster.save(plot_path)
+        self.assertTrue(fig_cluster.rendered)
+        self.assertTrue(os.path.exists(plot_path))
+        self.assertIs(fig_cluster.render(), fig_cluster.render())
+        fig_cluster.close()
+
+        result = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0,
+                                compute_elbow=True, plots=False)
+        self.assertIsNone(result["fig_cluster"])
+        self.assertIsNone(result["fig_elbow"])
+        self.assertIsNotNone(result["elbow_inertias"])
+
+
+    # dtype="float32" must reach the clustering, including the streaming
+    # path, and give the same clusters as the default float64.
+    def test_float32_mode(self):
+        for algorithm in ("kmeans", "minibatch_kmeans"):
+            kwargs = dict(algorithm=algorithm, k=3, random_state=0, plots=False)
+            r64 = run_clustering(self.input_path, ["x", "y"], **kwargs)
+            r32 = run_clustering(self.input_path, ["x", "y"], dtype="float32", **kwargs)
+            self.assertEqual(r32["centroids"].dtype, np.float32)
+            self.assertTrue(np.array_equal(r32["labels"], r64["labels"]))
+            self.assertAlmostEqual(r32["metrics"]["inertia"], r64["metrics"]["inertia"], places=2)
+        with self.assertRaises(ValueError):
+            run_clustering(self.input_path, ["x", "y"], dtype="int32")
+
+
+    # copy=False must keep the whole run within a small multiple of the
+    # feature matrix size; each stray full copy would add one multiple.
+    def test_copy_false_peak_memory(self):
+        n_samples, n_features = 30_000, 4
+        rng = np.random.RandomState(0)
+        path = os.path.join(self.tmpdir.name, "large.csv")
+        columns = [f"f{i}" for i in range(n_features)]
+        pd.DataFrame(rng.normal(size=(n_samples, n_features)), columns=columns).to_csv(
+            path, index=False
+        )
+        nbytes = n_samples * n_features * 8
+
+        peaks = {}
+        results = {}
+        for copy in (True, False):
+            tracemalloc.start()
+            results[copy] = run_clustering(path, columns, k=3, random_state=0, plots=False,
+                                           silhouette=None, copy=copy)
+            peaks[copy] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        self.assertLess(peaks[False], 6 * nbytes)
+        self.assertLess(peaks[False], peaks[True])
+        self.assertTrue(np.array_equal(results[True]["labels"], results[False]["labels"]))
+
+    # A binary dataset is memory-mapped and its text columns are only
+    # opened after clustering, so the run must peak well below the same
+    # data read as CSV.
+    def test_npy_input_peak_memory_below_csv(self):
+        n_samples = 30_000
+        rng = np.random.RandomState(0)
+        columns = ["f0", "f1", "f2", "f3"]
+        df = pd.DataFrame(rng.normal(size=(n_samples, 4)), columns=columns)
+        df["name"] = [f"point_{i}" for i in range(n_samples)]
+        csv_path = os.path.join(self.tmpdir.name, "large.csv")
+        npy_path = os.path.join(self.tmpdir.name, "large_npy")
+        df.to_csv(csv_path, index=False)
+        export_to_npy(df, npy_path)
+
+        peaks = {}
+        results = {}
+        for path in (csv_path, npy_path):
+            tracemalloc.start()
+            results[path] = run_clustering(path, columns, k=3, random_state=0, plots=False,
+                                           silhouette=None)
+            peaks[path] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        self.assertLess(peaks[npy_path], peaks[csv_path])
+        # Reading every column into memory (strings included) took ~7x
+        self.assertLess(peaks[npy_path], 5 * n_samples * len(columns) * 8)
+        self.assertTrue(np.array_equal(results[npy_path]["labels"], results[csv_path]["labels"]))
+        self.assertEqual(list(results[npy_path]["data"]["name"][:2]), ["point_0", "point_1"])
+
+    # Every stage that ran must be profiled, and each run must append
+    # exactly one parseable line to the log so jobs can be aggregated.
+    def test_profile_and_log(self):
+        log_path = os.path.join(self.tmpdir.name, "profile.jsonl")
+        result = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0,
+                                output_path=os.path.join(self.tmpdir.name, "out.csv"),
+                                profile_memory=True, profile_log=log_path)
+        profile = result["profile"]
+        self.assertEqual(list(profile), ["load", "select", "standardise", "cluster",
+                                         "metrics", "export", "plot", "total"])
+        self.assertGreater(profile["load"]["peak_memory"], 0)
+        self.assertGreaterEqual(profile["total"]["wall_time"], profile["cluster"]["wall_time"])
+        self.assertFalse(tracemalloc.is_tracing())
+
+        result = run_clustering(self.input_path, ["x", "y"], algorithm="minibatch_kmeans",
+                                k=3, random_state=0, chunksize=50, profile_log=log_path)
+        self.assertNotIn("peak_memory", result["profile"]["cluster"])
+
+        log = read_profile_log(log_path)
+        self.assertEqual(log["run_id"].nunique(), 2)
+        self.assertEqual(set(log["algorithm"]), {"kmeans", "minibatch_kmeans"})
+        self.assertTrue((log["n_samples"] == len(self.df)).all())
+
+    # The grid must give the same fits as separate run_clustering calls,
+    # whether run serially or in worker processes, and write every label
+    # set to one file.
+    def test_run_clustering_grid(self):
+        output_path = os.path.join(self.tmpdir.name, "grid.csv")
+        kwargs = dict(k_values=[1, 2, 3], algorithms=["kmeans", "kmeans_elkan"],
+                      random_state=0, output_cols=["name"])
+        serial = run_clustering_grid(self.input_path, ["x", "y"], **kwargs)
+        parallel = run_clustering_grid(self.input_path, ["x", "y"], n_jobs=2,
+                                       output_path=output_path, **kwargs)
+
+        table = parallel["metrics"]
+        self.assertEqual(list(zip(table["algorithm"], table["k"])),
+                         [(a, k) for a in ("kmeans", "kmeans_elkan") for k in (1, 2, 3)])
+        self.assertTrue(np.allclose(table["inertia"], serial["metrics"]["inertia"]))
+        self.assertTrue(np.isnan(table["silhouette"][0]))
+        self.assertTrue((table[["fit_time", "metric_time"]] >= 0).all(axis=None))
+        self.assertEqual(parallel["best"][1], 3)
+        self.assertIs(parallel["model"], parallel["models"][parallel["best"]])
+
+        single = run_clustering(self.input_path, ["x", "y"], k=2, random_state=0, plots=False)
+        self.assertTrue(np.array_equal(parallel["labels"][("kmeans", 2)], single["labels"]))
+
+        written = pd.read_csv(output_path)
+        self.assertEqual(list(written.columns[:3]), ["x", "y", "name"])
+        self.assertTrue(np.array_equal(written["cluster_kmeans_elkan_k3"],
+                                       parallel["labels"][("kmeans_elkan", 3)]))
+        with self.assertRaises(ValueError):
+            run_clustering_grid(self.input_path, ["x", "y"], [2], algorithms=["dbscan"])
+
+        # Without a silhouette the default selection falls back to inertia
+        by_inertia = run_clustering_grid(self.input_path, ["x", "y"], [2, 3],
+                                         metrics=["inertia"], random_state=0)
+        self.assertEqual(by_inertia["best"], ("kmeans", 3))
+        self.assertNotIn("silhouette", by_inertia["metrics"].columns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+###
+## cluster_maker
+## Unit tests for the fitted KMeansModel
+###
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from cluster_maker.interface import run_clustering
+from cluster_maker.model import KMeansModel
+
+
+class TestKMeansModel(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        centres = np.array([[-50.0, 0.0], [0.0, 500.0], [50.0, 0.0]])
+        points = np.vstack([rng.normal(loc=c, scale=[3.0, 30.0], size=(50, 2)) for c in centres])
+        self.df = pd.DataFrame(points, columns=["x", "y"])
+        self.df.insert(0, "id", np.arange(len(self.df)))
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.input_path = os.path.join(self.tmpdir.name, "input.csv")
+        self.df.to_csv(self.input_path, index=False)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    # The model must carry the scaling used in the fit: predicting the raw
+    # training rows has to reproduce the fitted labels in every mode.
+    def test_predict_reproduces_fit_labels(self):
+        for algorithm in ("kmeans", "sklearn_kmeans", "minibatch_kmeans"):
+            result = run_clustering(self.input_path, ["x", "y"], algorithm=algorithm, k=3,
+                                    random_state=0, plots=False, chunksize=40)
+            model = result["model"]
+            self.assertTrue(np.array_equal(model.predict(self.df, chunk_size=7), result["labels"]))
+            self.assertEqual(model.metadata["algorithm"], algorithm)
+        distances = model.transform(self.df[["x", "y"]].to_numpy())
+        self.assertEqual(distances.shape, (len(self.df), 3))
+        self.assertTrue(np.array_equal(distances.argmin(axis=1), result["labels"]))
+
+    # A saved and reloaded model must score files exactly like the original.
+    def test_save_load_and_predict_file(self):
+        model = run_clustering(self.input_path, ["x", "y"], k=3, random_state=0,
+                               plots=False)["model"]
+        model_dir = os.path.join(self.tmpdir.name, "model")
+        model.save(model_dir)
+        loaded = KMeansModel.load(model_dir)
+        self.assertEqual(loaded.feature_cols, ["x", "y"])
+        self.assertTrue(np.array_equal(loaded.centroids, model.centroids))
+        self.assertTrue(np.allclose(loaded.cluster_centres, model.cluster_centres))
+        self.assertEqual(loaded.metadata, model.metadata)
+
+        output_path = os.path.join(self.tmpdir.name, "scored.csv")
+        labels = loaded.predict_file(self.input_path, output_path, chunksize=40)
+        scored = pd.read_csv(output_path)
+        self.assertTrue(np.array_equal(labels, model.predict(self.df)))
+        self.assertTrue(np.array_equal(scored["cluster"], labels))
+        self.assertTrue(np.array_equal(scored["id"], self.df["id"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,10 +3,13 @@
 ## Unit tests for preprocessing module
 ###
 
+import os
+import tempfile
+import tracemalloc
 import unittest
 import pandas as pd
 import numpy as np
-from cluster_maker.preprocessing import select_features, standardise_features
+from cluster_maker.preprocessing import Standardiser, select_features, standardise_features
 
 class TestPreprocessing(unittest.TestCase):
     
@@ -59,5 +62,69 @@ class TestPreprocessing(unittest.TestCase):
         # Check standard deviation is approximately 1
         self.assertAlmostEqual(np.std(scaled), 1.0, places=5)
 
+    def test_standardise_features_in_place(self):
+        """
+        With copy=False the result must be X itself, scaled like the default
+        path, and no temporary as large as X may be allocated.
+        """
+        X = np.random.RandomState(0).normal(loc=3.0, scale=2.0, size=(200_000, 4))
+        expected = standardise_features(X)
+
+        tracemalloc.start()
+        scaled = standardise_features(X, copy=False)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertIs(scaled, X)
+        self.assertTrue(np.allclose(scaled, expected))
+        self.assertLess(peak, 0.5 * X.nbytes)
+
+        data = pd.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+        view = select_features(data, ["a"], copy=False)
+        self.assertTrue(np.shares_memory(view["a"].to_numpy(), data["a"].to_numpy()))
+
+    def test_standardise_constant_column_not_exactly_representable(self):
+        """
+        A constant column such as 0.1 has a rounding-error variance in
+        float64; it must standardise to ~0 like StandardScaler, not to +-1.
+        """
+        X = np.column_stack([np.full(1000, 0.1), np.full(1000, 1 / 3), np.arange(1000.0)])
+        scaled = standardise_features(X)
+        self.assertTrue(np.allclose(scaled[:, :2], 0.0, atol=1e-12))
+        self.assertTrue(np.array_equal(Standardiser().fit(X).scale[:2], [1.0, 1.0]))
+        self.assertAlmostEqual(np.std(scaled[:, 2]), 1.0, places=10)
+
+    def test_standardiser_streaming_merge_and_persistence(self):
+        """
+        Chunked partial_fit calls and states merged across workers must give
+        the statistics of a single fit, and a saved state must reproduce the
+        same transform after loading.
+        """
+        rng = np.random.RandomState(0)
+        X = rng.normal(loc=1e4, scale=[1.0, 50.0, 0.0], size=(1000, 3))
+
+        full = Standardiser().fit(X)
+        self.assertTrue(np.allclose(full.mean, X.mean(axis=0)))
+        self.assertTrue(np.allclose(full.var, X.var(axis=0)))
+
+        streamed = Standardiser()
+        for start in range(0, 1000, 170):
+            streamed.partial_fit(X[start:start + 170])
+        merged = Standardiser().fit(X[:400]).merge(Standardiser().fit(X[400:]))
+        for scaler in (streamed, merged):
+            self.assertEqual(scaler.n_samples, 1000)
+            self.assertTrue(np.allclose(scaler.mean, full.mean))
+            self.assertTrue(np.allclose(scaler.var, full.var))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "scaler.json")
+            full.save(path)
+            loaded = Standardiser.load(path)
+        self.assertTrue(np.array_equal(loaded.transform(X), full.transform(X)))
+        # The constant third feature is centred but not scaled
+        self.assertTrue(np.allclose(loaded.transform(X)[:, 2], 0.0))
+        self.assertEqual(full.transform(X.astype(np.float32)).dtype, np.float32)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file